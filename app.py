@@ -1,20 +1,28 @@
 from flask import Flask, jsonify
 
-from src.extensions import db, migrate, jwt, cors, swagger
+from src.extensions import db, migrate, jwt, cors, swagger, worker_pool, term_vocabulary
 from src.logger import logger
 from src.config import get_config
 from src.logout_management import is_token_revoked, revoked_token_callback
+from src.cli import models_cli, cache_cli, rollups_cli, terms_cli
+from src.crew.registry import model_registry
 
 from src.api.v1.models.UserModel import User
 from src.api.v1.models.EntryModel import Entry
 from src.api.v1.models.EventModel import Event
 from src.api.v1.models.EmotionModel import Emotion
 from src.api.v1.models.CharacterModel import CharacterTrait
+from src.api.v1.models.AnalysisJobModel import AnalysisJob
+from src.api.v1.models.Advice import Advice
+from src.api.v1.models.DailyRollupModel import DailyRollup
+from src.api.v1.models.TermModel import Term
+from src.api.v1.models.EntryTermModel import EntryTerm
 
 from src.api.v1.controllers.user_controller import user_bp
 from src.api.v1.controllers.entry_controller import entry_bp
 from src.api.v1.controllers.advice_controller import advice_bp
 from src.api.v1.controllers.data_controller import data_bp
+from src.api.v1.controllers.health_controller import health_bp
 
 
 def create_app():
@@ -27,11 +35,22 @@ def create_app():
     jwt.init_app(app)
     cors.init_app(app)
     swagger.init_app(app)
+    worker_pool.init_app(app)
+    term_vocabulary.init_app(app)
 
     app.register_blueprint(user_bp)
     app.register_blueprint(entry_bp)
     app.register_blueprint(advice_bp)
     app.register_blueprint(data_bp)
+    app.register_blueprint(health_bp)
+
+    app.cli.add_command(models_cli)
+    app.cli.add_command(cache_cli)
+    app.cli.add_command(rollups_cli)
+    app.cli.add_command(terms_cli)
+
+    if app.config['MODEL_WARMUP']:
+        model_registry.start_warm_up(app.config['WARMUP_MODELS'])
     return app
 
 app = create_app()
@@ -0,0 +1,56 @@
+import argparse
+import os
+import time
+from transformers import AutoTokenizer
+
+from src.crew.utils.backends import BACKENDS, get_artifact_path, load_backend
+from benchmarks.padding_benchmark import load_texts
+
+
+def run(backend, tokenizer, texts: list[str], batch_size: int, max_length: int) -> tuple[list[list[float]], float]:
+    logits = []
+    started = time.perf_counter()
+    for i in range(0, len(texts), batch_size):
+        features = tokenizer(texts[i:i + batch_size], padding="longest", truncation=True, max_length=max_length, return_tensors=backend.tensor_type)
+        logits.extend(backend(features))
+    return logits, time.perf_counter() - started
+
+
+def compare(reference: list[list[float]], logits: list[list[float]]) -> tuple[float, float]:
+    agreement = sum(ref.index(max(ref)) == row.index(max(row)) for ref, row in zip(reference, logits)) / len(reference)
+    error = max(abs(a - b) for ref, row in zip(reference, logits) for a, b in zip(ref, row))
+    return agreement, error
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare accuracy and latency of the inference backends against fp32 PyTorch.")
+    parser.add_argument("--extractor", choices=("emotion", "character", "event"), default="emotion")
+    parser.add_argument("--input", help="Text file with one chunk per line (defaults to built-in samples)")
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--max-length", type=int, default=128)
+    args = parser.parse_args()
+
+    model_path = os.path.join("src", "models", f"{args.extractor}_extractor")
+    tokenizer = AutoTokenizer.from_pretrained(model_path)
+    texts = load_texts(args.input)
+
+    reference = None
+    print(f"{args.extractor} extractor, {len(texts)} chunks, batch size {args.batch_size}")
+    print(f"{'backend':<12}{'seconds':>10}{'chunks/s':>12}{'argmax agree':>15}{'max |dlogit|':>15}")
+    for name in BACKENDS:
+        if name == "onnx" and not os.path.exists(get_artifact_path(model_path, name)):
+            print(f"{name:<12}skipped, no exported model")
+            continue
+
+        backend = load_backend(model_path, name)
+        run(backend, tokenizer, texts[:args.batch_size], args.batch_size, args.max_length)
+        logits, seconds = run(backend, tokenizer, texts, args.batch_size, args.max_length)
+        if reference is None:
+            reference = logits
+
+        agreement, error = compare(reference, logits)
+        print(f"{name:<12}{seconds:>10.3f}{len(texts) / seconds:>12.1f}{agreement:>15.1%}{error:>15.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+import argparse
+import os
+from transformers import AutoTokenizer
+
+from src.crew.utils.batching import padding_stats
+
+
+SAMPLE_TEXTS = [
+    "a quiet day",
+    "i woke up late and missed the bus, so i walked to work in the rain.",
+    "had dinner with sarah and her brother at the new place downtown. the food was great but the service was slow and we stayed until they closed.",
+    "meeting ran long",
+    "i keep thinking about the conversation with my manager. she said the project is on track, but i am not sure she believes it, and i am worried the deadline in march is going to slip again. i should talk to the team tomorrow and figure out what we can cut.",
+    "went for a run in the park before sunrise. cold, but it cleared my head.",
+    "mom called. we talked for an hour about nothing in particular and it was exactly what i needed.",
+    "tired",
+]
+
+
+def load_texts(path: str | None) -> list[str]:
+    if not path:
+        return SAMPLE_TEXTS * 16
+    with open(path, encoding="utf-8") as file:
+        return [line.strip() for line in file if line.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare real versus padded tokens for each padding strategy.")
+    parser.add_argument("--model", default=os.path.join("src", "models", "emotion_extractor"))
+    parser.add_argument("--input", help="Text file with one chunk per line (defaults to built-in samples)")
+    parser.add_argument("--max-length", type=int, default=128)
+    parser.add_argument("--batch-size", type=int, default=32)
+    args = parser.parse_args()
+
+    tokenizer = AutoTokenizer.from_pretrained(args.model)
+    texts = load_texts(args.input)
+    encoded = tokenizer(texts, truncation=True, max_length=args.max_length)
+    lengths = [len(input_ids) for input_ids in encoded["input_ids"]]
+
+    strategies = [
+        ("max_length", "max_length", False),
+        ("longest", "longest", False),
+        ("longest + bucketing", "longest", True),
+    ]
+
+    print(f"{len(texts)} chunks, batch size {args.batch_size}, max length {args.max_length}")
+    print(f"{'strategy':<22}{'batches':>9}{'real':>10}{'computed':>12}{'padding':>10}{'waste':>8}")
+    for name, padding, bucketing in strategies:
+        stats = padding_stats(lengths, args.batch_size, padding, args.max_length, bucketing)
+        waste = stats["padding_tokens"] / stats["computed_tokens"] if stats["computed_tokens"] else 0.0
+        print(f"{name:<22}{stats['batches']:>9}{stats['real_tokens']:>10}{stats['computed_tokens']:>12}{stats['padding_tokens']:>10}{waste:>8.1%}")
+
+
+if __name__ == "__main__":
+    main()
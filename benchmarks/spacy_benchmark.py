@@ -0,0 +1,53 @@
+import argparse
+import time
+import spacy
+
+from benchmarks.padding_benchmark import load_texts
+from src.crew.active.event_extractor import EventExtractor
+
+
+def per_chunk(nlp, texts: list[str], batch_size: int) -> None:
+    for text in texts:
+        nlp(text)
+
+
+def piped(nlp, texts: list[str], batch_size: int) -> None:
+    for _ in nlp.pipe(texts, batch_size=batch_size):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare spaCy chunks/second across pipelines, pruning and batching.")
+    parser.add_argument("--models", default="en_core_web_trf,en_core_web_sm", help="Comma-separated spaCy pipelines")
+    parser.add_argument("--batch-sizes", default="16,64,256", help="Comma-separated nlp.pipe batch sizes")
+    parser.add_argument("--exclude", default="", help="Comma-separated pipes to exclude, filtered as SPACY_EXCLUDE is")
+    parser.add_argument("--input", help="Text file with one chunk per line (defaults to built-in samples)")
+    args = parser.parse_args()
+
+    texts = load_texts(args.input)
+    batch_sizes = [int(size) for size in args.batch_sizes.split(",")]
+    # Only pipelines the extractor would actually load are compared, so pipes needed for lemmas are never dropped
+    pruned = EventExtractor.get_spacy_exclude([name.strip() for name in args.exclude.split(",") if name.strip()])
+    excludes = [[], pruned] if pruned else [[]]
+
+    print(f"{len(texts)} chunks")
+    print(f"{'model':<18}{'excluded':<14}{'mode':<14}{'chunks/s':>10}")
+    for model in args.models.split(","):
+        for exclude in excludes:
+            try:
+                nlp = spacy.load(model, exclude=exclude)
+            except OSError:
+                print(f"{model:<18}not installed, skipped")
+                break
+
+            runs = [("per chunk", per_chunk, 1)] + [(f"pipe({size})", piped, size) for size in batch_sizes]
+            for mode, run, batch_size in runs:
+                run(nlp, texts[:batch_size], batch_size)
+                started = time.perf_counter()
+                run(nlp, texts, batch_size)
+                seconds = time.perf_counter() - started
+                print(f"{model:<18}{','.join(exclude) or '-':<14}{mode:<14}{len(texts) / seconds:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
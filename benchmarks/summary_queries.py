@@ -0,0 +1,59 @@
+import argparse
+import time
+from sqlalchemy import event
+
+from app import app
+from src.extensions import db, term_vocabulary
+from src.api.v1.services.data_service import DataService, SUMMARY_QUERY_BUDGET
+
+
+def count_queries(fn, *args) -> tuple[int, float]:
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", record)
+    started = time.perf_counter()
+    try:
+        fn(*args)
+    finally:
+        event.remove(db.engine, "before_cursor_execute", record)
+    return len(statements), time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Count the SQL statements issued by the week/month/year summaries and fail when they exceed the budget.")
+    parser.add_argument("--user-id", type=int, required=True)
+    parser.add_argument("--year", type=int, required=True)
+    parser.add_argument("--month", type=int, default=1)
+    parser.add_argument("--week", type=int, default=1)
+    args = parser.parse_args()
+
+    failures = 0
+    with app.app_context():
+        data_service = DataService(db_session=db.session)
+        # Refresh stale rollups first so the counts measure the steady-state read path
+        data_service.get_year_summary({"year": args.year}, args.user_id)
+
+        calls = [
+            ("week", data_service.get_week_summary, {"week": args.week, "year": args.year}),
+            ("month", data_service.get_month_summary, {"month": args.month, "year": args.year}),
+            ("year", data_service.get_year_summary, {"year": args.year}),
+        ]
+        print(f"{'summary':<10}{'events':<8}{'queries':>9}{'budget':>8}{'ms':>10}")
+        for name, fn, data in calls:
+            for include_events in (False, True):
+                db.session.expire_all()
+                term_vocabulary.clear()
+                queries, seconds = count_queries(fn, dict(data, include_events=include_events), args.user_id)
+                budget = SUMMARY_QUERY_BUDGET[include_events]
+                status = "" if queries <= budget else "  OVER BUDGET"
+                failures += queries > budget
+                print(f"{name:<10}{str(include_events):<8}{queries:>9}{budget:>8}{seconds * 1000:>10.1f}{status}")
+
+    assert not failures, f"{failures} summaries exceeded their query budget"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""baseline schema
+
+Revision ID: 3f1c2a9b7d10
+Revises: 
+Create Date: 2026-10-18 09:12:41.228114
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '3f1c2a9b7d10'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('users',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('firstname', sa.String(length=250), nullable=False),
+    sa.Column('lastname', sa.String(length=250), nullable=False),
+    sa.Column('username', sa.String(length=250), nullable=False),
+    sa.Column('email', sa.String(length=250), nullable=False),
+    sa.Column('password', sa.String(length=250), nullable=False),
+    sa.Column('date_of_birth', sa.DateTime(), nullable=False),
+    sa.Column('gender', sa.String(length=10), nullable=False),
+    sa.Column('is_active', sa.Boolean(), nullable=False),
+    sa.Column('last_logout', sa.DateTime(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('email'),
+    sa.UniqueConstraint('username')
+    )
+    op.create_table('advice',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('advice', sa.Text(), nullable=False),
+    sa.Column('week', sa.Integer(), nullable=True),
+    sa.Column('month', sa.Integer(), nullable=True),
+    sa.Column('year', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('entries',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('title', sa.String(length=300), nullable=False),
+    sa.Column('context', sa.Text(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('character_traits',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('entry_id', sa.Integer(), nullable=False),
+    sa.Column('agreableness', sa.Float(), nullable=False),
+    sa.Column('conscientiousness', sa.Float(), nullable=False),
+    sa.Column('extraversion', sa.Float(), nullable=False),
+    sa.Column('neuroticism', sa.Float(), nullable=False),
+    sa.Column('openness', sa.Float(), nullable=False),
+    sa.Column('mbti_type', sa.String(length=4), nullable=False),
+    sa.ForeignKeyConstraint(['entry_id'], ['entries.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('emotions',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('entry_id', sa.Integer(), nullable=False),
+    sa.Column('love', sa.Boolean(), nullable=False),
+    sa.Column('joy', sa.Boolean(), nullable=False),
+    sa.Column('sadness', sa.Boolean(), nullable=False),
+    sa.Column('anger', sa.Boolean(), nullable=False),
+    sa.Column('fear', sa.Boolean(), nullable=False),
+    sa.Column('surprise', sa.Boolean(), nullable=False),
+    sa.ForeignKeyConstraint(['entry_id'], ['entries.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('events',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('entry_id', sa.Integer(), nullable=False),
+    sa.Column('characters', postgresql.ARRAY(sa.String()), nullable=False),
+    sa.Column('actions', postgresql.ARRAY(sa.String()), nullable=False),
+    sa.Column('times', postgresql.ARRAY(sa.String()), nullable=False),
+    sa.Column('locations', postgresql.ARRAY(sa.String()), nullable=False),
+    sa.Column('objects', postgresql.ARRAY(sa.String()), nullable=False),
+    sa.Column('subjects', postgresql.ARRAY(sa.String()), nullable=False),
+    sa.Column('adjectives', postgresql.ARRAY(sa.String()), nullable=False),
+    sa.Column('adverbs', postgresql.ARRAY(sa.String()), nullable=False),
+    sa.Column('topics', postgresql.ARRAY(sa.String()), nullable=False),
+    sa.Column('organizations', postgresql.ARRAY(sa.String()), nullable=False),
+    sa.Column('events', postgresql.ARRAY(sa.String()), nullable=False),
+    sa.ForeignKeyConstraint(['entry_id'], ['entries.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade():
+    op.drop_table('events')
+    op.drop_table('emotions')
+    op.drop_table('character_traits')
+    op.drop_table('entries')
+    op.drop_table('advice')
+    op.drop_table('users')
@@ -0,0 +1,29 @@
+"""track event coverage on entries
+
+Revision ID: 5b8d2f6e9a13
+Revises: f3c8b6a1d2e7
+Create Date: 2026-10-18 18:05:19.420761
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5b8d2f6e9a13'
+down_revision = 'f3c8b6a1d2e7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('entries', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('events_analyzed_length', sa.Integer(), server_default='0', nullable=False))
+
+    # Coverage used to be the end of the last stored chunk; entries without events are analysed once more
+    op.execute('UPDATE entries SET events_analyzed_length = COALESCE((SELECT MAX(events.chunk_end) FROM events WHERE events.entry_id = entries.id), 0)')
+
+
+def downgrade():
+    with op.batch_alter_table('entries', schema=None) as batch_op:
+        batch_op.drop_column('events_analyzed_length')
@@ -0,0 +1,49 @@
+"""add daily rollups
+
+Revision ID: 7e1f3a9d4c68
+Revises: 9c4e2b7f1a05
+Create Date: 2026-10-18 09:40:27.083316
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7e1f3a9d4c68'
+down_revision = '9c4e2b7f1a05'
+branch_labels = None
+depends_on = None
+
+# Must match TRAITS in src/api/v1/models/DailyRollupModel.py
+TRAITS = ('agreableness', 'conscientiousness', 'extraversion', 'neuroticism', 'openness')
+
+
+def upgrade():
+    op.create_table('daily_rollups',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('date', sa.Date(), nullable=False),
+    sa.Column('entry_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('emotion_mask', sa.SmallInteger(), server_default='0', nullable=False),
+    sa.Column('trait_count', sa.Integer(), server_default='0', nullable=False),
+    *[sa.Column(f'{trait}_sum', sa.Float(), server_default='0', nullable=False) for trait in TRAITS],
+    *[sa.Column(f'{trait}_sq_sum', sa.Float(), server_default='0', nullable=False) for trait in TRAITS],
+    sa.Column('topic_counts', sa.JSON(), server_default='{}', nullable=False),
+    sa.Column('stale', sa.Boolean(), server_default=sa.true(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id', 'date', name='uq_daily_rollups_user_date')
+    )
+
+    # One stale row per day that has entries, so the first period read or `flask rollups backfill` computes it
+    op.execute("""
+        INSERT INTO daily_rollups (user_id, date, entry_count)
+        SELECT user_id, CAST(created_at AS DATE), COUNT(*) FROM entries GROUP BY user_id, CAST(created_at AS DATE)
+    """)
+
+
+def downgrade():
+    op.drop_table('daily_rollups')
@@ -0,0 +1,46 @@
+"""add advice period key and timestamps
+
+Revision ID: 9c4e2b7f1a05
+Revises: d5a1c7e38b92
+Create Date: 2026-10-18 09:34:12.651839
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9c4e2b7f1a05'
+down_revision = 'd5a1c7e38b92'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('advice', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('period_key', sa.String(length=16), nullable=True))
+        batch_op.add_column(sa.Column('created_at', sa.DateTime(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False))
+        batch_op.add_column(sa.Column('updated_at', sa.DateTime(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False))
+
+    # SQL twin of Advice.get_period_key
+    op.execute("""
+        UPDATE advice SET period_key = CASE
+            WHEN week IS NOT NULL THEN CAST(year AS VARCHAR) || '-W' || substr('0' || CAST(week AS VARCHAR), -2, 2)
+            WHEN month IS NOT NULL THEN CAST(year AS VARCHAR) || '-M' || substr('0' || CAST(month AS VARCHAR), -2, 2)
+            ELSE CAST(year AS VARCHAR)
+        END
+    """)
+    # Advice used to be appended on every request; keep the newest row of each period
+    op.execute('DELETE FROM advice WHERE EXISTS (SELECT 1 FROM advice newer WHERE newer.user_id = advice.user_id AND newer.period_key = advice.period_key AND newer.id > advice.id)')
+
+    with op.batch_alter_table('advice', schema=None) as batch_op:
+        batch_op.alter_column('period_key', existing_type=sa.String(length=16), nullable=False)
+        batch_op.create_unique_constraint('uq_advice_user_period', ['user_id', 'period_key'])
+
+
+def downgrade():
+    with op.batch_alter_table('advice', schema=None) as batch_op:
+        batch_op.drop_constraint('uq_advice_user_period', type_='unique')
+        batch_op.drop_column('updated_at')
+        batch_op.drop_column('created_at')
+        batch_op.drop_column('period_key')
@@ -0,0 +1,32 @@
+"""pack emotion flags into bitmask
+
+Revision ID: a6d4e8f20c31
+Revises: 7e1f3a9d4c68
+Create Date: 2026-10-18 09:47:03.516920
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a6d4e8f20c31'
+down_revision = '7e1f3a9d4c68'
+branch_labels = None
+depends_on = None
+
+# Bit order must match EMOTIONS in src/api/v1/models/EmotionModel.py
+EMOTIONS = ('love', 'joy', 'sadness', 'anger', 'fear', 'surprise')
+
+
+def upgrade():
+    with op.batch_alter_table('emotions', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('bitmask', sa.SmallInteger(), server_default='0', nullable=False))
+
+    bits = ' + '.join(f'CASE WHEN {emotion} THEN {1 << i} ELSE 0 END' for i, emotion in enumerate(EMOTIONS))
+    op.execute(f'UPDATE emotions SET bitmask = {bits}')
+
+
+def downgrade():
+    with op.batch_alter_table('emotions', schema=None) as batch_op:
+        batch_op.drop_column('bitmask')
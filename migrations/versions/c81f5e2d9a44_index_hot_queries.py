@@ -0,0 +1,40 @@
+"""index hot queries and forbid duplicate analysis rows
+
+Revision ID: c81f5e2d9a44
+Revises: a6d4e8f20c31
+Create Date: 2026-10-18 14:21:37.604118
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c81f5e2d9a44'
+down_revision = 'a6d4e8f20c31'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Concurrent analysis could insert a second row for the same entry or chunk; keep the oldest before constraining
+    op.execute('DELETE FROM emotions a USING emotions b WHERE a.entry_id = b.entry_id AND a.id > b.id')
+    op.execute('DELETE FROM character_traits a USING character_traits b WHERE a.entry_id = b.entry_id AND a.id > b.id')
+    # Legacy events got their offsets in d5a1c7e38b92, so only rows written twice for the same analysed chunk collide here;
+    # keep the one covering the most text
+    op.execute('DELETE FROM events a USING events b WHERE a.entry_id = b.entry_id AND a.chunk_start = b.chunk_start AND a.chunk_end > 0 AND b.chunk_end > 0 '
+               'AND (a.chunk_end < b.chunk_end OR (a.chunk_end = b.chunk_end AND a.id > b.id))')
+
+    op.create_index('ix_entries_user_id_created_at', 'entries', ['user_id', 'created_at', 'id'], unique=False)
+    op.create_unique_constraint('uq_emotions_entry_id', 'emotions', ['entry_id'])
+    op.create_unique_constraint('uq_character_traits_entry_id', 'character_traits', ['entry_id'])
+    op.create_unique_constraint('uq_events_entry_chunk', 'events', ['entry_id', 'chunk_start'])
+    op.create_index('ix_analysis_jobs_entry_id_status', 'analysis_jobs', ['entry_id', 'status'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_analysis_jobs_entry_id_status', table_name='analysis_jobs')
+    op.drop_constraint('uq_events_entry_chunk', 'events', type_='unique')
+    op.drop_constraint('uq_character_traits_entry_id', 'character_traits', type_='unique')
+    op.drop_constraint('uq_emotions_entry_id', 'emotions', type_='unique')
+    op.drop_index('ix_entries_user_id_created_at', table_name='entries')
@@ -0,0 +1,59 @@
+"""track how much of each entry has been analyzed
+
+Revision ID: d5a1c7e38b92
+Revises: b2e9f4a61c07
+Create Date: 2026-10-18 09:28:44.906137
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd5a1c7e38b92'
+down_revision = 'b2e9f4a61c07'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Existing rows cover an unknown part of the entry; a zero length makes the next access re-analyse the whole text,
+    # and a zero chunk count lets the fresh trait averages replace the old ones instead of being weighted against them
+    with op.batch_alter_table('emotions', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('analyzed_length', sa.Integer(), server_default='0', nullable=False))
+
+    with op.batch_alter_table('character_traits', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('chunk_count', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('analyzed_length', sa.Integer(), server_default='0', nullable=False))
+
+    with op.batch_alter_table('events', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('chunk_start', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('chunk_end', sa.Integer(), server_default='0', nullable=False))
+
+    # Legacy events came from fixed 128-character windows of title + '\n' + context, added in window order,
+    # with a short final window skipped. Give each one its window so no two rows of an entry share offsets.
+    op.execute("""
+        UPDATE events SET chunk_start = windows.chunk_start, chunk_end = windows.chunk_end
+        FROM (
+            SELECT events.id,
+                   128 * (ROW_NUMBER() OVER (PARTITION BY events.entry_id ORDER BY events.id) - 1) AS chunk_start,
+                   LEAST(128 * ROW_NUMBER() OVER (PARTITION BY events.entry_id ORDER BY events.id), CHAR_LENGTH(entries.title) + 1 + CHAR_LENGTH(entries.context)) AS chunk_end
+            FROM events JOIN entries ON entries.id = events.entry_id
+        ) AS windows
+        WHERE events.id = windows.id
+    """)
+    # A window past the end of its entry cannot be placed; drop it, and the text is re-analysed as a new chunk
+    op.execute('DELETE FROM events WHERE chunk_end <= chunk_start')
+
+
+def downgrade():
+    with op.batch_alter_table('events', schema=None) as batch_op:
+        batch_op.drop_column('chunk_end')
+        batch_op.drop_column('chunk_start')
+
+    with op.batch_alter_table('character_traits', schema=None) as batch_op:
+        batch_op.drop_column('analyzed_length')
+        batch_op.drop_column('chunk_count')
+
+    with op.batch_alter_table('emotions', schema=None) as batch_op:
+        batch_op.drop_column('analyzed_length')
@@ -0,0 +1,48 @@
+"""add event term index
+
+Revision ID: e7a3d9c25b18
+Revises: c81f5e2d9a44
+Create Date: 2026-10-18 15:02:11.873450
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e7a3d9c25b18'
+down_revision = 'c81f5e2d9a44'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('terms',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('kind', sa.String(length=20), nullable=False),
+    sa.Column('value', sa.String(length=250), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('kind', 'value', name='uq_terms_kind_value')
+    )
+    op.create_index('ix_terms_value', 'terms', ['value'], unique=False)
+    op.create_table('entry_terms',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('term_id', sa.Integer(), nullable=False),
+    sa.Column('kind', sa.String(length=20), nullable=False),
+    sa.Column('entry_id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['entry_id'], ['entries.id'], ),
+    sa.ForeignKeyConstraint(['term_id'], ['terms.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('entry_id', 'term_id', name='uq_entry_terms_entry_term')
+    )
+    op.create_index('ix_entry_terms_user_term_created', 'entry_terms', ['user_id', 'term_id', 'created_at', 'entry_id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_entry_terms_user_term_created', table_name='entry_terms')
+    op.drop_table('entry_terms')
+    op.drop_index('ix_terms_value', table_name='terms')
+    op.drop_table('terms')
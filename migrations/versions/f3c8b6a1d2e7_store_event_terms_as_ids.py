@@ -0,0 +1,38 @@
+"""store event terms as vocabulary ids
+
+Revision ID: f3c8b6a1d2e7
+Revises: e7a3d9c25b18
+Create Date: 2026-10-18 16:40:52.190384
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f3c8b6a1d2e7'
+down_revision = 'e7a3d9c25b18'
+branch_labels = None
+depends_on = None
+
+# Must match EVENT_FIELDS in src/api/v1/models/EventModel.py
+EVENT_FIELDS = ('characters', 'actions', 'times', 'locations', 'objects', 'subjects', 'adjectives', 'adverbs', 'topics', 'organizations', 'events')
+# SQL twin of Term.normalize
+NORMALIZED = r"left(lower(btrim(regexp_replace(u.value, '\s+', ' ', 'g'))), 250)"
+
+
+def upgrade():
+    for field in EVENT_FIELDS:
+        op.execute(f"INSERT INTO terms (kind, value) SELECT DISTINCT '{field}', {NORMALIZED} FROM events, unnest(events.{field}) AS u(value) WHERE {NORMALIZED} <> '' ON CONFLICT (kind, value) DO NOTHING")
+        op.add_column('events', sa.Column(f'{field}_ids', sa.ARRAY(sa.Integer()), server_default='{}', nullable=False))
+        op.execute(f"UPDATE events SET {field}_ids = ARRAY(SELECT t.id FROM unnest(events.{field}) WITH ORDINALITY AS u(value, position) JOIN terms t ON t.kind = '{field}' AND t.value = {NORMALIZED} GROUP BY t.id ORDER BY min(u.position))")
+        op.drop_column('events', field)
+        op.alter_column('events', f'{field}_ids', new_column_name=field, server_default=None)
+
+
+def downgrade():
+    for field in EVENT_FIELDS:
+        op.add_column('events', sa.Column(f'{field}_values', sa.ARRAY(sa.String()), server_default='{}', nullable=False))
+        op.execute(f"UPDATE events SET {field}_values = ARRAY(SELECT t.value FROM unnest(events.{field}) WITH ORDINALITY AS u(id, position) JOIN terms t ON t.id = u.id ORDER BY u.position)")
+        op.drop_column('events', field)
+        op.alter_column('events', f'{field}_values', new_column_name=field, server_default=None)
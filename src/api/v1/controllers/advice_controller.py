@@ -1,16 +1,34 @@
-from flask import jsonify, Blueprint, request
+from flask import jsonify, Blueprint, request, Response, stream_with_context
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from werkzeug.exceptions import NotFound, BadRequest
 from marshmallow import ValidationError
+from src.errors import AnalysisPending
 
 from src.extensions import db
+from src.logger import logger
 
 from src.api.v1.services.advice_service import AdviceService
 from src.api.v1.schemas.advice_schema import GetAdviceSchema, WeekAdviceSchema, MonthAdviceSchema, YearAdviceSchema
+from src.api.v1.utils.sse import format_sse
 
 
 advice_bp = Blueprint('advice', __name__, url_prefix='/advice')
 
+def stream_advice(tokens):
+    def generate():
+        advice = []
+        try:
+            for token in tokens:
+                advice.append(token)
+                yield format_sse({'token': token}, event='token')
+            yield format_sse({'advice': ''.join(advice).strip()}, event='done')
+        except Exception as e:
+            logger.error(f'Advice stream failed: {str(e)}')
+            yield format_sse({'message': f'Internal server error: {str(e)}'}, event='error')
+
+    headers = {'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    return Response(stream_with_context(generate()), mimetype='text/event-stream', headers=headers)
+
 @advice_bp.route('/advise_entry', methods=['POST'])
 @jwt_required()
 def advise_entry():
@@ -37,6 +55,8 @@ def advise_entry():
     responses:
       201:
         description: Advice retrieved successfully
+      202:
+        description: Entry analysis is still running
       400:
         description: Validation error
       404:
@@ -57,6 +77,65 @@ def advise_entry():
     try:
         result = advice_service.advise_entry(entry_id, user_id)
         return jsonify(result), 201
+    except AnalysisPending as e:
+        return jsonify({'message': str(e), 'job_id': e.job_id}), 202
+    except NotFound as e:
+        return jsonify({'message': str(e)}), 404
+    except Exception as e:
+        return jsonify({'message': f'Internal server error: {str(e)}'}), 500
+
+@advice_bp.route('/advise_entry/stream', methods=['POST'])
+@jwt_required()
+def advise_entry_stream():
+    """
+    Stream advice for a specific entry as Server-Sent Events
+    ---
+    tags:
+      - Advice
+    consumes:
+      - application/json
+    produces:
+      - text/event-stream
+    security:
+      - jwt: []
+    parameters:
+      - name: body
+        in: body
+        required: true
+        schema:
+          required:
+            - id
+          properties:
+            id:
+              type: integer
+              description: The ID of the entry.
+    responses:
+      200:
+        description: Stream of `token` events followed by a `done` event with the full advice
+      202:
+        description: Entry analysis is still running
+      400:
+        description: Validation error
+      404:
+        description: Entry not found
+      500:
+        description: Internal server error
+    """
+    data = request.get_json()
+    schema = GetAdviceSchema()
+    try:
+        schema.load(data)
+    except ValidationError as e:
+        return jsonify({'message': f'Validation error: {e.messages}'}), 400
+
+    user_id = int(get_jwt_identity())
+    entry_id = data['id']
+    advice_service = AdviceService(db_session=db.session)
+    try:
+        tokens = advice_service.stream_entry_advice(entry_id, user_id)
+        return stream_advice(tokens)
+    except AnalysisPending as e:
+        return jsonify({'message': str(e), 'job_id': e.job_id}), 202
     except NotFound as e:
         return jsonify({'message': str(e)}), 404
     except Exception as e:
@@ -78,6 +157,70 @@ def advise_week():
     try:
         result = advice_service.advise_week(data, user_id)
         return jsonify(result), 201
+    except AnalysisPending as e:
+        return jsonify({'message': str(e), 'job_id': e.job_id, 'job_ids': e.job_ids}), 202
+    except BadRequest as e:
+        return jsonify({'message': str(e)}), 400
+    except NotFound as e:
+        return jsonify({'message': str(e)}), 404
+    except Exception as e:
+        return jsonify({'message': f'Internal server error: {str(e)}'}), 500
+
+@advice_bp.route('/advise_week/stream', methods=['POST'])
+@jwt_required()
+def advise_week_stream():
+    """
+    Stream advice for a week as Server-Sent Events
+    ---
+    tags:
+      - Advice
+    consumes:
+      - application/json
+    produces:
+      - text/event-stream
+    security:
+      - jwt: []
+    parameters:
+      - name: body
+        in: body
+        required: true
+        schema:
+          required:
+            - week
+            - year
+          properties:
+            week:
+              type: integer
+              description: The week of the year.
+            year:
+              type: integer
+              description: The year.
+    responses:
+      200:
+        description: Stream of `token` events followed by a `done` event with the full advice
+      202:
+        description: Analysis of the week's entries is still running
+      400:
+        description: Validation error
+      404:
+        description: User not found
+      500:
+        description: Internal server error
+    """
+    data = request.get_json()
+    schema = WeekAdviceSchema()
+    try:
+        schema.load(data)
+    except ValidationError as e:
+        return jsonify({'message': f'Validation error: {e.messages}'}), 400
+
+    user_id = int(get_jwt_identity())
+    advice_service = AdviceService(db_session=db.session)
+    try:
+        tokens = advice_service.stream_week_advice(data, user_id)
+        return stream_advice(tokens)
+    except AnalysisPending as e:
+        return jsonify({'message': str(e), 'job_id': e.job_id, 'job_ids': e.job_ids}), 202
     except BadRequest as e:
         return jsonify({'message': str(e)}), 400
     except NotFound as e:
@@ -100,6 +243,8 @@ def advise_month():
     try:
         result = advice_service.advise_month(data, user_id)
         return jsonify(result), 201
+    except AnalysisPending as e:
+        return jsonify({'message': str(e), 'job_id': e.job_id, 'job_ids': e.job_ids}), 202
     except BadRequest as e:
         return jsonify({'message': str(e)}), 400
     except NotFound as e:
@@ -122,6 +267,8 @@ def advise_year():
     try:
         result = advice_service.advise_year(data, user_id)
         return jsonify(result), 201
+    except AnalysisPending as e:
+        return jsonify({'message': str(e), 'job_id': e.job_id, 'job_ids': e.job_ids}), 202
     except BadRequest as e:
         return jsonify({'message': str(e)}), 400
     except NotFound as e:
@@ -2,11 +2,13 @@ from flask import jsonify, Blueprint, request
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from werkzeug.exceptions import NotFound, BadRequest
 from marshmallow import ValidationError
+from src.errors import AnalysisPending
 
 from src.extensions import db
 
 from src.api.v1.services.data_service import DataService
-from src.api.v1.schemas.data_schema import GetDataSchema, WeekDataSchema, MonthDataSchema, YearDataSchema
+from src.api.v1.services.job_service import JobService
+from src.api.v1.schemas.data_schema import GetDataSchema, GetBatchDataSchema, WeekDataSchema, MonthDataSchema, YearDataSchema, WeekSummarySchema, MonthSummarySchema, YearSummarySchema, TrendsDataSchema, TermSearchSchema, TermMentionsSchema
 
 
 data_bp = Blueprint('data', __name__, url_prefix='/data')
@@ -38,6 +40,8 @@ def get_entry_emotions():
     responses:
       201:
         description: Emotions retrieved successfully
+      202:
+        description: Analysis is still running
       400:
         description: Validation error
       404:
@@ -58,6 +62,8 @@ def get_entry_emotions():
     try:
         result = data_service.get_entry_emotions(entry_id, user_id)
         return jsonify(result), 201
+    except AnalysisPending as e:
+        return jsonify({'message': str(e), 'job_id': e.job_id}), 202
     except NotFound as e:
         return jsonify({'message': str(e)}), 404
     except Exception as e:
@@ -89,6 +95,8 @@ def get_entry_characters():
     responses:
       201:
         description: Characters retrieved successfully
+      202:
+        description: Analysis is still running
       400:
         description: Validation error
       404:
@@ -109,6 +117,8 @@ def get_entry_characters():
     try:
         result = data_service.get_entry_characters(entry_id, user_id)
         return jsonify(result), 201
+    except AnalysisPending as e:
+        return jsonify({'message': str(e), 'job_id': e.job_id}), 202
     except NotFound as e:
         return jsonify({'message': str(e)}), 404
     except Exception as e:
@@ -140,6 +150,8 @@ def get_entry_events():
     responses:
       201:
         description: Events retrieved successfully
+      202:
+        description: Analysis is still running
       400:
         description: Validation error
       404:
@@ -160,6 +172,8 @@ def get_entry_events():
     try:
         result = data_service.get_entry_events(entry_id, user_id)
         return jsonify(result), 201
+    except AnalysisPending as e:
+        return jsonify({'message': str(e), 'job_id': e.job_id}), 202
     except NotFound as e:
         return jsonify({'message': str(e)}), 404
     except Exception as e:
@@ -191,6 +205,8 @@ def get_entry_summary():
     responses:
       201:
         description: Summary retrieved successfully
+      202:
+        description: Analysis is still running
       400:
         description: Validation error
       404:
@@ -211,6 +227,107 @@ def get_entry_summary():
     try:
         result = data_service.get_entry_summary(entry_id, user_id)
         return jsonify(result), 201
+    except AnalysisPending as e:
+        return jsonify({'message': str(e), 'job_id': e.job_id}), 202
+    except NotFound as e:
+        return jsonify({'message': str(e)}), 404
+    except Exception as e:
+        return jsonify({'message': f'Internal server error: {str(e)}'}), 500
+
+@data_bp.route('/get_entry_summaries', methods=['POST'])
+@jwt_required()
+def get_entry_summaries():
+    """
+    Get summaries for many entries in one request
+    ---
+    tags:
+      - Data
+    consumes:
+      - application/json
+    security:
+      - jwt: []
+    parameters:
+      - name: body
+        in: body
+        required: true
+        schema:
+          required:
+            - ids
+          properties:
+            ids:
+              type: array
+              items:
+                type: integer
+              description: Up to 200 entry IDs.
+    responses:
+      201:
+        description: Summaries keyed by entry id; entries still being analyzed are listed under pending with their job_id, unknown ids under missing
+      400:
+        description: Validation error
+      500:
+        description: Internal server error
+    """
+    data = request.get_json()
+    schema = GetBatchDataSchema()
+    try:
+        schema.load(data)
+    except ValidationError as e:
+        return jsonify({'message': f'Validation error: {e.messages}'}), 400
+
+    user_id = int(get_jwt_identity())
+    data_service = DataService(db_session=db.session)
+    try:
+        result = data_service.get_entry_summaries(data['ids'], user_id)
+        return jsonify(result), 201
+    except Exception as e:
+        return jsonify({'message': f'Internal server error: {str(e)}'}), 500
+
+@data_bp.route('/get_job_status', methods=['POST'])
+@jwt_required()
+def get_job_status():
+    """
+    Get the status of an analysis job
+    ---
+    tags:
+      - Data
+    consumes:
+      - application/json
+    security:
+      - jwt: []
+    parameters:
+      - name: body
+        in: body
+        required: true
+        schema:
+          required:
+            - id
+          properties:
+            id:
+              type: integer
+              description: The ID of the analysis job.
+    responses:
+      200:
+        description: Job status retrieved successfully
+      400:
+        description: Validation error
+      404:
+        description: Job not found
+      500:
+        description: Internal server error
+    """
+    data = request.get_json()
+    schema = GetDataSchema()
+    try:
+        schema.load(data)
+    except ValidationError as e:
+        return jsonify({'message': f'Validation error: {e.messages}'}), 400
+
+    user_id = int(get_jwt_identity())
+    job_id = data['id']
+    job_service = JobService(db_session=db.session)
+    try:
+        result = job_service.get_user_job(job_id, user_id)
+        return jsonify(result), 200
     except NotFound as e:
         return jsonify({'message': str(e)}), 404
     except Exception as e:
@@ -264,7 +381,7 @@ def get_week_characters():
 @jwt_required()
 def get_week_summary():
     data = request.get_json()
-    schema = WeekDataSchema()
+    schema = WeekSummarySchema()
     try:
         schema.load(data)
     except ValidationError as e:
@@ -275,6 +392,8 @@ def get_week_summary():
     try:
         result = data_service.get_week_summary(data, user_id)
         return jsonify(result), 201
+    except AnalysisPending as e:
+        return jsonify({'message': str(e), 'job_id': e.job_id, 'job_ids': e.job_ids}), 202
     except BadRequest as e:
         return jsonify({'message': str(e)}), 400
     except NotFound as e:
@@ -330,7 +449,7 @@ def get_month_characters():
 @jwt_required()
 def get_month_summary():
     data = request.get_json()
-    schema = MonthDataSchema()
+    schema = MonthSummarySchema()
     try:
         schema.load(data)
     except ValidationError as e:
@@ -341,6 +460,8 @@ def get_month_summary():
     try:
         result = data_service.get_month_summary(data, user_id)
         return jsonify(result), 201
+    except AnalysisPending as e:
+        return jsonify({'message': str(e), 'job_id': e.job_id, 'job_ids': e.job_ids}), 202
     except BadRequest as e:
         return jsonify({'message': str(e)}), 400
     except NotFound as e:
@@ -396,7 +517,7 @@ def get_year_characters():
 @jwt_required()
 def get_year_summary():
     data = request.get_json()
-    schema = YearDataSchema()
+    schema = YearSummarySchema()
     try:
         schema.load(data)
     except ValidationError as e:
@@ -407,9 +528,209 @@ def get_year_summary():
     try:
         result = data_service.get_year_summary(data, user_id)
         return jsonify(result), 201
+    except AnalysisPending as e:
+        return jsonify({'message': str(e), 'job_id': e.job_id, 'job_ids': e.job_ids}), 202
     except BadRequest as e:
         return jsonify({'message': str(e)}), 400
     except NotFound as e:
         return jsonify({'message': str(e)}), 404
     except Exception as e:
         return jsonify({'message': f'Internal server error: {str(e)}'}), 500
+
+@data_bp.route('/get_character_trends', methods=['POST'])
+@jwt_required()
+def get_character_trends():
+    """
+    Get OCEAN trait trends over a year, month or week
+    ---
+    tags:
+      - Data
+    consumes:
+      - application/json
+    security:
+      - jwt: []
+    parameters:
+      - name: body
+        in: body
+        required: true
+        schema:
+          required:
+            - year
+          properties:
+            year:
+              type: integer
+              description: The year to analyse.
+            month:
+              type: integer
+              description: Restrict the range to this month.
+            week:
+              type: integer
+              description: Restrict the range to this week.
+            granularity:
+              type: string
+              enum: [day, week, month]
+              default: week
+              description: Size of each period in the series.
+            window:
+              type: integer
+              default: 4
+              description: Number of periods in the rolling mean.
+    responses:
+      201:
+        description: Per-period trait means, standard deviations, entry counts, rolling means and slopes
+      400:
+        description: Validation error
+      404:
+        description: User not found
+      500:
+        description: Internal server error
+    """
+    data = request.get_json()
+    schema = TrendsDataSchema()
+    try:
+        schema.load(data)
+    except ValidationError as e:
+        return jsonify({'message': f'Validation error: {e.messages}'}), 400
+
+    user_id = int(get_jwt_identity())
+    data_service = DataService(db_session=db.session)
+    try:
+        result = data_service.get_character_trends(data, user_id)
+        return jsonify(result), 201
+    except BadRequest as e:
+        return jsonify({'message': str(e)}), 400
+    except NotFound as e:
+        return jsonify({'message': str(e)}), 404
+    except Exception as e:
+        return jsonify({'message': f'Internal server error: {str(e)}'}), 500
+
+@data_bp.route('/search_entries', methods=['POST'])
+@jwt_required()
+def search_entries():
+    """
+    Find the entries whose events mention a term
+    ---
+    tags:
+      - Data
+    consumes:
+      - application/json
+    security:
+      - jwt: []
+    parameters:
+      - name: body
+        in: body
+        required: true
+        schema:
+          required:
+            - term
+          properties:
+            term:
+              type: string
+              description: The name, place, topic or other term, matched case-insensitively.
+            kind:
+              type: string
+              enum: [characters, actions, times, locations, objects, subjects, adjectives, adverbs, topics, organizations, events]
+              description: Only match the term in this event category.
+            start_date:
+              type: string
+              format: date
+              description: First day to search, inclusive.
+            end_date:
+              type: string
+              format: date
+              description: Last day to search, inclusive.
+            limit:
+              type: integer
+              default: 100
+              description: Maximum number of entries returned, oldest first.
+    responses:
+      201:
+        description: Matching entries with their id, title and created_at
+      400:
+        description: Validation error
+      404:
+        description: User not found
+      500:
+        description: Internal server error
+    """
+    schema = TermSearchSchema()
+    try:
+        data = schema.load(request.get_json())
+    except ValidationError as e:
+        return jsonify({'message': f'Validation error: {e.messages}'}), 400
+
+    user_id = int(get_jwt_identity())
+    data_service = DataService(db_session=db.session)
+    try:
+        result = data_service.search_entries(data, user_id)
+        return jsonify(result), 201
+    except NotFound as e:
+        return jsonify({'message': str(e)}), 404
+    except Exception as e:
+        return jsonify({'message': f'Internal server error: {str(e)}'}), 500
+
+@data_bp.route('/get_term_mentions', methods=['POST'])
+@jwt_required()
+def get_term_mentions():
+    """
+    Count the entries mentioning a term per period
+    ---
+    tags:
+      - Data
+    consumes:
+      - application/json
+    security:
+      - jwt: []
+    parameters:
+      - name: body
+        in: body
+        required: true
+        schema:
+          required:
+            - term
+          properties:
+            term:
+              type: string
+              description: The name, place, topic or other term, matched case-insensitively.
+            kind:
+              type: string
+              enum: [characters, actions, times, locations, objects, subjects, adjectives, adverbs, topics, organizations, events]
+              description: Only match the term in this event category.
+            start_date:
+              type: string
+              format: date
+              description: First day to search, inclusive.
+            end_date:
+              type: string
+              format: date
+              description: Last day to search, inclusive.
+            granularity:
+              type: string
+              enum: [day, week, month, year]
+              default: month
+              description: Size of each period; weeks are keyed by their Monday.
+    responses:
+      201:
+        description: Number of entries mentioning the term, keyed by period
+      400:
+        description: Validation error
+      404:
+        description: User not found
+      500:
+        description: Internal server error
+    """
+    schema = TermMentionsSchema()
+    try:
+        data = schema.load(request.get_json())
+    except ValidationError as e:
+        return jsonify({'message': f'Validation error: {e.messages}'}), 400
+
+    user_id = int(get_jwt_identity())
+    data_service = DataService(db_session=db.session)
+    try:
+        result = data_service.get_term_mentions(data, user_id)
+        return jsonify(result), 201
+    except NotFound as e:
+        return jsonify({'message': str(e)}), 404
+    except Exception as e:
+        return jsonify({'message': f'Internal server error: {str(e)}'}), 500
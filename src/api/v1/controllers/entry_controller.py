@@ -1,13 +1,14 @@
-from flask import jsonify, Blueprint, request
+from flask import jsonify, Blueprint, request, Response, stream_with_context, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from werkzeug.exceptions import NotFound
+from werkzeug.exceptions import NotFound, BadRequest
 from marshmallow import ValidationError
 from src.errors import DangerDetected
 
 from src.extensions import db
 
 from src.api.v1.services.entry_service import EntryService
-from src.api.v1.schemas.entry_schema import RegisterEntrySchema, GetEntryByIDSchema, AddToEntrySchema
+from src.api.v1.services.export_service import ExportService
+from src.api.v1.schemas.entry_schema import RegisterEntrySchema, GetEntryByIDSchema, AddToEntrySchema, ListEntriesSchema, ImportEntriesSchema, ExportEntriesSchema
 
 
 entry_bp = Blueprint('entry', __name__, url_prefix='/entries')
@@ -39,7 +40,7 @@ def register_entry():
               description: The context or content of the entry.
     responses:
       201:
-        description: Entry registered successfully
+        description: Entry registered successfully, analysis queued under the returned job_id
       400:
         description: Validation error
       404:
@@ -68,6 +69,67 @@ def register_entry():
     except Exception as e:
         return jsonify({'message': f'Internal server error: {str(e)}'}), 500
 
+@entry_bp.route('/import_entries', methods=['POST'])
+@jwt_required()
+def import_entries():
+    """
+    Import entries in bulk from an NDJSON or CSV file
+    ---
+    tags:
+      - Entries
+    consumes:
+      - multipart/form-data
+      - application/x-ndjson
+      - text/csv
+    security:
+      - jwt: []
+    parameters:
+      - name: file
+        in: formData
+        type: file
+        required: false
+        description: One entry per NDJSON line or CSV row with title, context and an optional ISO 8601 created_at. The raw request body is read when no file is sent.
+      - name: format
+        in: query
+        type: string
+        enum: [ndjson, csv]
+        required: false
+        description: Defaults to the file extension or content type, then ndjson.
+    responses:
+      201:
+        description: Entries imported; per-line errors are listed and analysis is queued under the returned job_ids
+      400:
+        description: Validation error
+      404:
+        description: User not found
+      500:
+        description: Internal server error
+    """
+    schema = ImportEntriesSchema()
+    try:
+        args = schema.load(request.args)
+    except ValidationError as e:
+        return jsonify({'message': f'Validation error: {e.messages}'}), 400
+
+    upload = request.files.get('file')
+    if upload is not None:
+        stream = upload.stream
+        is_csv = (upload.filename or '').lower().endswith('.csv') or upload.mimetype == 'text/csv'
+    else:
+        stream = request.stream
+        is_csv = request.mimetype == 'text/csv'
+    file_format = args.get('format') or ('csv' if is_csv else 'ndjson')
+
+    user_id = int(get_jwt_identity())
+    entry_service = EntryService(db_session=db.session)
+    try:
+        result = entry_service.import_entries(stream, file_format, user_id)
+        return jsonify(result), 201
+    except NotFound as e:
+        return jsonify({'message': str(e)}), 404
+    except Exception as e:
+        return jsonify({'message': f'Internal server error: {str(e)}'}), 500
+
 @entry_bp.route('/get_entry_by_id', methods=['POST'])
 @jwt_required()
 def get_entry_by_id():
@@ -125,26 +187,136 @@ def get_all_entries():
     ---
     tags:
       - Entries
+    produces:
+      - application/json
+      - application/x-ndjson
     security:
       - jwt: []
+    parameters:
+      - name: limit
+        in: query
+        type: integer
+        required: false
+        description: Page size. When set, the response carries a next_cursor for the following page.
+      - name: cursor
+        in: query
+        type: string
+        required: false
+        description: The next_cursor returned by the previous page.
+      - name: fields
+        in: query
+        type: string
+        required: false
+        description: Comma-separated columns to return (id, title, context, created_at, updated_at). Defaults to id,title,context.
+      - name: format
+        in: query
+        type: string
+        enum: [json, ndjson]
+        required: false
+        description: ndjson streams one entry per line; a final {"next_cursor"} line follows when another page exists.
     responses:
       200:
         description: Entries retrieved successfully
+      400:
+        description: Validation error
       404:
         description: Entries not found
       500:
         description: Internal server error
     """
+    schema = ListEntriesSchema()
+    try:
+        args = schema.load(request.args)
+    except ValidationError as e:
+        return jsonify({'message': f'Validation error: {e.messages}'}), 400
+
     user_id = int(get_jwt_identity())
     entry_service = EntryService(db_session=db.session)
     try:
-        result = entry_service.get_all_entries(user_id)
+        if args.get('format') == 'ndjson':
+            lines = entry_service.stream_entries(user_id, args.get('projection'), args.get('limit'), args.get('cursor'))
+            return Response(stream_with_context(lines), mimetype='application/x-ndjson')
+        result = entry_service.get_all_entries(user_id, args.get('projection'), args.get('limit'), args.get('cursor'))
         return jsonify(result), 200
+    except BadRequest as e:
+        return jsonify({'message': str(e)}), 400
     except NotFound as e:
         return jsonify({'message': str(e)}), 404
     except Exception as e:
         return jsonify({'message': f'Internal server error: {str(e)}'}), 500
 
+@entry_bp.route('/export_entries', methods=['GET'])
+@jwt_required()
+def export_entries():
+    """
+    Export entries with their emotions, character traits and events
+    ---
+    tags:
+      - Entries
+    produces:
+      - application/gzip
+      - application/x-ndjson
+      - text/csv
+    security:
+      - jwt: []
+    parameters:
+      - name: format
+        in: query
+        type: string
+        enum: [ndjson, csv]
+        required: false
+        description: ndjson writes one entry per line; csv flattens traits into columns and stores events as JSON. Defaults to ndjson.
+      - name: start_date
+        in: query
+        type: string
+        format: date
+        required: false
+        description: First day to export, inclusive.
+      - name: end_date
+        in: query
+        type: string
+        format: date
+        required: false
+        description: Last day to export, inclusive.
+      - name: compress
+        in: query
+        type: boolean
+        required: false
+        description: Gzip the stream as it is written. Defaults to true.
+    responses:
+      200:
+        description: Export streamed as an attachment
+      400:
+        description: Validation error
+      404:
+        description: User not found
+      500:
+        description: Internal server error
+    """
+    schema = ExportEntriesSchema()
+    try:
+        args = schema.load(request.args)
+    except ValidationError as e:
+        return jsonify({'message': f'Validation error: {e.messages}'}), 400
+
+    user_id = int(get_jwt_identity())
+    export_service = ExportService(db_session=db.session)
+    file_format = args['format']
+    compression_level = current_app.config['EXPORT_COMPRESSION_LEVEL'] if args['compress'] else None
+    try:
+        chunks = export_service.export_entries(user_id, file_format, args.get('start_date'), args.get('end_date'), compression_level)
+    except NotFound as e:
+        return jsonify({'message': str(e)}), 404
+    except Exception as e:
+        return jsonify({'message': f'Internal server error: {str(e)}'}), 500
+
+    filename = f'entries.{file_format}'
+    mimetype = 'text/csv' if file_format == 'csv' else 'application/x-ndjson'
+    if compression_level is not None:
+        filename += '.gz'
+        mimetype = 'application/gzip'
+    return Response(stream_with_context(chunks), mimetype=mimetype, headers={'Content-Disposition': f'attachment; filename={filename}'})
+
 @entry_bp.route('/add_to_entry', methods=['POST'])
 @jwt_required()
 def add_to_entry():
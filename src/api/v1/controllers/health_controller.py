@@ -0,0 +1,49 @@
+from flask import jsonify, Blueprint, current_app
+
+from src.api.v1.services.health_service import HealthService
+
+
+health_bp = Blueprint('health', __name__, url_prefix='/health')
+
+
+@health_bp.route('/metrics', methods=['GET'])
+def get_metrics():
+    """
+    Get inference scheduler metrics
+    ---
+    tags:
+      - Health
+    responses:
+      200:
+        description: Batch fill rate and queue wait time per extractor, and inference cache counters
+      500:
+        description: Internal server error
+    """
+    health_service = HealthService()
+    try:
+        result = health_service.get_inference_metrics()
+        return jsonify(result), 200
+    except Exception as e:
+        return jsonify({'message': f'Internal server error: {str(e)}'}), 500
+
+@health_bp.route('/ready', methods=['GET'])
+def get_readiness():
+    """
+    Get per-model readiness and load time
+    ---
+    tags:
+      - Health
+    responses:
+      200:
+        description: Every warm-up model is loaded and has run a forward pass
+      503:
+        description: At least one warm-up model is not ready yet
+      500:
+        description: Internal server error
+    """
+    health_service = HealthService()
+    try:
+        result = health_service.get_readiness(current_app.config['WARMUP_MODELS'])
+        return jsonify(result), 200 if result['ready'] else 503
+    except Exception as e:
+        return jsonify({'message': f'Internal server error: {str(e)}'}), 500
@@ -1,7 +1,12 @@
+from datetime import datetime
 from src.extensions import db
+from src.api.v1.models.BaseModel import BaseModel
 
-class Advice(db.Model):
+class Advice(BaseModel, db.Model):
     __tablename__ = "advice"
+    __table_args__ = (
+        db.UniqueConstraint("user_id", "period_key", name="uq_advice_user_period"),
+    )
 
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
@@ -10,5 +15,23 @@ class Advice(db.Model):
     week = db.Column(db.Integer, nullable=True)
     month = db.Column(db.Integer, nullable=True)
     year = db.Column(db.Integer, nullable=False)
+    # week/month are NULL for coarser periods, and NULLs never collide in a unique index, so the period is also stored as one key
+    period_key = db.Column(db.String(16), nullable=False)
 
     user = db.relationship("User", back_populates="advice", lazy=True)
+
+    @staticmethod
+    def get_period_key(week: int | None, month: int | None, year: int) -> str:
+        if week is not None:
+            return f"{year}-W{week:02d}"
+        if month is not None:
+            return f"{year}-M{month:02d}"
+        return f"{year}"
+
+    @staticmethod
+    def get_periods(date: datetime) -> list[tuple[int | None, int | None, int]]:
+        return [(int(date.strftime("%W")), None, date.year), (None, date.month, date.year), (None, None, date.year)]
+
+    @staticmethod
+    def get_period_keys(date: datetime) -> list[str]:
+        return [Advice.get_period_key(*period) for period in Advice.get_periods(date)]
@@ -0,0 +1,25 @@
+from src.extensions import db
+from src.api.v1.models.BaseModel import BaseModel
+
+class AnalysisJob(BaseModel, db.Model):
+    __tablename__ = "analysis_jobs"
+    __table_args__ = (
+        db.Index("ix_analysis_jobs_entry_id_status", "entry_id", "status"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    entry_id = db.Column(db.Integer, db.ForeignKey("entries.id"), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
+
+    status = db.Column(db.String(20), default="pending", nullable=False)
+    error = db.Column(db.Text, nullable=True)
+
+    entry = db.relationship("Entry", back_populates="analysis_jobs", lazy=True)
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "entry_id": self.entry_id,
+            "status": self.status,
+            "error": self.error,
+        }
@@ -2,6 +2,9 @@ from src.extensions import db
 
 class CharacterTrait(db.Model):
     __tablename__ = "character_traits"
+    __table_args__ = (
+        db.UniqueConstraint("entry_id", name="uq_character_traits_entry_id"),
+    )
 
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     entry_id = db.Column(db.Integer, db.ForeignKey("entries.id"), nullable=False)
@@ -12,6 +15,8 @@ class CharacterTrait(db.Model):
     neuroticism = db.Column(db.Float, nullable=False)
     openness = db.Column(db.Float, nullable=False)
     mbti_type = db.Column(db.String(4), nullable=False)
+    chunk_count = db.Column(db.Integer, default=0, nullable=False)
+    analyzed_length = db.Column(db.Integer, default=0, nullable=False)
 
     entry = db.relationship("Entry", back_populates="character_traits", lazy=True)
 
@@ -0,0 +1,37 @@
+from src.extensions import db
+from src.api.v1.models.BaseModel import BaseModel
+
+TRAITS = ("agreableness", "conscientiousness", "extraversion", "neuroticism", "openness")
+
+class DailyRollup(BaseModel, db.Model):
+    __tablename__ = "daily_rollups"
+    __table_args__ = (
+        db.UniqueConstraint("user_id", "date", name="uq_daily_rollups_user_date"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
+    date = db.Column(db.Date, nullable=False)
+
+    entry_count = db.Column(db.Integer, default=0, nullable=False)
+    emotion_mask = db.Column(db.SmallInteger, default=0, nullable=False)
+    trait_count = db.Column(db.Integer, default=0, nullable=False)
+    agreableness_sum = db.Column(db.Float, default=0.0, nullable=False)
+    conscientiousness_sum = db.Column(db.Float, default=0.0, nullable=False)
+    extraversion_sum = db.Column(db.Float, default=0.0, nullable=False)
+    neuroticism_sum = db.Column(db.Float, default=0.0, nullable=False)
+    openness_sum = db.Column(db.Float, default=0.0, nullable=False)
+    agreableness_sq_sum = db.Column(db.Float, default=0.0, nullable=False)
+    conscientiousness_sq_sum = db.Column(db.Float, default=0.0, nullable=False)
+    extraversion_sq_sum = db.Column(db.Float, default=0.0, nullable=False)
+    neuroticism_sq_sum = db.Column(db.Float, default=0.0, nullable=False)
+    openness_sq_sum = db.Column(db.Float, default=0.0, nullable=False)
+    topic_counts = db.Column(db.JSON, default=dict, nullable=False)
+    # Set when an entry of this day changed after the row was last computed
+    stale = db.Column(db.Boolean, default=True, nullable=False)
+
+    def get_trait_sums(self):
+        return [getattr(self, f"{trait}_sum") for trait in TRAITS]
+
+    def get_trait_squares(self):
+        return [getattr(self, f"{trait}_sq_sum") for trait in TRAITS]
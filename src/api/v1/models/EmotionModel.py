@@ -1,7 +1,12 @@
 from src.extensions import db
 
+EMOTIONS = ("love", "joy", "sadness", "anger", "fear", "surprise")
+
 class Emotion(db.Model):
     __tablename__ = "emotions"
+    __table_args__ = (
+        db.UniqueConstraint("entry_id", name="uq_emotions_entry_id"),
+    )
 
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     entry_id = db.Column(db.Integer, db.ForeignKey("entries.id"), nullable=False)
@@ -12,21 +17,18 @@ class Emotion(db.Model):
     anger = db.Column(db.Boolean, default=False, nullable=False)
     fear = db.Column(db.Boolean, default=False, nullable=False)
     surprise = db.Column(db.Boolean, default=False, nullable=False)
+    analyzed_length = db.Column(db.Integer, default=0, nullable=False)
+    # The six flags packed as 1 << EMOTIONS.index(name), so periods can be OR-ed in SQL
+    bitmask = db.Column(db.SmallInteger, default=0, nullable=False)
 
     entry = db.relationship("Entry", back_populates="emotions", lazy=True)
 
     def to_list(self):
-        emotions_list = []
-        if self.love:
-            emotions_list.append("love")
-        if self.joy:
-            emotions_list.append("joy")
-        if self.sadness:
-            emotions_list.append("sadness")
-        if self.anger:
-            emotions_list.append("anger")
-        if self.fear:
-            emotions_list.append("fear")
-        if self.surprise:
-            emotions_list.append("surprise")
-        return emotions_list
+        return Emotion.decode_mask(self.bitmask)
+
+    def to_mask(self):
+        return sum(1 << i for i, emotion in enumerate(EMOTIONS) if getattr(self, emotion))
+
+    @staticmethod
+    def decode_mask(mask):
+        return [emotion for i, emotion in enumerate(EMOTIONS) if mask & (1 << i)]
@@ -3,14 +3,21 @@ from src.api.v1.models.BaseModel import BaseModel
 
 class Entry(BaseModel, db.Model):
     __tablename__ = "entries"
+    __table_args__ = (
+        # Serves date-range reads, keyset pagination and exports, which all filter on user_id and order by created_at, id
+        db.Index("ix_entries_user_id_created_at", "user_id", "created_at", "id"),
+    )
 
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
 
     title = db.Column(db.String(300), nullable=False)
     context = db.Column(db.Text, nullable=False)
+    # Events have one row per chunk and text can yield no chunk at all, so their coverage is kept on the entry
+    events_analyzed_length = db.Column(db.Integer, default=0, nullable=False)
 
     user = db.relationship("User", back_populates="entries", lazy=True)
     events = db.relationship("Event", back_populates="entry", lazy=True)
     emotions = db.relationship("Emotion", back_populates="entry", lazy=True)
     character_traits = db.relationship("CharacterTrait", back_populates="entry", lazy=True)
+    analysis_jobs = db.relationship("AnalysisJob", back_populates="entry", lazy=True)
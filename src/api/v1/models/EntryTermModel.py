@@ -0,0 +1,19 @@
+from src.extensions import db
+
+class EntryTerm(db.Model):
+    __tablename__ = "entry_terms"
+    __table_args__ = (
+        db.UniqueConstraint("entry_id", "term_id", name="uq_entry_terms_entry_term"),
+        # Covers "which entries mention X" and per-period counts without touching entries or events
+        db.Index("ix_entry_terms_user_term_created", "user_id", "term_id", "created_at", "entry_id"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    term_id = db.Column(db.Integer, db.ForeignKey("terms.id"), nullable=False)
+    kind = db.Column(db.String(20), nullable=False)
+    entry_id = db.Column(db.Integer, db.ForeignKey("entries.id"), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
+    # Copied from the entry so period filters stay on this table
+    created_at = db.Column(db.DateTime, nullable=False)
+
+    term = db.relationship("Term", lazy=True)
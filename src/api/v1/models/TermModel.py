@@ -0,0 +1,17 @@
+from src.extensions import db
+
+class Term(db.Model):
+    __tablename__ = "terms"
+    __table_args__ = (
+        db.UniqueConstraint("kind", "value", name="uq_terms_kind_value"),
+        db.Index("ix_terms_value", "value"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    # One of EVENT_FIELDS, e.g. "characters" or "topics"
+    kind = db.Column(db.String(20), nullable=False)
+    value = db.Column(db.String(250), nullable=False)
+
+    @staticmethod
+    def normalize(value: str) -> str:
+        return " ".join(str(value).lower().split())[:250]
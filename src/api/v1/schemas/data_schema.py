@@ -1,8 +1,13 @@
-from marshmallow import Schema, fields
+from marshmallow import Schema, fields, validate
+
+from src.api.v1.models.EventModel import EVENT_FIELDS
 
 class GetDataSchema(Schema):
     id = fields.Int(required=True)
 
+class GetBatchDataSchema(Schema):
+    ids = fields.List(fields.Int(), required=True, validate=validate.Length(min=1, max=200))
+
 class WeekDataSchema(Schema):
     week = fields.Int(required=True, min=1, max=52)
     year = fields.Int(required=True, min=2024, max=2100)
@@ -13,3 +18,33 @@ class MonthDataSchema(Schema):
 
 class YearDataSchema(Schema):
     year = fields.Int(required=True, min=2024, max=2100)
+
+class WeekSummarySchema(WeekDataSchema):
+    include_events = fields.Bool()
+
+class MonthSummarySchema(MonthDataSchema):
+    include_events = fields.Bool()
+
+class YearSummarySchema(YearDataSchema):
+    include_events = fields.Bool()
+
+class TrendsDataSchema(Schema):
+    year = fields.Int(required=True, min=2024, max=2100)
+    month = fields.Int(min=1, max=12)
+    week = fields.Int(min=1, max=52)
+    granularity = fields.Str(validate=validate.OneOf(('day', 'week', 'month')))
+    window = fields.Int(validate=validate.Range(min=1, max=366))
+
+class TermSearchSchema(Schema):
+    term = fields.Str(required=True, validate=validate.Length(min=1, max=250))
+    kind = fields.Str(validate=validate.OneOf(EVENT_FIELDS))
+    start_date = fields.Date()
+    end_date = fields.Date()
+    limit = fields.Int(load_default=100, validate=validate.Range(min=1, max=1000))
+
+class TermMentionsSchema(Schema):
+    term = fields.Str(required=True, validate=validate.Length(min=1, max=250))
+    kind = fields.Str(validate=validate.OneOf(EVENT_FIELDS))
+    start_date = fields.Date()
+    end_date = fields.Date()
+    granularity = fields.Str(load_default='month', validate=validate.OneOf(('day', 'week', 'month', 'year')))
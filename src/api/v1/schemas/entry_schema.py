@@ -1,4 +1,4 @@
-from marshmallow import Schema, fields
+from marshmallow import Schema, fields, validate
 
 class RegisterEntrySchema(Schema):
     title = fields.Str(required=True)
@@ -10,3 +10,23 @@ class GetEntryByIDSchema(Schema):
 class AddToEntrySchema(Schema):
     id = fields.Int(required=True)
     context = fields.Str(required=True)
+
+class ListEntriesSchema(Schema):
+    limit = fields.Int(validate=validate.Range(min=1, max=1000))
+    cursor = fields.Str()
+    format = fields.Str(validate=validate.OneOf(('json', 'ndjson')))
+    projection = fields.Str(data_key='fields')
+
+class ImportEntrySchema(Schema):
+    title = fields.Str(required=True, validate=validate.Length(min=1, max=300))
+    context = fields.Str(required=True, validate=validate.Length(min=1))
+    created_at = fields.DateTime()
+
+class ImportEntriesSchema(Schema):
+    format = fields.Str(validate=validate.OneOf(('ndjson', 'csv')))
+
+class ExportEntriesSchema(Schema):
+    format = fields.Str(load_default='ndjson', validate=validate.OneOf(('ndjson', 'csv')))
+    start_date = fields.Date()
+    end_date = fields.Date()
+    compress = fields.Bool(load_default=True)
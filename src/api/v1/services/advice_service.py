@@ -1,10 +1,14 @@
-from werkzeug.exceptions import BadRequest
-from datetime import datetime, timedelta
+from collections import Counter
+from typing import Iterator
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import joinedload, selectinload
 
 from src.api.v1.services.user_service import UserService
 from src.api.v1.services.data_service import DataService
 from src.api.v1.models.Advice import Advice
-from src.crew.active.advisor import Advisor
+from src.api.v1.models.EntryModel import Entry
+from src.crew.registry import model_registry
+from src.extensions import term_vocabulary
 
 
 class AdviceService():
@@ -12,70 +16,113 @@ class AdviceService():
         self.db_session = db_session
         self.user_service = UserService(db_session=db_session)
         self.data_service = DataService(db_session=db_session)
-        self.advisor = Advisor()
+
+    @property
+    def advisor(self):
+        return model_registry.get('advisor')
 
     def get_advice(self, week, month, year, user_id):
-        return Advice(week=week, month=month, year=year, user_id=user_id)
+        period_key = Advice.get_period_key(week, month, year)
+        return Advice.query.filter_by(user_id=user_id, period_key=period_key).first()
 
-    def advise_entry(self, entry_id, user_id):
-        emotions = self.data_service.get_entry_emotions(entry_id, user_id)
-        mbti_type = self.data_service.get_entry_mbti(entry_id, user_id)
-        events = self.data_service.get_entry_events(entry_id, user_id)
-        advice = self.advisor.advise(emotions, mbti_type, events)
+    def get_entry_inputs(self, entry_id, user_id):
+        emotions = self.data_service.get_entry_emotions(entry_id, user_id)['emotions']
+        mbti_type = self.data_service.get_entry_mbti(entry_id, user_id)['mbti_type']
+        events = self.data_service.get_entry_events(entry_id, user_id)['events']
+        return emotions, mbti_type, events
 
-        return {'advice': advice}
+    def get_period_entries(self, start_date, end_date, user_id):
+        return self.data_service.get_entries_by_date_range(start_date, end_date, user_id, joinedload(Entry.emotions), joinedload(Entry.character_traits), selectinload(Entry.events))
 
-    def advise_week(self, data, user_id):
-        user = self.user_service.get_user(user_id)
-        week = data['week']
-        year = data['year']
-        start_date = datetime.strptime(f'{year}-W{week}-1', "%Y-W%W-%w")
-        end_date = start_date + timedelta(weeks=1)
-                
-        if user.created_at > end_date:
-            raise BadRequest('User account was created after the requested timeframe.')
-        
-        advice = self.get_advice(week, None, year, user_id)
-        if not advice:
-            emotions = self.data_service.get_week_emotions_by_date_range(start_date, end_date, user_id)
-            characters = self.data_service.get_week_characters_by_date_range(start_date, end_date, user_id)
-            events = self.data_service.get_week_events_by_date_range(start_date, end_date, user_id)
-            advice = self.advisor.advise(emotions, characters, events)
-            advice = Advice(week=week, month=None, year=year, user_id=user_id, advice=advice)
-            self.db_session.add(advice)
+    def get_period_inputs(self, entries):
+        # Only stored analysis is read here; entries are analysed through the job queue or under the entry locks beforehand
+        emotions = set()
+        mbti_types = Counter()
+        events = []
+        term_vocabulary.preload(event for entry in entries for event in entry.events)
+        for entry in entries:
+            emotions.update(entry.emotions[0].to_list())
+            mbti_types[entry.character_traits[0].mbti_type] += 1
+            events.extend(event.to_string() for event in entry.events)
+
+        mbti_type = mbti_types.most_common(1)[0][0] if mbti_types else ''
+        return sorted(emotions), mbti_type, events
+
+    def save_advice(self, text, week, month, year, user_id):
+        period_key = Advice.get_period_key(week, month, year)
+        advice = Advice(week=week, month=month, year=year, period_key=period_key, user_id=user_id, advice=text)
+        self.db_session.add(advice)
+        try:
+            self.db_session.commit()
+        except IntegrityError:
+            # Another request stored this period first; keep the newest text in that row
+            self.db_session.rollback()
+            advice = self.get_advice(week, month, year, user_id)
+            advice.advice = text
             self.db_session.commit()
+        return advice
 
-        return {'advice': advice}
+    def advise_period(self, week, month, year, user_id):
+        advice = self.get_advice(week, month, year, user_id)
+        if not advice:
+            start_date, end_date = self.data_service.get_period_range(week, month, year, user_id)
+            entries = self.get_period_entries(start_date, end_date, user_id)
+            self.data_service.require_period_analysis(entries, user_id)
+            emotions, mbti_type, events = self.get_period_inputs(entries)
+            text = self.advisor.advise(emotions, mbti_type, events)
+            advice = self.save_advice(text, week, month, year, user_id)
 
-    def advise_month(self, data, user_id):
-        user = self.user_service.get_user(user_id)
-        month = data['month']
-        year = data['year']
-        start_date = datetime.strptime(f'{year}-{month}-1', "%Y-%m-%d")
-        end_date = start_date + timedelta(days=31)
-                
-        if user.created_at > end_date:
-            raise BadRequest('User account was created after the requested timeframe.')
-
-        emotions = self.data_service.get_month_emotions_by_date_range(start_date, end_date, user_id)
-        characters = self.data_service.get_month_characters_by_date_range(start_date, end_date, user_id)
-        events = self.data_service.get_month_events_by_date_range(start_date, end_date, user_id)
-        advice = self.advisor.advise(emotions, characters, events)
+        return {'advice': advice.advice}
 
-        return {'advice': advice}
+    def stream_period_advice(self, week, month, year, user_id) -> Iterator[str]:
+        advice = self.get_advice(week, month, year, user_id)
+        if advice:
+            return iter([advice.advice])
 
-    def advise_year(self, data, user_id):
-        user = self.user_service.get_user(user_id)
-        year = data['year']
-        start_date = datetime(year, 1, 1)
-        end_date = datetime(year + 1, 1, 1) - timedelta(days=1)
+        start_date, end_date = self.data_service.get_period_range(week, month, year, user_id)
+        entries = self.get_period_entries(start_date, end_date, user_id)
+        self.data_service.require_period_analysis(entries, user_id)
+        emotions, mbti_type, events = self.get_period_inputs(entries)
+        advisor = self.advisor
+
+        def stream():
+            tokens = []
+            for token in advisor.advise_stream(emotions, mbti_type, events):
+                tokens.append(token)
+                yield token
+            self.save_advice(''.join(tokens).strip(), week, month, year, user_id)
 
-        if user.created_at > end_date:
-            raise BadRequest('User account was created after the requested timeframe.')
+        return stream()
 
-        emotions = self.data_service.get_year_emotions_by_date_range(start_date, end_date, user_id)
-        characters = self.data_service.get_year_characters_by_date_range(start_date, end_date, user_id)
-        events = self.data_service.get_year_events_by_date_range(start_date, end_date, user_id)
-        advice = self.advisor.advise(emotions, characters, events)
+    def precompute_period(self, week, month, year, user_id):
+        if self.get_advice(week, month, year, user_id):
+            return
+        start_date, end_date = self.data_service.get_period_range(week, month, year, user_id)
+        entries = self.get_period_entries(start_date, end_date, user_id)
+        # A period with entries still being analysed is left to a later job or to the first request for it
+        if not all(self.data_service.is_analyzed(period_entry) for period_entry in entries):
+            return
+        text = self.advisor.advise(*self.get_period_inputs(entries))
+        self.save_advice(text, week, month, year, user_id)
+
+    def advise_entry(self, entry_id, user_id):
+        emotions, mbti_type, events = self.get_entry_inputs(entry_id, user_id)
+        advice = self.advisor.advise(emotions, mbti_type, events)
 
         return {'advice': advice}
+
+    def stream_entry_advice(self, entry_id, user_id) -> Iterator[str]:
+        emotions, mbti_type, events = self.get_entry_inputs(entry_id, user_id)
+        return self.advisor.advise_stream(emotions, mbti_type, events)
+
+    def advise_week(self, data, user_id):
+        return self.advise_period(data['week'], None, data['year'], user_id)
+
+    def stream_week_advice(self, data, user_id) -> Iterator[str]:
+        return self.stream_period_advice(data['week'], None, data['year'], user_id)
+
+    def advise_month(self, data, user_id):
+        return self.advise_period(None, data['month'], data['year'], user_id)
+
+    def advise_year(self, data, user_id):
+        return self.advise_period(None, None, data['year'], user_id)
@@ -1,451 +1,538 @@
 from werkzeug.exceptions import BadRequest
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
+import numpy as np
+from sqlalchemy.orm import joinedload, selectinload
 
-from src.api.v1.models.EmotionModel import Emotion
+from src.api.v1.models.EmotionModel import Emotion, EMOTIONS
 from src.api.v1.models.CharacterModel import CharacterTrait
 from src.api.v1.models.EventModel import Event
 from src.api.v1.models.EntryModel import Entry
+from src.api.v1.models.DailyRollupModel import DailyRollup, TRAITS
 
 from src.api.v1.services.entry_service import EntryService
 from src.api.v1.services.user_service import UserService
+from src.api.v1.services.job_service import JobService, lock_entries
+from src.api.v1.services.rollup_service import RollupService
+from src.api.v1.services.term_service import TermService
+from src.api.v1.utils import trait_stats
 
-from src.crew.active.emotion_extractor import EmotionExtractor
-from src.crew.active.character_extractor import CharacterExtractor
-from src.crew.active.event_extractor import EventExtractor
+from src.extensions import worker_pool, term_vocabulary
+from src.errors import AnalysisPending
 
+from src.crew.base.base_extractor import BaseExtractor
+from src.crew.registry import model_registry
+
+# Statements a period summary may issue: user + rollups, plus the entries, their events and one term lookup with include_events
+SUMMARY_QUERY_BUDGET = {False: 2, True: 5}
 
 class DataService:
     def __init__(self, db_session):
         self.db_session = db_session
         self.user_service = UserService(db_session=db_session)
         self.entry_service = EntryService(db_session=db_session)
-        self.emotion_extractor = EmotionExtractor()
-        self.character_extractor = CharacterExtractor()
-        self.event_extractor = EventExtractor()
+        self.job_service = JobService(db_session=db_session)
+        self.rollup_service = RollupService(db_session=db_session)
+        self.term_service = TermService(db_session=db_session)
+
+    @property
+    def emotion_extractor(self) -> BaseExtractor:
+        return model_registry.get('emotion')
+
+    @property
+    def character_extractor(self) -> BaseExtractor:
+        return model_registry.get('character')
+
+    @property
+    def event_extractor(self) -> BaseExtractor:
+        return model_registry.get('event')
+
+    def get_text(self, entry: Entry) -> str:
+        return entry.title + '\n' + entry.context
+
+    def get_chunks(self, text: str, start: int, extractor: BaseExtractor) -> list[tuple[int, int, str]]:
+        chunks = []
+        for chunk_start, chunk_end in extractor.chunker.chunk_offsets(text[start:]):
+            chunks.append((start + chunk_start, start + chunk_end, text[start + chunk_start: start + chunk_end]))
+        return chunks
+
+    def plan_emotions(self, entry: Entry) -> tuple[Emotion, list[tuple[int, int, str]]] | None:
+        text = self.get_text(entry)
+        emotions = entry.emotions[0] if entry.emotions else None
+        if emotions and (emotions.analyzed_length or 0) >= len(text):
+            return None
 
-    def get_emotions(self, entry: Entry) -> Emotion:
-        emotions = entry.emotions
         if not emotions:
-            emotions_map ={
-                'love': False,
-                'joy': False,
-                'sadness': False,
-                'anger': False,
-                'fear': False,
-                'surprise': False
-            }
-            text = entry.title + '\n' + entry.context
-            for i in range(0, len(text), 128):
-                if i + 128 < len(text):
-                    emotion = self.emotion_extractor.extract(text[i: i + 128])
-                elif len(text) - i > 100:
-                    emotion = self.emotion_extractor.extract(text[i:])
-                else:
-                    emotion = None
-                if emotion and emotion in emotions_map:
-                    emotions_map[emotion] = True
-            emotions = Emotion(love=emotions_map['love'], joy=emotions_map['joy'], sadness=emotions_map['sadness'], anger=emotions_map['anger'], fear=emotions_map['fear'], surprise=emotions_map['surprise'], entry=entry)
+            emotions = Emotion(love=False, joy=False, sadness=False, anger=False, fear=False, surprise=False, analyzed_length=0, bitmask=0, entry=entry)
             self.db_session.add(emotions)
-            self.db_session.commit()
+        return emotions, self.get_chunks(text, emotions.analyzed_length or 0, self.emotion_extractor)
+
+    def apply_emotions(self, entry: Entry, emotions: Emotion, chunks: list[tuple[int, int, str]], results: list) -> None:
+        for emotion in results:
+            if emotion in EMOTIONS:
+                setattr(emotions, emotion, True)
+        emotions.bitmask = emotions.to_mask()
+        emotions.analyzed_length = len(self.get_text(entry))
+
+    def get_emotions(self, entry: Entry) -> Emotion:
+        plan = self.plan_emotions(entry)
+        if plan is None:
+            return entry.emotions[0]
+
+        emotions, chunks = plan
+        self.apply_emotions(entry, emotions, chunks, self.emotion_extractor.schedule([chunk for _, _, chunk in chunks]) if chunks else [])
+        self.db_session.commit()
 
         return emotions
-    
-    def get_characters(self, entry: Entry) -> CharacterTrait:
-        characters = entry.character_traits
+
+    def plan_characters(self, entry: Entry) -> tuple[CharacterTrait, list[tuple[int, int, str]]] | None:
+        text = self.get_text(entry)
+        characters = entry.character_traits[0] if entry.character_traits else None
+        if characters and (characters.analyzed_length or 0) >= len(text):
+            return None
+
         if not characters:
-            characters_map ={
-                'agreableness': 0,
-                'conscientiousness': 0,
-                'extraversion': 0,
-                'neuroticism': 0,
-                'openness': 0
-            }
-            text = entry.title + '\n' + entry.context
-            for i in range(0, len(text), 128):
-                if i + 128 < len(text):
-                    characters_map = self.character_extractor.extract(text[i: i + 128])
-                    agreableness = characters_map['agreableness']
-                    conscientiousness = characters_map['conscientiousness']
-                    extraversion = characters_map['extraversion']
-                    neuroticism = characters_map['neuroticism']
-                    openness = characters_map['openness']
-                elif len(text) - i > 100:
-                    characters_map = self.character_extractor.extract(text[i:])
-                    agreableness = characters_map['agreableness']
-                    conscientiousness = characters_map['conscientiousness']
-                    extraversion = characters_map['extraversion']
-                    neuroticism = characters_map['neuroticism']
-                    openness = characters_map['openness']
-                else: 
-                    agreableness = 0
-                    conscientiousness = 0
-                    extraversion = 0
-                    neuroticism = 0
-                    openness = 0
-                characters_map['agreableness'] += agreableness
-                characters_map['conscientiousness'] += conscientiousness
-                characters_map['extraversion'] += extraversion
-                characters_map['neuroticism'] += neuroticism
-                characters_map['openness'] += openness
-            number = len(text) // 128
-            characters_map['agreableness'] = float(characters_map['agreableness']) / number
-            characters_map['conscientiousness'] = float(characters_map['conscientiousness']) / number
-            characters_map['extraversion'] = float(characters_map['extraversion']) / number
-            characters_map['neuroticism'] = float(characters_map['neuroticism']) / number
-            characters_map['openness'] = float(characters_map['openness']) / number
-            mbti_type = self.character_extractor.get_mbti_type(characters_map)
-            characters = CharacterTrait(agreableness=characters_map['agreableness'], conscientiousness=characters_map['conscientiousness'], extraversion=characters_map['extraversion'], neuroticism=characters_map['neuroticism'], openness=characters_map['openness'], mbti_type=mbti_type, entry=entry)
+            characters = CharacterTrait(agreableness=0.0, conscientiousness=0.0, extraversion=0.0, neuroticism=0.0, openness=0.0, mbti_type='', chunk_count=0, analyzed_length=0, entry=entry)
             self.db_session.add(characters)
-            self.db_session.commit()
+        return characters, self.get_chunks(text, characters.analyzed_length or 0, self.character_extractor)
+
+    def apply_characters(self, entry: Entry, characters: CharacterTrait, chunks: list[tuple[int, int, str]], scores: list) -> None:
+        characters_map ={
+            'agreeableness': characters.agreableness,
+            'conscientiousness': characters.conscientiousness,
+            'extraversion': characters.extraversion,
+            'neuroticism': characters.neuroticism,
+            'openness': characters.openness
+        }
+        if scores:
+            count = characters.chunk_count or 0
+            for trait in characters_map:
+                total = characters_map[trait] * count + sum(ocean5_scores[trait] for ocean5_scores in scores)
+                characters_map[trait] = float(total) / (count + len(scores))
+            characters.chunk_count = count + len(scores)
+
+        characters.agreableness = characters_map['agreeableness']
+        characters.conscientiousness = characters_map['conscientiousness']
+        characters.extraversion = characters_map['extraversion']
+        characters.neuroticism = characters_map['neuroticism']
+        characters.openness = characters_map['openness']
+        characters.mbti_type = self.character_extractor.get_mbti_type(characters_map)
+        characters.analyzed_length = len(self.get_text(entry))
+
+    def get_characters(self, entry: Entry) -> CharacterTrait:
+        plan = self.plan_characters(entry)
+        if plan is None:
+            return entry.character_traits[0]
+
+        characters, chunks = plan
+        self.apply_characters(entry, characters, chunks, self.character_extractor.schedule([chunk for _, _, chunk in chunks]) if chunks else [])
+        self.db_session.commit()
 
         return characters
-    
+
+    def plan_events(self, entry: Entry) -> tuple[None, list[tuple[int, int, str]]] | None:
+        text = self.get_text(entry)
+        start = entry.events_analyzed_length or 0
+        if start >= len(text):
+            return None
+        return None, self.get_chunks(text, start, self.event_extractor)
+
+    def apply_events(self, entry: Entry, _, chunks: list[tuple[int, int, str]], extracted_events: list) -> None:
+        term_ids = self.term_service.get_term_ids(set().union(*map(self.term_service.get_event_terms, extracted_events)))
+        events = []
+        for (chunk_start, chunk_end, _), extracted_event in zip(chunks, extracted_events):
+            single_event = Event(**self.term_service.encode_event(extracted_event, term_ids), chunk_start=chunk_start, chunk_end=chunk_end, entry=entry)
+            self.db_session.add(single_event)
+            events.append(single_event)
+        self.term_service.index_events(entry, events)
+        entry.events_analyzed_length = len(self.get_text(entry))
+
     def get_events(self, entry: Entry) -> list[Event]:
-        events = entry.events
-        if not events:
-            events = []
-            text = entry.title + '\n' + entry.context
-            for i in range(0, len(text), 128):
-                if i + 128 < len(text):
-                    extracted_event = self.event_extractor.extract(text[i: i + 128])
-                elif len(text) - i > 100:
-                    extracted_event = self.event_extractor.extract(text[i:])
-                else:
-                    extracted_event = None
-                if extracted_event:
-                    single_event = Event(characters=extracted_event['characters'], actions=extracted_event['actions'], times=extracted_event['times'], locations=extracted_event['locations'], objects=extracted_event['objects'], subjects=extracted_event['subjects'], adjectives=extracted_event['adjectives'], adverbs=extracted_event['adverbs'], topics=extracted_event['topics'], organizations=extracted_event['organizations'], events=extracted_event['events'], entry=entry)
-                    events.append(single_event)
-                    self.db_session.add(single_event)
-            self.db_session.commit()
-
-        return events
+        plan = self.plan_events(entry)
+        if plan is None:
+            return entry.events
+
+        _, chunks = plan
+        self.apply_events(entry, None, chunks, self.event_extractor.schedule([chunk for _, _, chunk in chunks]) if chunks else [])
+        self.db_session.commit()
+
+        return entry.events
+
+    def extract_entries(self, entries: list[Entry]) -> None:
+        # One schedule() call per extractor covers every chunk of every entry, so imports fill whole inference batches
+        steps = (
+            (self.plan_emotions, self.apply_emotions, 'emotion_extractor'),
+            (self.plan_characters, self.apply_characters, 'character_extractor'),
+            (self.plan_events, self.apply_events, 'event_extractor'),
+        )
+        for plan_step, apply_step, extractor in steps:
+            plans = [(entry, plan) for entry in entries if (plan := plan_step(entry)) is not None]
+            texts = [chunk for _, (_, chunks) in plans for _, _, chunk in chunks]
+            results = getattr(self, extractor).schedule(texts) if texts else []
+            offset = 0
+            for entry, (row, chunks) in plans:
+                apply_step(entry, row, chunks, results[offset:offset + len(chunks)])
+                offset += len(chunks)
+        self.db_session.commit()
+
+    def extract_locked(self, entries: list[Entry]) -> None:
+        # Requests analyse inline when the worker pool is off; they take the same entry locks as the jobs so a tail is never merged twice
+        with lock_entries([entry.id for entry in entries]):
+            for entry in entries:
+                # Another request may have analysed the entry while this one waited for its lock
+                self.db_session.expire(entry)
+            self.extract_entries(entries)
+
+    def refresh_rollups(self, entries: list[Entry]) -> None:
+        for user_id, day in sorted({(entry.user_id, entry.created_at.date()) for entry in entries}):
+            self.refresh_rollup(user_id, day)
+
+    def analyze_entries(self, entries: list[Entry]) -> None:
+        self.extract_entries(entries)
+        self.refresh_rollups(entries)
+
+    def require_period_analysis(self, entries: list[Entry], user_id: int) -> None:
+        unanalyzed = [entry for entry in entries if not self.is_analyzed(entry)]
+        if not unanalyzed:
+            return
+        if worker_pool.enabled:
+            job_ids = list(self.queue_analysis(unanalyzed, user_id).values())
+            raise AnalysisPending(job_ids[0], job_ids=job_ids)
+        self.extract_locked(unanalyzed)
+        self.refresh_rollups(unanalyzed)
+
+    def queue_analysis(self, entries: list[Entry], user_id: int) -> dict[int, int]:
+        # An entry with a pending or running job reuses it, so repeated reads never pile up jobs
+        active = self.job_service.get_active_jobs([entry.id for entry in entries])
+        queued = [entry.id for entry in entries if entry.id not in active]
+        pending = {entry_id: job.id for entry_id, job in active.items()}
+        pending.update(zip(queued, self.job_service.enqueue_batch_analysis(queued, user_id)))
+        return pending
+
+    def is_analyzed(self, entry: Entry) -> bool:
+        if not (entry.emotions and entry.character_traits):
+            return False
+        text_length = len(self.get_text(entry))
+        return entry.emotions[0].analyzed_length >= text_length and entry.character_traits[0].analyzed_length >= text_length and (entry.events_analyzed_length or 0) >= text_length
+
+    def require_analysis(self, entry: Entry) -> None:
+        if not worker_pool.enabled or self.is_analyzed(entry):
+            return
+        job = self.job_service.get_active_job(entry.id) or self.job_service.enqueue_analysis(entry)
+        raise AnalysisPending(job.id)
+
+    def analyze_entry(self, entry: Entry) -> None:
+        self.get_emotions(entry)
+        self.get_characters(entry)
+        self.get_events(entry)
+        self.refresh_rollup(entry.user_id, entry.created_at.date())
+
+    def get_day_entries(self, user_id: int, day: date) -> list[Entry]:
+        start_date = datetime.combine(day, datetime.min.time())
+        return self.get_entries_by_date_range(start_date, start_date + timedelta(days=1), user_id, joinedload(Entry.emotions), joinedload(Entry.character_traits), selectinload(Entry.events))
+
+    def refresh_rollup(self, user_id: int, day: date, analyze: bool = False, emotion_mask: int | None = None) -> DailyRollup:
+        entries = self.get_day_entries(user_id, day)
+        unanalyzed = [entry for entry in entries if not self.is_analyzed(entry)]
+        if analyze and unanalyzed:
+            # With the worker pool on, the jobs refresh this rollup when they finish; until then it is built from what is stored
+            if worker_pool.enabled:
+                self.queue_analysis(unanalyzed, user_id)
+            else:
+                self.extract_locked(unanalyzed)
+        stale = not all(self.is_analyzed(entry) for entry in entries)
+        return self.rollup_service.refresh_day(user_id, day, entries, stale=stale, emotion_mask=emotion_mask)
+
+    def get_period_rollups(self, start_date: datetime, end_date: datetime, user_id: int) -> list[DailyRollup]:
+        rollups = self.rollup_service.get_rollups(start_date, end_date, user_id)
+        for rollup in rollups:
+            if rollup.stale:
+                self.refresh_rollup(user_id, rollup.date, analyze=True)
+        return rollups
 
     def get_entry_emotions(self, entry_id: int, user_id: int) -> dict[str, list]:
-        entry = self.entry_service.get_user_entry(entry_id, user_id)
+        entry = self.entry_service.get_user_entry_by_id(entry_id, user_id)
+        self.require_analysis(entry)
         emotions = self.get_emotions(entry)
         emotions_detected = emotions.to_list()
         return {'emotions': emotions_detected}
 
     def get_entry_characters(self, entry_id: int, user_id: int) -> dict[str, dict[str, float]]:
-        entry = self.entry_service.get_user_entry(entry_id, user_id)
+        entry = self.entry_service.get_user_entry_by_id(entry_id, user_id)
+        self.require_analysis(entry)
         characters = self.get_characters(entry)
         characters_detected = characters.to_dict()
         return {'characters': characters_detected}
     
     def get_entry_mbti(self, entry_id: int, user_id: int) -> dict[str, str]:
-        entry = self.entry_service.get_user_entry(entry_id, user_id)
+        entry = self.entry_service.get_user_entry_by_id(entry_id, user_id)
+        self.require_analysis(entry)
         characters = self.get_characters(entry)
         mbti_type = characters.mbti_type
         return {'mbti_type': mbti_type}
 
     def get_entry_events(self, entry_id: int, user_id: int) -> dict[str, list[str]]:
-        entry = self.entry_service.get_user_entry(entry_id, user_id)
+        entry = self.entry_service.get_user_entry_by_id(entry_id, user_id)
+        self.require_analysis(entry)
         events = self.get_events(entry)
+        term_vocabulary.preload(events)
         events_detected = [event.to_string() for event in events]
         return {'events': events_detected}
 
-    def get_entry_summary(self, entry_id: int, user_id: int) -> dict[str, dict[str, list[str]]]:
-        entry = self.entry_service.get_user_entry(entry_id, user_id)
+    def summarize_entry(self, entry: Entry) -> dict[str, list | dict]:
         emotions = self.get_emotions(entry)
         characters = self.get_characters(entry)
         events = self.get_events(entry)
+        term_vocabulary.preload(events)
         return {
             'emotions': emotions.to_list(),
             'characters': characters.to_dict(),
             'events': [event.to_string() for event in events]
         }
 
-    def get_entries_by_date_range(self, start_date: datetime, end_date: datetime, user_id: int) -> list[Entry]:
-        return Entry.query.filter(Entry.created_at.between(start_date, end_date), Entry.user_id == user_id).all()
-
-    def get_week_emotions_by_date_range(self, start_date: datetime, end_date: datetime, user_id: int) -> dict[int, list[str]]:
-        entries = self.get_entries_by_date_range(start_date, end_date, user_id)
-
-        week_emotions = {day: set() for day in range(1, 8)}
-
-        for entry in entries:
-            day_of_week = entry.created_at.isoweekday()
-            emotions = self.get_emotions(entry)
-            week_emotions[day_of_week].update(emotions.to_list())
-        
-        for day in week_emotions:
-            week_emotions[day] = list(week_emotions[day])
-        
-        return week_emotions
-
-    def get_month_emotions_by_date_range(self, start_date: datetime, end_date: datetime, user_id: int) -> dict[int, list[str]]:
-        month_emotions = {day: set() for day in range(1, 32)}
+    def get_entry_summary(self, entry_id: int, user_id: int) -> dict[str, dict[str, list[str]]]:
+        entry = self.entry_service.get_user_entry_by_id(entry_id, user_id)
+        self.require_analysis(entry)
+        return self.summarize_entry(entry)
+
+    def get_entry_summaries(self, entry_ids: list[int], user_id: int) -> dict[str, dict | list]:
+        entries = Entry.query.options(joinedload(Entry.emotions), joinedload(Entry.character_traits), selectinload(Entry.events)).filter(Entry.id.in_(entry_ids), Entry.user_id == user_id).all()
+        found = {entry.id for entry in entries}
+        unanalyzed = [entry for entry in entries if not self.is_analyzed(entry)]
+
+        pending = {}
+        if unanalyzed and worker_pool.enabled:
+            pending = self.queue_analysis(unanalyzed, user_id)
+        elif unanalyzed:
+            self.extract_locked(unanalyzed)
+            self.refresh_rollups(unanalyzed)
 
-        week_start = start_date
-        while week_start <= end_date:
-            week_end = week_start + timedelta(days=6)
+        return {
+            'summaries': {entry.id: self.summarize_entry(entry) for entry in entries if entry.id not in pending},
+            'pending': pending,
+            'missing': [entry_id for entry_id in dict.fromkeys(entry_ids) if entry_id not in found]
+        }
 
-            if week_end > end_date:
-                week_end = end_date
+    @staticmethod
+    def get_date_bounds(data: dict) -> tuple[datetime | None, datetime | None]:
+        start_date = datetime.combine(data['start_date'], datetime.min.time()) if data.get('start_date') else None
+        end_date = datetime.combine(data['end_date'] + timedelta(days=1), datetime.min.time()) if data.get('end_date') else None
+        return start_date, end_date
+
+    def search_entries(self, data: dict, user_id: int) -> dict[str, list]:
+        self.user_service.get_user_by_id(user_id)
+        start_date, end_date = self.get_date_bounds(data)
+        return {'entries': self.term_service.find_entries(user_id, data['term'], data.get('kind'), start_date, end_date, data['limit'])}
+
+    def get_term_mentions(self, data: dict, user_id: int) -> dict[str, dict]:
+        self.user_service.get_user_by_id(user_id)
+        start_date, end_date = self.get_date_bounds(data)
+        return {'mentions': self.term_service.count_mentions(user_id, data['term'], data.get('kind'), start_date, end_date, data['granularity'])}
+
+    def get_period_range(self, week: int | None, month: int | None, year: int, user_id: int) -> tuple[datetime, datetime]:
+        user = self.user_service.get_user_by_id(user_id)
+        if week is not None:
+            start_date = datetime.strptime(f'{year}-W{week}-1', "%Y-W%W-%w")
+            end_date = start_date + timedelta(weeks=1)
+        elif month is not None:
+            start_date = datetime(year, month, 1)
+            end_date = datetime(year + month // 12, month % 12 + 1, 1)
+        else:
+            start_date = datetime(year, 1, 1)
+            end_date = datetime(year + 1, 1, 1)
+
+        # Imported entries can predate the account, so only an empty timeframe before signup is rejected
+        if user.created_at > end_date and self.get_date_range_query(start_date, end_date, user_id).with_entities(Entry.id).first() is None:
+            raise BadRequest('User account was created after the requested timeframe.')
 
-            week_emotions = self.get_week_emotions_by_date_range(week_start, week_end, user_id)
+        return start_date, end_date
+
+    def get_date_range_query(self, start_date: datetime, end_date: datetime, user_id: int, *options):
+        return Entry.query.options(*options).filter(Entry.created_at >= start_date, Entry.created_at < end_date, Entry.user_id == user_id).order_by(Entry.created_at)
+
+    def get_entries_by_date_range(self, start_date: datetime, end_date: datetime, user_id: int, *options) -> list[Entry]:
+        return self.get_date_range_query(start_date, end_date, user_id, *options).all()
+
+    @staticmethod
+    def make_buckets(granularity: str, factory) -> dict:
+        if granularity == 'week':
+            return {day: factory() for day in range(1, 8)}
+        if granularity == 'month':
+            return {day: factory() for day in range(1, 32)}
+        return {month: {day: factory() for day in range(1, 32)} for month in range(1, 13)}
+
+    @staticmethod
+    def get_bucket(buckets: dict, granularity: str, day: date) -> tuple[dict, int]:
+        if granularity == 'week':
+            return buckets, day.isoweekday()
+        if granularity == 'month':
+            return buckets, day.day
+        return buckets[day.month], day.day
+
+    def aggregate_period(self, rows: list, granularity: str, factory, add, finalize, get_day=lambda row: row.date) -> dict:
+        buckets = self.make_buckets(granularity, factory)
+        for row in rows:
+            bucket, key = self.get_bucket(buckets, granularity, get_day(row))
+            add(bucket[key], row)
+
+        if granularity == 'year':
+            return {month: {day: finalize(values) for day, values in days.items()} for month, days in buckets.items()}
+        return {key: finalize(values) for key, values in buckets.items()}
+
+    def get_trait_row(self, rollup: DailyRollup) -> tuple:
+        return rollup.date, rollup.get_trait_sums(), rollup.get_trait_squares(), rollup.trait_count
+
+    def get_trait_matrix(self, rows: list[tuple]) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        days = np.array([row[0] for row in rows], dtype='datetime64[D]')
+        sums = np.array([row[1] for row in rows], dtype=float).reshape(-1, len(TRAITS))
+        squares = np.array([row[2] for row in rows], dtype=float).reshape(-1, len(TRAITS))
+        counts = np.array([row[3] for row in rows], dtype=float)
+        return days, sums, squares, counts
+
+    def decode_emotions(self, masks: dict, granularity: str) -> dict:
+        if granularity == 'year':
+            return {month: {day: Emotion.decode_mask(mask) for day, mask in days.items()} for month, days in masks.items()}
+        return {key: Emotion.decode_mask(mask) for key, mask in masks.items()}
+
+    def bucket_characters(self, trait_rows: list[tuple], granularity: str, start_date: datetime, end_date: datetime) -> dict:
+        days, sums, squares, counts = self.get_trait_matrix(trait_rows)
+        index = trait_stats.get_bucket_index(days, start_date.date(), 'day')
+        means, _, day_counts, _ = trait_stats.aggregate_traits(index, (end_date - start_date).days, sums, squares, counts)
+
+        characters = self.make_buckets(granularity, dict)
+        for offset in np.flatnonzero(day_counts > 0):
+            bucket, key = self.get_bucket(characters, granularity, start_date.date() + timedelta(days=int(offset)))
+            bucket[key] = dict(zip(TRAITS, means[offset].tolist()))
+        return characters
 
-            for day, emotions in week_emotions.items():
-                actual_day = (week_start + timedelta(days=day - 1)).day
-                month_emotions[actual_day].update(emotions)
+    def aggregate_events(self, entries: list[Entry], granularity: str) -> dict:
+        # One vocabulary query for the whole period instead of one per event; only stored events are read
+        term_vocabulary.preload(event for entry in entries for event in entry.events)
+        return self.aggregate_period(entries, granularity, list, lambda values, entry: values.extend(event.to_string() for event in entry.events), list, lambda entry: entry.created_at)
 
-            week_start = week_end + timedelta(days=1)
-        
-        for day in month_emotions:
-            month_emotions[day] = list(month_emotions[day])
+    def summarize_rollups(self, rollups: list[DailyRollup], granularity: str, start_date: datetime, end_date: datetime) -> dict[str, dict]:
+        masks = self.make_buckets(granularity, int)
+        trait_rows = []
+        for rollup in rollups:
+            bucket, key = self.get_bucket(masks, granularity, rollup.date)
+            bucket[key] |= rollup.emotion_mask
+            if rollup.trait_count:
+                trait_rows.append(self.get_trait_row(rollup))
 
-        return month_emotions
+        return {
+            'emotions': self.decode_emotions(masks, granularity),
+            'characters': self.bucket_characters(trait_rows, granularity, start_date, end_date)
+        }
 
-    def get_year_emotions_by_date_range(self, start_date: datetime, end_date: datetime, user_id: int) -> dict[int, dict[int, list[str]]]:
-        year_emotions = {month: {day: set() for day in range(1, 32)} for month in range(1, 13)}
+    def summarize_period(self, start_date: datetime, end_date: datetime, user_id: int, granularity: str, include_events: bool = False) -> dict[str, dict]:
+        rollups = self.get_period_rollups(start_date, end_date, user_id)
+        summary = self.summarize_rollups(rollups, granularity, start_date, end_date)
+        if include_events:
+            summary['events'] = self.get_events_by_date_range(start_date, end_date, user_id, granularity)
+        return summary
 
-        month_start = start_date
-        while month_start <= end_date:
-            next_month = month_start.month % 12 + 1
-            year = month_start.year + (month_start.month // 12)
-            month_end = datetime(year, next_month, 1) - timedelta(days=1)
+    def get_emotions_by_date_range(self, start_date: datetime, end_date: datetime, user_id: int, granularity: str) -> dict:
+        return self.summarize_period(start_date, end_date, user_id, granularity)['emotions']
 
-            if month_end > end_date:
-                month_end = end_date
+    def get_characters_by_date_range(self, start_date: datetime, end_date: datetime, user_id: int, granularity: str) -> dict:
+        return self.summarize_period(start_date, end_date, user_id, granularity)['characters']
 
-            month_emotions = self.get_month_emotions_by_date_range(month_start, month_end, user_id)
+    def get_events_by_date_range(self, start_date: datetime, end_date: datetime, user_id: int, granularity: str) -> dict:
+        entries = self.get_entries_by_date_range(start_date, end_date, user_id, joinedload(Entry.emotions), joinedload(Entry.character_traits), selectinload(Entry.events))
+        self.require_period_analysis(entries, user_id)
+        return self.aggregate_events(entries, granularity)
 
-            for day, emotions in month_emotions.items():
-                year_emotions[month_start.month][day].update(emotions)
+    def get_week_emotions_by_date_range(self, start_date: datetime, end_date: datetime, user_id: int) -> dict[int, list[str]]:
+        return self.get_emotions_by_date_range(start_date, end_date, user_id, 'week')
 
-            month_start = month_end + timedelta(days=1)
-        
-        for month in year_emotions:
-            for day in year_emotions[month]:
-                year_emotions[month][day] = list(year_emotions[month][day])
+    def get_month_emotions_by_date_range(self, start_date: datetime, end_date: datetime, user_id: int) -> dict[int, list[str]]:
+        return self.get_emotions_by_date_range(start_date, end_date, user_id, 'month')
 
-        return year_emotions
+    def get_year_emotions_by_date_range(self, start_date: datetime, end_date: datetime, user_id: int) -> dict[int, dict[int, list[str]]]:
+        return self.get_emotions_by_date_range(start_date, end_date, user_id, 'year')
 
     def get_week_emotions(self, data: dict[str, int], user_id: int) -> dict[int, list[str]]:
-        user = self.user_service.get_user(user_id)
-        week = data['week']
-        year = data['year']
-        start_date = datetime.strptime(f'{year}-W{week}-1', "%Y-W%W-%w")
-        end_date = start_date + timedelta(weeks=1)
-                
-        if user.created_at > end_date:
-            raise BadRequest('User account was created after the requested timeframe.')
-
+        start_date, end_date = self.get_period_range(data['week'], None, data['year'], user_id)
         emotions = self.get_week_emotions_by_date_range(start_date, end_date, user_id)
         return {'emotions': emotions}
 
     def get_month_emotions(self, data: dict[str, int], user_id: int) -> dict[int, list[str]]:
-        user = self.user_service.get_user(user_id)
-        month = data['month']
-        year = data['year']
-        start_date = datetime.strptime(f'{year}-{month}-1', "%Y-%m-%d")
-        end_date = start_date + timedelta(days=31)
-                
-        if user.created_at > end_date:
-            raise BadRequest('User account was created after the requested timeframe.')
-
+        start_date, end_date = self.get_period_range(None, data['month'], data['year'], user_id)
         emotions = self.get_month_emotions_by_date_range(start_date, end_date, user_id)
         return {'emotions': emotions}
 
     def get_year_emotions(self, data: dict[str, int], user_id: int) -> dict[int, dict[int, list[str]]]:
-        user = self.user_service.get_user(user_id)
-        year = data['year']
-        start_date = datetime(year, 1, 1)
-        end_date = datetime(year + 1, 1, 1) - timedelta(days=1)
-
-        if user.created_at > end_date:
-            raise BadRequest('User account was created after the requested timeframe.')
-
+        start_date, end_date = self.get_period_range(None, None, data['year'], user_id)
         emotions = self.get_year_emotions_by_date_range(start_date, end_date, user_id)
         return {'emotions': emotions}
 
     def get_week_characters_by_date_range(self, start_date: datetime, end_date: datetime, user_id: int) -> dict[int, dict[str, float]]:
-        entries = self.get_entries_by_date_range(start_date, end_date, user_id)
-
-        week_characters = {day: {} for day in range(1, 8)}
-
-        for entry in entries:
-            day_of_week = entry.created_at.isoweekday()
-            characters = self.get_characters(entry)
-            week_characters[day_of_week] = characters.to_dict()
-        
-        for day in week_characters:
-            week_characters[day] = characters.to_dict()
-
-        return week_characters
+        return self.get_characters_by_date_range(start_date, end_date, user_id, 'week')
 
     def get_month_characters_by_date_range(self, start_date: datetime, end_date: datetime, user_id: int) -> dict[int, dict[str, float]]:
-        month_characters = {day: {} for day in range(1, 32)}
-
-        week_start = start_date
-        while week_start <= end_date:
-            week_end = week_start + timedelta(days=6)
-
-            if week_end > end_date:
-                week_end = end_date
-
-            week_characters = self.get_week_characters_by_date_range(week_start, week_end, user_id)
-
-            for day, characters in week_characters.items():
-                actual_day = (week_start + timedelta(days=day - 1)).day
-                month_characters[actual_day] = characters.to_dict()
-
-            week_start = week_end + timedelta(days=1)
-
-        return month_characters
+        return self.get_characters_by_date_range(start_date, end_date, user_id, 'month')
 
     def get_year_characters_by_date_range(self, start_date: datetime, end_date: datetime, user_id: int) -> dict[int, dict[int, dict[str, float]]]:
-        year_characters = {month: {day: {} for day in range(1, 32)} for month in range(1, 13)}
-
-        month_start = start_date
-        while month_start <= end_date:
-            next_month = month_start.month % 12 + 1
-            year = month_start.year + (month_start.month // 12)
-            month_end = datetime(year, next_month, 1) - timedelta(days=1)
-
-            if month_end > end_date:
-                month_end = end_date
-
-            month_characters = self.get_month_characters_by_date_range(month_start, month_end, user_id)
-
-            for day, characters in month_characters.items():
-                year_characters[month_start.month][day] = characters.to_dict()
-
-            month_start = month_end + timedelta(days=1)
-
-        return year_characters
+        return self.get_characters_by_date_range(start_date, end_date, user_id, 'year')
 
     def get_week_characters(self, data: dict[str, int], user_id: int) -> dict[int, dict[str, float]]:
-        user = self.user_service.get_user(user_id)
-        week = data['week']
-        year = data['year']
-        start_date = datetime.strptime(f'{year}-W{week}-1', "%Y-W%W-%w")
-        end_date = start_date + timedelta(weeks=1)
-        
-        if user.created_at > end_date:
-            raise BadRequest('User account was created after the requested timeframe.')
-
+        start_date, end_date = self.get_period_range(data['week'], None, data['year'], user_id)
         characters = self.get_week_characters_by_date_range(start_date, end_date, user_id)
         return {'characters': characters}
 
     def get_month_characters(self, data: dict[str, int], user_id: int) -> dict[int, dict[str, float]]:
-        user = self.user_service.get_user(user_id)
-        month = data['month']
-        year = data['year']
-        start_date = datetime.strptime(f'{year}-{month}-1', "%Y-%m-%d")
-        end_date = start_date + timedelta(days=31)
-        
-        if user.created_at > end_date:
-            raise BadRequest('User account was created after the requested timeframe.')
-
+        start_date, end_date = self.get_period_range(None, data['month'], data['year'], user_id)
         characters = self.get_month_characters_by_date_range(start_date, end_date, user_id)
         return {'characters': characters}
 
     def get_year_characters(self, data: dict[str, int], user_id: int) -> dict[int, dict[int, dict[str, float]]]:
-        user = self.user_service.get_user(user_id)
-        year = data['year']
-        start_date = datetime(year, 1, 1)
-        end_date = datetime(year + 1, 1, 1) - timedelta(days=1)
-
-        if user.created_at > end_date:
-            raise BadRequest('User account was created after the requested timeframe.')
-
+        start_date, end_date = self.get_period_range(None, None, data['year'], user_id)
         characters = self.get_year_characters_by_date_range(start_date, end_date, user_id)
         return {'characters': characters}
 
-    def get_week_summary(self, data: dict[str, int], user_id: int) -> dict[str, dict[str, list[str]]]:
-        user = self.user_service.get_user(user_id)
-        week = data['week']
-        year = data['year']
-        start_date = datetime.strptime(f'{year}-W{week}-1', "%Y-W%W-%w")
-        end_date = start_date + timedelta(weeks=1)
-
-        if user.created_at > end_date:
-            raise BadRequest('User account was created after the requested timeframe.')
-
-        emotions = self.get_week_emotions_by_date_range(start_date, end_date, user_id)
-        characters = self.get_week_characters_by_date_range(start_date, end_date, user_id)
-
-        return {'emotions': emotions, 'characters': characters}
-
-    def get_month_summary(self, data: dict[str, int], user_id: int) -> dict[str, dict[str, list[str]]]:
-        user = self.user_service.get_user(user_id)
-        month = data['month']
-        year = data['year']
-        start_date = datetime.strptime(f'{year}-{month}-1', "%Y-%m-%d")
-        end_date = start_date + timedelta(days=31)
-
-        if user.created_at > end_date:
-            raise BadRequest('User account was created after the requested timeframe.')
-
-        emotions = self.get_month_emotions_by_date_range(start_date, end_date, user_id)
-        characters = self.get_month_characters_by_date_range(start_date, end_date, user_id)
-
-        return {'emotions': emotions, 'characters': characters}
-
-    def get_year_summary(self, data: dict[str, int], user_id: int) -> dict[str, dict[str, list[str]]]:
-        user = self.user_service.get_user(user_id)
-        year = data['year']
-        start_date = datetime(year, 1, 1)
-        end_date = datetime(year + 1, 1, 1) - timedelta(days=1)
-
-        if user.created_at > end_date:
-            raise BadRequest('User account was created after the requested timeframe.')
-
-        emotions = self.get_year_emotions_by_date_range(start_date, end_date, user_id)
-        characters = self.get_year_characters_by_date_range(start_date, end_date, user_id)
-
-        return {'emotions': emotions, 'characters': characters}
+    def get_character_trends(self, data: dict, user_id: int) -> dict[str, dict]:
+        granularity = data.get('granularity', 'week')
+        window = data.get('window', 4)
+        start_date, end_date = self.get_period_range(data.get('week'), data.get('month'), data['year'], user_id)
+        rollups = self.get_period_rollups(start_date, end_date, user_id)
+
+        days, sums, squares, counts = self.get_trait_matrix([self.get_trait_row(rollup) for rollup in rollups])
+        periods = trait_stats.get_bucket_starts(start_date.date(), end_date.date(), granularity)
+        index = trait_stats.get_bucket_index(days, start_date.date(), granularity)
+        means, stds, period_counts, period_sums = trait_stats.aggregate_traits(index, len(periods), sums, squares, counts)
+        rolling_means = trait_stats.rolling_means(period_sums, period_counts, window)
+        slopes = trait_stats.to_list(trait_stats.get_slopes(means, period_counts))
+
+        traits = {trait: {
+            'mean': trait_stats.to_list(means[:, i]),
+            'std': trait_stats.to_list(stds[:, i]),
+            'rolling_mean': trait_stats.to_list(rolling_means[:, i]),
+            'slope': slopes[i]
+        } for i, trait in enumerate(TRAITS)}
+        return {'trends': {
+            'granularity': granularity,
+            'window': window,
+            'periods': [period.isoformat() for period in periods],
+            'counts': period_counts.astype(int).tolist(),
+            'traits': traits
+        }}
+
+    def get_week_summary(self, data: dict, user_id: int) -> dict[str, dict]:
+        start_date, end_date = self.get_period_range(data['week'], None, data['year'], user_id)
+        return self.summarize_period(start_date, end_date, user_id, 'week', data.get('include_events', False))
+
+    def get_month_summary(self, data: dict, user_id: int) -> dict[str, dict]:
+        start_date, end_date = self.get_period_range(None, data['month'], data['year'], user_id)
+        return self.summarize_period(start_date, end_date, user_id, 'month', data.get('include_events', False))
+
+    def get_year_summary(self, data: dict, user_id: int) -> dict[str, dict]:
+        start_date, end_date = self.get_period_range(None, None, data['year'], user_id)
+        return self.summarize_period(start_date, end_date, user_id, 'year', data.get('include_events', False))
 
     def get_week_events_by_date_range(self, start_date: datetime, end_date: datetime, user_id: int) -> dict[int, list[str]]:
-        entries = self.get_entries_by_date_range(start_date, end_date, user_id)
-
-        week_events = {day: [] for day in range(1, 8)}
-
-        for entry in entries:
-            day_of_week = entry.created_at.isoweekday()
-            events = self.get_events(entry)
-            week_events[day_of_week].extend([event.to_string() for event in events])
-
-        return week_events
+        return self.get_events_by_date_range(start_date, end_date, user_id, 'week')
 
     def get_month_events_by_date_range(self, start_date: datetime, end_date: datetime, user_id: int) -> dict[int, list[str]]:
-        month_events = {day: [] for day in range(1, 32)}
-
-        week_start = start_date
-        while week_start <= end_date:
-            week_end = week_start + timedelta(days=6)
-
-            if week_end > end_date:
-                week_end = end_date
-
-            week_events = self.get_week_events_by_date_range(week_start, week_end, user_id)
-
-            for day, events in week_events.items():
-                actual_day = (week_start + timedelta(days=day - 1)).day
-                month_events[actual_day].extend([event.to_string() for event in events])
-
-            week_start = week_end + timedelta(days=1)
-
-        return month_events
+        return self.get_events_by_date_range(start_date, end_date, user_id, 'month')
 
     def get_year_events_by_date_range(self, start_date: datetime, end_date: datetime, user_id: int) -> dict[int, dict[int, list[str]]]:
-        year_events = {month: {day: [] for day in range(1, 32)} for month in range(1, 13)}
-
-        month_start = start_date
-        while month_start <= end_date:
-            next_month = month_start.month % 12 + 1
-            year = month_start.year + (month_start.month // 12)
-            month_end = datetime(year, next_month, 1) - timedelta(days=1)
-
-            if month_end > end_date:
-                month_end = end_date
-
-            month_events = self.get_month_events_by_date_range(month_start, month_end, user_id)
-
-            for day, events in month_events.items():
-                year_events[month_start.month][day].extend([event.to_string() for event in events])
-
-            month_start = month_end + timedelta(days=1)
-
-        return year_events
+        return self.get_events_by_date_range(start_date, end_date, user_id, 'year')
@@ -1,18 +1,42 @@
-from werkzeug.exceptions import NotFound
+import base64
+import csv
+import io
+import json
+from datetime import datetime, timezone
+from typing import IO, Iterator
+from flask import current_app
+from marshmallow import ValidationError, EXCLUDE
+from sqlalchemy import and_, or_, insert
+from werkzeug.exceptions import NotFound, BadRequest
 
 from src.api.v1.models.EntryModel import Entry
+from src.api.v1.models.Advice import Advice
 from src.api.v1.services.user_service import UserService
+from src.api.v1.services.job_service import JobService
+from src.api.v1.services.rollup_service import RollupService
+from src.api.v1.schemas.entry_schema import ImportEntrySchema
+from src.api.v1.utils.get_time import get_utc_now
 from src.crew.active.data_sanitizer import DataSanitizer
+from src.errors import DangerDetected
+
+
+ENTRY_FIELDS = ('id', 'title', 'context', 'created_at', 'updated_at')
+STREAM_BATCH_SIZE = 500
 
 
 class EntryService:
     def __init__(self, db_session):
         self.db_session = db_session
         self.user_service = UserService(db_session=db_session)
+        self.job_service = JobService(db_session=db_session)
+        self.rollup_service = RollupService(db_session=db_session)
         self.data_sanitizer = DataSanitizer()
     
+    def get_entry_query(self, id, user_id):
+        return Entry.query.filter_by(id=id, user_id=user_id)
+
     def get_entry_by_id(self, id, user_id):
-        return Entry.query.filter_by(id=id, user_id=user_id).first()
+        return self.get_entry_query(id, user_id).first()
     
     def get_user_entry_by_id(self, entry_id, user_id):
         entry = self.get_entry_by_id(entry_id, user_id)
@@ -29,14 +53,74 @@ class EntryService:
         }
         return {'entry': entry_data}
 
-    def get_all_entries(self, user_id):
-        user = self.user_service.get_user_by_id(user_id)
-        entries = [{
-            'id': entry.id,
-            'title': entry.title,
-            'context': entry.context
-        } for entry in user.entries]
-        return {'entries': entries}
+    def get_fields(self, projection: str | None) -> list[str]:
+        if not projection:
+            return ['id', 'title', 'context']
+        fields = [field.strip() for field in projection.split(',') if field.strip()]
+        unknown = [field for field in fields if field not in ENTRY_FIELDS]
+        if unknown or not fields:
+            raise BadRequest(f'Unknown entry fields: {", ".join(unknown)}. Choose from {", ".join(ENTRY_FIELDS)}')
+        return fields
+
+    @staticmethod
+    def encode_cursor(created_at: datetime, entry_id: int) -> str:
+        payload = json.dumps([created_at.isoformat(), entry_id]).encode('utf-8')
+        return base64.urlsafe_b64encode(payload).decode('ascii')
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> tuple[datetime, int]:
+        try:
+            created_at, entry_id = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+            return datetime.fromisoformat(created_at), int(entry_id)
+        except (ValueError, TypeError):
+            raise BadRequest('Invalid cursor')
+
+    def get_entries_query(self, user_id: int, fields: list[str], cursor: str | None = None):
+        # id and created_at are always selected because the keyset cursor is built from them
+        columns = [Entry.id, Entry.created_at] + [getattr(Entry, field) for field in fields if field not in ('id', 'created_at')]
+        query = self.db_session.query(*columns).filter(Entry.user_id == user_id).order_by(Entry.created_at, Entry.id)
+        if cursor:
+            created_at, entry_id = self.decode_cursor(cursor)
+            query = query.filter(or_(Entry.created_at > created_at, and_(Entry.created_at == created_at, Entry.id > entry_id)))
+        return query
+
+    @staticmethod
+    def serialize_entry(row, fields: list[str]) -> dict:
+        entry = {}
+        for field in fields:
+            value = getattr(row, field)
+            entry[field] = value.isoformat() if isinstance(value, datetime) else value
+        return entry
+
+    def get_all_entries(self, user_id, projection=None, limit=None, cursor=None):
+        self.user_service.get_user_by_id(user_id)
+        fields = self.get_fields(projection)
+        query = self.get_entries_query(user_id, fields, cursor)
+        if limit is None:
+            return {'entries': [self.serialize_entry(row, fields) for row in query.yield_per(STREAM_BATCH_SIZE)]}
+
+        rows = query.limit(limit + 1).all()
+        next_cursor = self.encode_cursor(rows[limit - 1].created_at, rows[limit - 1].id) if len(rows) > limit else None
+        return {'entries': [self.serialize_entry(row, fields) for row in rows[:limit]], 'next_cursor': next_cursor}
+
+    def stream_entries(self, user_id, projection=None, limit=None, cursor=None) -> Iterator[str]:
+        self.user_service.get_user_by_id(user_id)
+        fields = self.get_fields(projection)
+        query = self.get_entries_query(user_id, fields, cursor)
+        if limit is not None:
+            query = query.limit(limit + 1)
+
+        def stream():
+            count = 0
+            for row in query.yield_per(STREAM_BATCH_SIZE):
+                if limit is not None and count == limit:
+                    yield json.dumps({'next_cursor': self.encode_cursor(last.created_at, last.id)}) + '\n'
+                    break
+                yield json.dumps(self.serialize_entry(row, fields)) + '\n'
+                last = row
+                count += 1
+
+        return stream()
 
     def register_entry(self, data, user_id):
         title = data['title']
@@ -46,17 +130,125 @@ class EntryService:
         user = self.user_service.get_user_by_id(user_id)
         entry = Entry(title=title, context=context, user=user)
         self.db_session.add(entry)
+        self.db_session.flush()
+        self.invalidate_advice(entry)
+        self.rollup_service.mark_stale(entry.user_id, entry.created_at.date())
         self.db_session.commit()
-        return {'id': entry.id}
+        job = self.job_service.enqueue_analysis(entry)
+        return {'id': entry.id, 'job_id': job.id if job else None}
 
     def add_to_entry(self, data, entry_id, user_id):
         context = data['context']
         context = self.data_sanitizer.sanitize(context)
         entry = self.get_user_entry_by_id(entry_id, user_id)
         entry.context += context
+        self.invalidate_advice(entry)
+        self.rollup_service.mark_stale(entry.user_id, entry.created_at.date())
         self.db_session.commit()
-        return {'message': 'Entry updated successfully'}
+        job = self.job_service.enqueue_analysis(entry)
+        return {'message': 'Entry updated successfully', 'job_id': job.id if job else None}
+
+    @staticmethod
+    def iter_import_records(stream: IO[bytes], file_format: str) -> Iterator[tuple[int, dict | None, str | None]]:
+        text = io.TextIOWrapper(stream, encoding='utf-8', newline='')
+        line_number = 0
+        try:
+            if file_format == 'csv':
+                reader = csv.DictReader(text)
+                for record in reader:
+                    # line_num is the last physical line of the record, so multi-line contexts report where they end
+                    line_number = reader.line_num
+                    yield line_number, {key: value for key, value in record.items() if key and value not in (None, '')}, None
+                return
+
+            for line_number, line in enumerate(text, 1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError as e:
+                    yield line_number, None, f'Invalid JSON: {str(e)}'
+                    continue
+                if not isinstance(record, dict):
+                    yield line_number, None, 'Expected a JSON object'
+                    continue
+                yield line_number, record, None
+        except (csv.Error, UnicodeDecodeError) as e:
+            # The rest of the file cannot be read, but everything before it is still imported
+            yield line_number + 1, None, f'Unreadable file, import stopped: {str(e)}'
+
+    def import_entries(self, stream: IO[bytes], file_format: str, user_id: int) -> dict:
+        self.user_service.get_user_by_id(user_id)
+        batch_size = current_app.config['IMPORT_BATCH_SIZE']
+        report = {'imported': 0, 'failed': 0, 'errors': []}
+        entry_ids = []
+
+        batch = []
+        for record in self.iter_import_records(stream, file_format):
+            batch.append(record)
+            if len(batch) >= batch_size:
+                entry_ids += self.import_batch(batch, user_id, report)
+                batch = []
+        if batch:
+            entry_ids += self.import_batch(batch, user_id, report)
+
+        report['entry_ids'] = entry_ids
+        report['job_ids'] = self.job_service.enqueue_batch_analysis(entry_ids, user_id)
+        return report
+
+    def import_batch(self, batch: list[tuple[int, dict | None, str | None]], user_id: int, report: dict) -> list[int]:
+        schema = ImportEntrySchema(unknown=EXCLUDE)
+        valid = []
+        for line_number, record, error in batch:
+            if error is None:
+                try:
+                    valid.append((line_number, schema.load(record)))
+                    continue
+                except ValidationError as e:
+                    error = f'Validation error: {e.messages}'
+            report['errors'].append({'line': line_number, 'message': error})
+
+        sanitized = self.data_sanitizer.sanitize_batch([text for _, data in valid for text in (data['title'], data['context'])])
+        now = get_utc_now()
+        rows = []
+        for i, (line_number, data) in enumerate(valid):
+            title, context = sanitized[2 * i], sanitized[2 * i + 1]
+            danger = next((result for result in (title, context) if isinstance(result, DangerDetected)), None)
+            if danger is not None:
+                report['errors'].append({'line': line_number, 'message': str(danger)})
+                continue
+            created_at = data.get('created_at', now)
+            created_at = created_at.replace(tzinfo=timezone.utc) if created_at.tzinfo is None else created_at.astimezone(timezone.utc)
+            rows.append({'user_id': user_id, 'title': title, 'context': context, 'created_at': created_at, 'updated_at': now})
+
+        report['failed'] += len(batch) - len(rows)
+        if not rows:
+            return []
+
+        entry_ids = list(self.db_session.scalars(insert(Entry).returning(Entry.id), rows))
+        days = {row['created_at'].date() for row in rows}
+        self.invalidate_periods(user_id, [row['created_at'] for row in rows])
+        for day in sorted(days):
+            self.rollup_service.mark_stale(user_id, day)
+        self.db_session.commit()
+
+        report['imported'] += len(entry_ids)
+        return entry_ids
+
+    def invalidate_advice(self, entry):
+        self.invalidate_periods(entry.user_id, [entry.created_at])
+
+    def get_period_advice_query(self, user_id: int, dates: list[datetime]):
+        period_keys = {period_key for date in dates for period_key in Advice.get_period_keys(date)}
+        return Advice.query.filter(Advice.user_id == user_id, Advice.period_key.in_(period_keys))
+
+    def invalidate_periods(self, user_id: int, dates: list[datetime]) -> None:
+        self.get_period_advice_query(user_id, dates).delete(synchronize_session=False)
+
+    def get_titles_query(self, user_id: int):
+        return self.db_session.query(Entry.title).filter(Entry.user_id == user_id).order_by(Entry.created_at, Entry.id)
 
     def get_entry_titles(self, user_id):
-        user = self.user_service.get_user_by_id(user_id)
-        return {'titles': [entry.title for entry in user.entries]}
+        self.user_service.get_user_by_id(user_id)
+        query = self.get_titles_query(user_id)
+        return {'titles': [title for title, in query.yield_per(STREAM_BATCH_SIZE)]}
@@ -0,0 +1,115 @@
+import csv
+import io
+import json
+import zlib
+from datetime import date, datetime, timedelta
+from itertools import groupby
+from typing import Iterator
+
+from src.api.v1.models.EntryModel import Entry
+from src.api.v1.models.EmotionModel import Emotion
+from src.api.v1.models.CharacterModel import CharacterTrait
+from src.api.v1.models.EventModel import Event, EVENT_FIELDS
+from src.api.v1.models.DailyRollupModel import TRAITS
+from src.api.v1.services.user_service import UserService
+from src.extensions import term_vocabulary
+
+
+EXPORT_BATCH_SIZE = 500
+CSV_COLUMNS = ('id', 'created_at', 'updated_at', 'title', 'context', 'emotions', *TRAITS, 'mbti_type', 'events')
+
+
+class ExportService:
+    def __init__(self, db_session):
+        self.db_session = db_session
+        self.user_service = UserService(db_session=db_session)
+
+    def get_export_query(self, user_id: int, start_date: date | None = None, end_date: date | None = None):
+        # One flat outer join ordered by entry, so each entry's rows arrive together and can be grouped while streaming
+        columns = [Entry.id, Entry.created_at, Entry.updated_at, Entry.title, Entry.context, Emotion.bitmask]
+        columns += [getattr(CharacterTrait, trait) for trait in TRAITS] + [CharacterTrait.mbti_type, Event.id.label('event_id')]
+        columns += [getattr(Event, field) for field in EVENT_FIELDS]
+        query = self.db_session.query(*columns) \
+            .outerjoin(Emotion, Emotion.entry_id == Entry.id) \
+            .outerjoin(CharacterTrait, CharacterTrait.entry_id == Entry.id) \
+            .outerjoin(Event, Event.entry_id == Entry.id) \
+            .filter(Entry.user_id == user_id)
+        if start_date is not None:
+            query = query.filter(Entry.created_at >= datetime.combine(start_date, datetime.min.time()))
+        if end_date is not None:
+            query = query.filter(Entry.created_at < datetime.combine(end_date + timedelta(days=1), datetime.min.time()))
+        # yield_per turns on stream_results, which is a server-side cursor on PostgreSQL
+        return query.order_by(Entry.created_at, Entry.id, Event.chunk_start, Event.id).yield_per(EXPORT_BATCH_SIZE)
+
+    @staticmethod
+    def serialize_rows(rows: list, terms: dict[int, str]) -> dict:
+        first = rows[0]
+        events = {}
+        for row in rows:
+            if row.event_id is not None and row.event_id not in events:
+                events[row.event_id] = {field: [terms[term_id] for term_id in getattr(row, field) or [] if term_id in terms] for field in EVENT_FIELDS}
+        return {
+            'id': first.id,
+            'created_at': first.created_at.isoformat(),
+            'updated_at': first.updated_at.isoformat(),
+            'title': first.title,
+            'context': first.context,
+            'emotions': Emotion.decode_mask(first.bitmask) if first.bitmask is not None else None,
+            'characters': {trait: getattr(first, trait) for trait in TRAITS} if first.mbti_type is not None else None,
+            'mbti_type': first.mbti_type,
+            'events': list(events.values()),
+        }
+
+    def serialize_batch(self, batch: list[list]) -> list[dict]:
+        # Event terms are stored as vocabulary ids, decoded with one lookup per batch of entries
+        terms = term_vocabulary.lookup(term_id for rows in batch for row in rows for field in EVENT_FIELDS for term_id in getattr(row, field) or [])
+        return [self.serialize_rows(rows, terms) for rows in batch]
+
+    def iter_entries(self, query) -> Iterator[dict]:
+        batch = []
+        for _, rows in groupby(query, key=lambda row: row.id):
+            batch.append(list(rows))
+            if len(batch) >= EXPORT_BATCH_SIZE:
+                yield from self.serialize_batch(batch)
+                batch = []
+        if batch:
+            yield from self.serialize_batch(batch)
+
+    @staticmethod
+    def to_ndjson(entries: Iterator[dict]) -> Iterator[str]:
+        for entry in entries:
+            yield json.dumps(entry) + '\n'
+
+    @staticmethod
+    def to_csv(entries: Iterator[dict]) -> Iterator[str]:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(CSV_COLUMNS)
+        for entry in entries:
+            characters = entry['characters'] or {}
+            writer.writerow([
+                entry['id'], entry['created_at'], entry['updated_at'], entry['title'], entry['context'],
+                ';'.join(entry['emotions'] or []), *[characters.get(trait) for trait in TRAITS],
+                entry['mbti_type'], json.dumps(entry['events']),
+            ])
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+    @staticmethod
+    def compress(chunks: Iterator[str], level: int) -> Iterator[bytes]:
+        # wbits=31 writes a gzip header and trailer around the deflate stream
+        compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+        for chunk in chunks:
+            data = compressor.compress(chunk.encode('utf-8'))
+            if data:
+                yield data
+        yield compressor.flush()
+
+    def export_entries(self, user_id: int, file_format: str = 'ndjson', start_date: date | None = None, end_date: date | None = None, compression_level: int | None = 6) -> Iterator[bytes | str]:
+        self.user_service.get_user_by_id(user_id)
+        entries = self.iter_entries(self.get_export_query(user_id, start_date, end_date))
+        chunks = self.to_csv(entries) if file_format == 'csv' else self.to_ndjson(entries)
+        if compression_level is None:
+            return chunks
+        return self.compress(chunks, compression_level)
@@ -0,0 +1,15 @@
+from src.crew.utils.micro_batcher import MicroBatcher
+from src.crew.utils.inference_cache import InferenceCache
+from src.crew.registry import model_registry
+
+
+class HealthService:
+    def get_inference_metrics(self):
+        cache = InferenceCache._instance
+        return {
+            'metrics': MicroBatcher.get_all_metrics(),
+            'cache': cache.get_stats() if cache is not None else None
+        }
+
+    def get_readiness(self, models):
+        return model_registry.get_readiness(models)
@@ -0,0 +1,168 @@
+import threading
+from datetime import timedelta
+from contextlib import ExitStack, contextmanager
+from flask import current_app
+from sqlalchemy import insert
+from sqlalchemy.orm import joinedload, selectinload
+from werkzeug.exceptions import NotFound
+
+from src.extensions import db, worker_pool
+from src.logger import logger
+from src.api.v1.models.AnalysisJobModel import AnalysisJob
+from src.api.v1.models.EntryModel import Entry
+from src.api.v1.utils.get_time import get_utc_now
+
+
+entry_locks = [threading.Lock() for _ in range(64)]
+
+# Periods waiting on the low-priority queue; a burst of writes to one period precomputes its advice once
+queued_periods = set()
+queued_periods_lock = threading.Lock()
+
+
+@contextmanager
+def lock_entries(entry_ids: list[int]):
+    # Locks are taken in index order so a batch can never deadlock against another batch or a single job
+    with ExitStack() as stack:
+        for index in sorted({entry_id % len(entry_locks) for entry_id in entry_ids}):
+            stack.enter_context(entry_locks[index])
+        yield
+
+
+def run_analysis_job(job_id: int) -> None:
+    # Imported here because DataService depends on EntryService, which enqueues jobs through this module
+    from src.api.v1.services.data_service import DataService
+
+    job = db.session.get(AnalysisJob, job_id)
+    job.status = 'running'
+    db.session.commit()
+
+    try:
+        # Appends are merged into the stored rows, so two jobs must never merge the same entry at once
+        with entry_locks[job.entry_id % len(entry_locks)]:
+            DataService(db_session=db.session).analyze_entry(job.entry)
+        job.status = 'done'
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f'Analysis job {job_id} failed: {str(e)}')
+        job.status = 'failed'
+        job.error = str(e)
+    db.session.commit()
+
+    if job.status == 'done' and current_app.config['ADVICE_PRECOMPUTE']:
+        queue_advice_precompute(job.user_id, job.entry.created_at)
+
+
+def queue_advice_precompute(user_id: int, created_at) -> None:
+    from src.api.v1.models.Advice import Advice
+
+    for week, month, year in Advice.get_periods(created_at):
+        key = (user_id, Advice.get_period_key(week, month, year))
+        with queued_periods_lock:
+            if key in queued_periods:
+                continue
+            queued_periods.add(key)
+        worker_pool.submit_low_priority(run_advice_precompute, user_id, week, month, year)
+
+
+def run_advice_precompute(user_id: int, week: int | None, month: int | None, year: int) -> None:
+    from src.api.v1.models.Advice import Advice
+    from src.api.v1.services.advice_service import AdviceService
+
+    # Released before generating, so a write that lands meanwhile queues the period again
+    with queued_periods_lock:
+        queued_periods.discard((user_id, Advice.get_period_key(week, month, year)))
+    try:
+        AdviceService(db_session=db.session).precompute_period(week, month, year, user_id)
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f'Advice precomputation for {Advice.get_period_key(week, month, year)} of user {user_id} failed: {str(e)}')
+
+
+def run_batch_analysis_job(job_ids: list[int]) -> None:
+    from src.api.v1.services.data_service import DataService
+
+    jobs = AnalysisJob.query.filter(AnalysisJob.id.in_(job_ids)).all()
+    for job in jobs:
+        job.status = 'running'
+    db.session.commit()
+
+    entry_ids = [job.entry_id for job in jobs]
+    try:
+        with lock_entries(entry_ids):
+            entries = Entry.query.options(joinedload(Entry.emotions), joinedload(Entry.character_traits), selectinload(Entry.events)).filter(Entry.id.in_(entry_ids)).all()
+            DataService(db_session=db.session).analyze_entries(entries)
+        for job in jobs:
+            job.status = 'done'
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f'Batch analysis of jobs {job_ids[0]}-{job_ids[-1]} failed: {str(e)}')
+        for job in jobs:
+            job.status = 'failed'
+            job.error = str(e)
+    db.session.commit()
+
+
+class JobService:
+    def __init__(self, db_session):
+        self.db_session = db_session
+
+    def get_job_by_id(self, job_id, user_id):
+        return AnalysisJob.query.filter_by(id=job_id, user_id=user_id).first()
+
+    def get_user_job(self, job_id, user_id):
+        job = self.get_job_by_id(job_id, user_id)
+        if not job:
+            raise NotFound(f'Job with id {job_id} not found for user with id {user_id}')
+        return {'job': job.to_dict()}
+
+    @staticmethod
+    def get_stale_cutoff():
+        return get_utc_now() - timedelta(seconds=current_app.config['ANALYSIS_JOB_TIMEOUT'])
+
+    def get_active_jobs_query(self, entry_ids: list[int]):
+        # Jobs only live in this process's thread pool, so a row left pending or running by a restart or crash is never picked up again
+        return AnalysisJob.query.filter(AnalysisJob.entry_id.in_(entry_ids), AnalysisJob.status.in_(('pending', 'running')), AnalysisJob.updated_at >= self.get_stale_cutoff())
+
+    def fail_stale_jobs(self, entry_ids: list[int]) -> None:
+        # Pollers of an orphaned job see it fail instead of waiting forever; the next read of the entry queues a new one
+        stale = AnalysisJob.query.filter(AnalysisJob.entry_id.in_(entry_ids), AnalysisJob.status.in_(('pending', 'running')), AnalysisJob.updated_at < self.get_stale_cutoff())
+        if stale.update({'status': 'failed', 'error': 'Job timed out or was lost on restart', 'updated_at': get_utc_now()}, synchronize_session=False):
+            self.db_session.commit()
+
+    def get_active_job(self, entry_id):
+        self.fail_stale_jobs([entry_id])
+        return self.get_active_jobs_query([entry_id]).order_by(AnalysisJob.id.desc()).first()
+
+    def get_active_jobs(self, entry_ids: list[int]) -> dict[int, AnalysisJob]:
+        self.fail_stale_jobs(entry_ids)
+        jobs = self.get_active_jobs_query(entry_ids).order_by(AnalysisJob.id).all()
+        return {job.entry_id: job for job in jobs}
+
+    def enqueue_analysis(self, entry: Entry) -> AnalysisJob | None:
+        if not worker_pool.enabled:
+            return None
+
+        job = self.get_active_job(entry.id)
+        if job and job.status == 'pending':
+            return job
+
+        job = AnalysisJob(entry_id=entry.id, user_id=entry.user_id, status='pending')
+        self.db_session.add(job)
+        self.db_session.commit()
+
+        worker_pool.submit(run_analysis_job, job.id)
+        return job
+
+    def enqueue_batch_analysis(self, entry_ids: list[int], user_id: int) -> list[int]:
+        if not worker_pool.enabled or not entry_ids:
+            return []
+
+        rows = [{'entry_id': entry_id, 'user_id': user_id, 'status': 'pending'} for entry_id in entry_ids]
+        job_ids = list(self.db_session.scalars(insert(AnalysisJob).returning(AnalysisJob.id, sort_by_parameter_order=True), rows))
+        self.db_session.commit()
+
+        batch_size = current_app.config['ANALYSIS_BATCH_SIZE']
+        for i in range(0, len(job_ids), batch_size):
+            worker_pool.submit(run_batch_analysis_job, job_ids[i:i + batch_size])
+        return job_ids
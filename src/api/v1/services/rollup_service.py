@@ -0,0 +1,105 @@
+from collections import Counter, defaultdict
+from datetime import date, datetime, timedelta
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+
+from src.api.v1.models.DailyRollupModel import DailyRollup, TRAITS
+from src.api.v1.models.EntryModel import Entry
+from src.api.v1.models.EmotionModel import Emotion
+from src.extensions import term_vocabulary
+
+
+class RollupService:
+    def __init__(self, db_session):
+        self.db_session = db_session
+
+    def get_rollup(self, user_id: int, day: date) -> DailyRollup | None:
+        return DailyRollup.query.filter_by(user_id=user_id, date=day).first()
+
+    def get_or_create_rollup(self, user_id: int, day: date) -> DailyRollup:
+        rollup = self.get_rollup(user_id, day)
+        if rollup:
+            return rollup
+
+        rollup = DailyRollup(user_id=user_id, date=day, entry_count=0, emotion_mask=0, trait_count=0, topic_counts={}, stale=True, **{f'{trait}_sum': 0.0 for trait in TRAITS}, **{f'{trait}_sq_sum': 0.0 for trait in TRAITS})
+        try:
+            with self.db_session.begin_nested():
+                self.db_session.add(rollup)
+        except IntegrityError:
+            rollup = self.get_rollup(user_id, day)
+        return rollup
+
+    def get_rollups_query(self, start_date: datetime, end_date: datetime, user_id: int):
+        return DailyRollup.query.filter(DailyRollup.user_id == user_id, DailyRollup.date >= start_date.date(), DailyRollup.date < end_date.date()).order_by(DailyRollup.date)
+
+    def get_rollups(self, start_date: datetime, end_date: datetime, user_id: int) -> list[DailyRollup]:
+        return self.get_rollups_query(start_date, end_date, user_id).all()
+
+    def mark_stale(self, user_id: int, day: date) -> None:
+        self.get_or_create_rollup(user_id, day).stale = True
+
+    def get_emotion_masks_query(self, user_id: int, start_date: date | None = None, end_date: date | None = None):
+        day = func.date(Entry.created_at)
+        query = self.db_session.query(day, Emotion.bitmask).join(Entry, Emotion.entry_id == Entry.id).filter(Entry.user_id == user_id)
+        if start_date is not None:
+            query = query.filter(Entry.created_at >= start_date)
+        if end_date is not None:
+            query = query.filter(Entry.created_at < end_date)
+
+        if self.db_session.get_bind().dialect.name == 'postgresql':
+            return query.with_entities(day, func.bit_or(Emotion.bitmask)).group_by(day)
+        return query
+
+    def get_emotion_masks(self, user_id: int, start_date: date | None = None, end_date: date | None = None) -> dict[date, int]:
+        rows = self.get_emotion_masks_query(user_id, start_date, end_date).all()
+        if self.db_session.get_bind().dialect.name == 'postgresql':
+            return {self.to_date(row_day): mask for row_day, mask in rows}
+
+        # SQLite has no bit_or aggregate, so the per-entry masks are OR-ed here
+        masks = defaultdict(int)
+        for row_day, mask in rows:
+            masks[self.to_date(row_day)] |= mask
+        return dict(masks)
+
+    @staticmethod
+    def to_date(value) -> date:
+        return value if isinstance(value, date) else date.fromisoformat(value)
+
+    def refresh_day(self, user_id: int, day: date, entries: list[Entry], stale: bool = False, emotion_mask: int | None = None) -> DailyRollup:
+        rollup = self.get_or_create_rollup(user_id, day)
+        if emotion_mask is None:
+            start_date = datetime.combine(day, datetime.min.time())
+            emotion_mask = self.get_emotion_masks(user_id, start_date, start_date + timedelta(days=1)).get(day, 0)
+
+        trait_sums = dict.fromkeys(TRAITS, 0.0)
+        trait_squares = dict.fromkeys(TRAITS, 0.0)
+        trait_count = 0
+        topic_counts = Counter()
+        topics = term_vocabulary.lookup(term_id for entry in entries for event in entry.events for term_id in event.topics or [])
+
+        for entry in entries:
+            if entry.character_traits:
+                for trait, score in entry.character_traits[0].to_dict().items():
+                    trait_sums[trait] += score
+                    trait_squares[trait] += score * score
+                trait_count += 1
+            for event in entry.events:
+                topic_counts.update(topics[term_id] for term_id in event.topics or [] if term_id in topics)
+
+        rollup.entry_count = len(entries)
+        rollup.emotion_mask = emotion_mask
+        rollup.trait_count = trait_count
+        for trait in TRAITS:
+            setattr(rollup, f'{trait}_sum', trait_sums[trait])
+            setattr(rollup, f'{trait}_sq_sum', trait_squares[trait])
+        rollup.topic_counts = dict(topic_counts)
+        rollup.stale = stale
+        self.db_session.commit()
+        return rollup
+
+    def get_entry_days(self, user_id: int | None = None) -> list[tuple[int, date]]:
+        day = func.date(Entry.created_at)
+        query = self.db_session.query(Entry.user_id, day).group_by(Entry.user_id, day).order_by(Entry.user_id, day)
+        if user_id is not None:
+            query = query.filter(Entry.user_id == user_id)
+        return [(row_user_id, self.to_date(row_day)) for row_user_id, row_day in query.all()]
@@ -0,0 +1,102 @@
+from collections import Counter
+from datetime import date, datetime, timedelta
+from sqlalchemy import func
+from sqlalchemy.dialects import postgresql, sqlite
+
+from src.api.v1.models.EntryModel import Entry
+from src.api.v1.models.EventModel import Event, EVENT_FIELDS
+from src.api.v1.models.TermModel import Term
+from src.api.v1.models.EntryTermModel import EntryTerm
+from src.api.v1.services.rollup_service import RollupService
+from src.extensions import term_vocabulary
+
+
+class TermService:
+    def __init__(self, db_session):
+        self.db_session = db_session
+
+    def get_insert(self, model):
+        # Both dialects support ON CONFLICT DO NOTHING, which lets concurrent jobs intern the same term safely
+        if self.db_session.get_bind().dialect.name == 'postgresql':
+            return postgresql.insert(model)
+        return sqlite.insert(model)
+
+    @staticmethod
+    def get_event_terms(extracted_event: dict[str, list[str]]) -> set[tuple[str, str]]:
+        terms = set()
+        for kind in EVENT_FIELDS:
+            for value in extracted_event.get(kind) or []:
+                value = Term.normalize(value)
+                if value:
+                    terms.add((kind, value))
+        return terms
+
+    @staticmethod
+    def encode_event(extracted_event: dict[str, list[str]], term_ids: dict[tuple[str, str], int]) -> dict[str, list[int]]:
+        encoded = {}
+        for kind in EVENT_FIELDS:
+            ids = (term_ids.get((kind, Term.normalize(value))) for value in extracted_event.get(kind) or [])
+            encoded[kind] = list(dict.fromkeys(term_id for term_id in ids if term_id is not None))
+        return encoded
+
+    def get_term_ids(self, terms: set[tuple[str, str]]) -> dict[tuple[str, str], int]:
+        if not terms:
+            return {}
+        values = {value for _, value in terms}
+        rows = self.db_session.query(Term.kind, Term.value, Term.id).filter(Term.value.in_(values)).all()
+        term_ids = {(kind, value): term_id for kind, value, term_id in rows if (kind, value) in terms}
+
+        missing = terms - term_ids.keys()
+        if missing:
+            self.db_session.execute(self.get_insert(Term).on_conflict_do_nothing(), [{'kind': kind, 'value': value} for kind, value in missing])
+            rows = self.db_session.query(Term.kind, Term.value, Term.id).filter(Term.value.in_({value for _, value in missing})).all()
+            term_ids.update({(kind, value): term_id for kind, value, term_id in rows if (kind, value) in missing})
+        term_vocabulary.remember((term_id, value) for (_, value), term_id in term_ids.items())
+        return term_ids
+
+    def index_events(self, entry: Entry, events: list[Event]) -> None:
+        terms = {(kind, term_id) for event in events for kind in EVENT_FIELDS for term_id in getattr(event, kind) or []}
+        if not terms:
+            return
+        rows = [{'term_id': term_id, 'kind': kind, 'entry_id': entry.id, 'user_id': entry.user_id, 'created_at': entry.created_at} for kind, term_id in terms]
+        self.db_session.execute(self.get_insert(EntryTerm).on_conflict_do_nothing(), rows)
+
+    def get_mentions_query(self, user_id: int, value: str, kind: str | None = None, start_date: datetime | None = None, end_date: datetime | None = None):
+        query = self.db_session.query(EntryTerm).join(Term, Term.id == EntryTerm.term_id).filter(EntryTerm.user_id == user_id, Term.value == Term.normalize(value))
+        if kind is not None:
+            query = query.filter(Term.kind == kind)
+        if start_date is not None:
+            query = query.filter(EntryTerm.created_at >= start_date)
+        if end_date is not None:
+            query = query.filter(EntryTerm.created_at < end_date)
+        return query
+
+    def get_mentioned_entries_query(self, user_id: int, value: str, kind: str | None = None, start_date: datetime | None = None, end_date: datetime | None = None, limit: int = 100):
+        entry_ids = self.get_mentions_query(user_id, value, kind, start_date, end_date).with_entities(EntryTerm.entry_id).distinct()
+        return self.db_session.query(Entry.id, Entry.title, Entry.created_at).filter(Entry.id.in_(entry_ids)).order_by(Entry.created_at, Entry.id).limit(limit)
+
+    def find_entries(self, user_id: int, value: str, kind: str | None = None, start_date: datetime | None = None, end_date: datetime | None = None, limit: int = 100) -> list[dict]:
+        rows = self.get_mentioned_entries_query(user_id, value, kind, start_date, end_date, limit).all()
+        return [{'id': entry_id, 'title': title, 'created_at': created_at.isoformat()} for entry_id, title, created_at in rows]
+
+    @staticmethod
+    def get_period_key(day: date, granularity: str) -> str:
+        if granularity == 'week':
+            return (day - timedelta(days=day.weekday())).isoformat()
+        if granularity == 'month':
+            return day.strftime('%Y-%m')
+        if granularity == 'year':
+            return str(day.year)
+        return day.isoformat()
+
+    def get_mention_counts_query(self, user_id: int, value: str, kind: str | None = None, start_date: datetime | None = None, end_date: datetime | None = None):
+        # Entries belong to exactly one day, so distinct entries per day add up to distinct entries per period
+        day = func.date(EntryTerm.created_at)
+        return self.get_mentions_query(user_id, value, kind, start_date, end_date).with_entities(day, func.count(EntryTerm.entry_id.distinct())).group_by(day)
+
+    def count_mentions(self, user_id: int, value: str, kind: str | None = None, start_date: datetime | None = None, end_date: datetime | None = None, granularity: str = 'month') -> dict[str, int]:
+        rows = self.get_mention_counts_query(user_id, value, kind, start_date, end_date).all()
+        counts = Counter()
+        for row_day, count in rows:
+            counts[self.get_period_key(RollupService.to_date(row_day), granularity)] += count
+        return dict(sorted(counts.items()))
@@ -10,14 +10,17 @@ class UserService:
     def __init__(self, db_session):
         self.db_session = db_session
 
+    def get_user_query(self, **filters):
+        return User.query.filter_by(**filters)
+
     def _get_user_by_username(self, username):
-        return User.query.filter_by(username=username).first()
+        return self.get_user_query(username=username).first()
 
     def _get_user_by_email(self, email):
-        return User.query.filter_by(email=email).first()
+        return self.get_user_query(email=email).first()
     
     def _get_user_by_id(self, id):
-        return User.query.filter_by(id=id).first()
+        return self.get_user_query(id=id).first()
 
     def get_user_by_username(self, username):
         user = self._get_user_by_username(username)
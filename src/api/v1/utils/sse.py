@@ -0,0 +1,6 @@
+import json
+
+
+def format_sse(data: dict, event: str | None = None) -> str:
+    message = f"event: {event}\n" if event else ""
+    return message + f"data: {json.dumps(data)}\n\n"
@@ -0,0 +1,52 @@
+import threading
+from collections import OrderedDict
+from typing import Iterable
+
+
+class TermVocabulary:
+    def __init__(self, app=None):
+        self.size = 0
+        self.memory = OrderedDict()
+        self.lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.size = app.config['TERM_CACHE_SIZE']
+        app.extensions['term_vocabulary'] = self
+
+    def lookup(self, term_ids: Iterable[int]) -> dict[int, str]:
+        term_ids = set(term_ids)
+        found = {}
+        with self.lock:
+            for term_id in term_ids:
+                if term_id in self.memory:
+                    self.memory.move_to_end(term_id)
+                    found[term_id] = self.memory[term_id]
+
+        missing = term_ids - found.keys()
+        if missing:
+            # Imported here because the models import this module through src.extensions
+            from src.extensions import db
+            from src.api.v1.models.TermModel import Term
+
+            rows = db.session.query(Term.id, Term.value).filter(Term.id.in_(missing)).all()
+            found.update(rows)
+            self.remember(rows)
+        return found
+
+    def remember(self, values: Iterable[tuple[int, str]]) -> None:
+        # A term id never changes its value once interned, so cached entries never need invalidating
+        with self.lock:
+            for term_id, value in values:
+                self.memory[term_id] = value
+                self.memory.move_to_end(term_id)
+            while len(self.memory) > self.size:
+                self.memory.popitem(last=False)
+
+    def clear(self) -> None:
+        with self.lock:
+            self.memory.clear()
+
+    def preload(self, events: Iterable) -> None:
+        self.lookup(term_id for event in events for term_id in event.get_term_ids())
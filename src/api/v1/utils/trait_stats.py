@@ -0,0 +1,57 @@
+from datetime import date, timedelta
+import numpy as np
+
+
+GRANULARITIES = ('day', 'week', 'month')
+
+
+def get_bucket_starts(start: date, end: date, granularity: str) -> list[date]:
+    if granularity == 'day':
+        return [start + timedelta(days=i) for i in range((end - start).days)]
+    if granularity == 'week':
+        monday = start - timedelta(days=start.weekday())
+        return [monday + timedelta(weeks=i) for i in range(-(-(end - monday).days // 7))]
+    months = (end.year - start.year) * 12 + end.month - start.month + (end.day > 1)
+    return [date(start.year + (start.month - 1 + i) // 12, (start.month - 1 + i) % 12 + 1, 1) for i in range(months)]
+
+
+def get_bucket_index(days: np.ndarray, start: date, granularity: str) -> np.ndarray:
+    if granularity == 'day':
+        return (days - np.datetime64(start, 'D')).astype(int)
+    if granularity == 'week':
+        monday = np.datetime64(start - timedelta(days=start.weekday()), 'D')
+        return (days - monday).astype(int) // 7
+    return (days.astype('datetime64[M]') - np.datetime64(start, 'M')).astype(int)
+
+
+def aggregate_traits(index: np.ndarray, n_buckets: int, sums: np.ndarray, squares: np.ndarray, counts: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    bucket_sums = np.zeros((n_buckets, sums.shape[1]))
+    bucket_squares = np.zeros((n_buckets, sums.shape[1]))
+    np.add.at(bucket_sums, index, sums)
+    np.add.at(bucket_squares, index, squares)
+    bucket_counts = np.bincount(index, weights=counts, minlength=n_buckets)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        means = bucket_sums / bucket_counts[:, None]
+        variance = bucket_squares / bucket_counts[:, None] - means ** 2
+    return means, np.sqrt(np.clip(variance, 0, None)), bucket_counts, bucket_sums
+
+
+def rolling_means(bucket_sums: np.ndarray, bucket_counts: np.ndarray, window: int) -> np.ndarray:
+    cumulative_sums = np.vstack([np.zeros((1, bucket_sums.shape[1])), np.cumsum(bucket_sums, axis=0)])
+    cumulative_counts = np.concatenate([[0.0], np.cumsum(bucket_counts)])
+    upper = np.arange(1, len(bucket_counts) + 1)
+    lower = np.maximum(upper - window, 0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return (cumulative_sums[upper] - cumulative_sums[lower]) / (cumulative_counts[upper] - cumulative_counts[lower])[:, None]
+
+
+def get_slopes(means: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    observed = np.flatnonzero(counts > 0)
+    if len(observed) < 2:
+        return np.full(means.shape[1], np.nan)
+    return np.polyfit(observed, means[observed], 1)[0]
+
+
+def to_list(values: np.ndarray) -> list:
+    return [None if np.isnan(value) else round(float(value), 4) for value in values]
@@ -0,0 +1,120 @@
+import click
+from flask.cli import AppGroup
+
+from src.logger import logger
+
+
+models_cli = AppGroup('models', help='Manage the extractor model artifacts.')
+cache_cli = AppGroup('cache', help='Inspect and purge the inference result cache.')
+rollups_cli = AppGroup('rollups', help='Maintain the per-user daily analytics rollups.')
+terms_cli = AppGroup('terms', help='Maintain the searchable index of event terms.')
+
+EXTRACTORS = ('emotion', 'character', 'event')
+
+
+def get_model_path(extractor: str) -> str:
+    if extractor == 'emotion':
+        from src.crew.active.emotion_extractor import EmotionExtractor
+        return EmotionExtractor._get_model_path()
+    if extractor == 'character':
+        from src.crew.active.character_extractor import CharacterExtractor
+        return CharacterExtractor._get_model_path()
+    from src.crew.active.event_extractor import EventExtractor
+    return EventExtractor._get_model_path()
+
+
+@models_cli.command('export')
+@click.option('--extractor', type=click.Choice(EXTRACTORS + ('all',)), default='all', help='Extractor whose model is converted.')
+@click.option('--backend', type=click.Choice(('quantized', 'onnx')), required=True, help='Artifact to write next to the model directory.')
+def export_models(extractor, backend):
+    from src.crew.utils.backends import export_backend
+
+    extractors = EXTRACTORS if extractor == 'all' else (extractor,)
+    for name in extractors:
+        artifact_path = export_backend(get_model_path(name), backend)
+        logger.info(f'Exported {name} extractor to {artifact_path}')
+        click.echo(artifact_path)
+
+
+@cache_cli.command('stats')
+def cache_stats():
+    from src.config import get_config
+    from src.crew.utils.inference_cache import InferenceCache, COUNTERS
+
+    cache = InferenceCache(get_config())
+    stats = cache.get_stats() | cache.get_disk_stats()
+    click.echo(f'Cache file: {cache.path or "disabled"}')
+    for model_id, count in stats['disk_entries'].items():
+        click.echo(f'{model_id}: {count} entries')
+
+    # Without a cache file only this process's counters exist, and they start at zero
+    counters = stats['totals'] or {name: stats[name] for name in COUNTERS}
+    lookups = counters['memory_hits'] + counters['disk_hits'] + counters['misses']
+    hit_rate = (counters['memory_hits'] + counters['disk_hits']) / lookups if lookups else 0.0
+    click.echo(f"Memory hits: {counters['memory_hits']}")
+    click.echo(f"Disk hits: {counters['disk_hits']}")
+    click.echo(f"Misses: {counters['misses']}")
+    click.echo(f"Evictions: {counters['evictions']}")
+    click.echo(f'Hit rate: {hit_rate:.1%}')
+
+
+@cache_cli.command('purge')
+@click.option('--model', 'model_id', help='Only purge results of this extractor class, e.g. EmotionExtractor.')
+@click.option('--older-than', type=float, help='Only purge results older than this many days.')
+def cache_purge(model_id, older_than):
+    from src.config import get_config
+    from src.crew.utils.inference_cache import InferenceCache
+
+    cache = InferenceCache(get_config())
+    deleted = cache.purge(model_id, older_than * 86400 if older_than is not None else None)
+    logger.info(f'Purged {deleted} cached inference results')
+    click.echo(f'Purged {deleted} entries')
+
+
+@rollups_cli.command('backfill')
+@click.option('--user-id', type=int, help='Only rebuild the rollups of this user.')
+def rollups_backfill(user_id):
+    from src.extensions import db
+    from src.api.v1.services.data_service import DataService
+
+    data_service = DataService(db_session=db.session)
+    days = data_service.rollup_service.get_entry_days(user_id)
+    emotion_masks = {}
+    stale = 0
+    for day_user_id, day in days:
+        if day_user_id not in emotion_masks:
+            emotion_masks = {day_user_id: data_service.rollup_service.get_emotion_masks(day_user_id)}
+        if data_service.refresh_rollup(day_user_id, day, emotion_mask=emotion_masks[day_user_id].get(day, 0)).stale:
+            stale += 1
+    logger.info(f'Backfilled {len(days)} daily rollups, {stale} still waiting for analysis')
+    click.echo(f'Backfilled {len(days)} daily rollups ({stale} stale)')
+
+
+@terms_cli.command('backfill')
+@click.option('--user-id', type=int, help='Only index the events of this user.')
+@click.option('--batch-size', type=int, default=500, help='Entries indexed per transaction.')
+def terms_backfill(user_id, batch_size):
+    from sqlalchemy.orm import selectinload
+    from src.extensions import db
+    from src.api.v1.models.EntryModel import Entry
+    from src.api.v1.services.term_service import TermService
+
+    term_service = TermService(db_session=db.session)
+    query = Entry.query.options(selectinload(Entry.events)).order_by(Entry.id)
+    if user_id is not None:
+        query = query.filter(Entry.user_id == user_id)
+
+    indexed = 0
+    last_id = 0
+    while True:
+        entries = query.filter(Entry.id > last_id).limit(batch_size).all()
+        if not entries:
+            break
+        for entry in entries:
+            term_service.index_events(entry, entry.events)
+        db.session.commit()
+        indexed += len(entries)
+        last_id = entries[-1].id
+        db.session.expunge_all()
+    logger.info(f'Indexed the event terms of {indexed} entries')
+    click.echo(f'Indexed {indexed} entries')
@@ -12,5 +12,50 @@ class Config:
         self.JWT_ACCESS_TOKEN_EXPIRES = timedelta(seconds=int(os.getenv('JWT_ACCESS_TOKEN_EXPIRES', 1800)))
         self.JWT_REFRESH_TOKEN_EXPIRES = timedelta(seconds=int(os.getenv('JWT_REFRESH_TOKEN_EXPIRES', 86400)))
 
+        self.ASYNC_ANALYSIS = os.getenv('ASYNC_ANALYSIS', 'true').lower() == 'true'
+        self.ANALYSIS_WORKERS = int(os.getenv('ANALYSIS_WORKERS', 2))
+        self.ANALYSIS_BATCH_SIZE = int(os.getenv('ANALYSIS_BATCH_SIZE', 64))
+        self.ANALYSIS_JOB_TIMEOUT = int(os.getenv('ANALYSIS_JOB_TIMEOUT', 900))
+        self.IMPORT_BATCH_SIZE = int(os.getenv('IMPORT_BATCH_SIZE', 200))
+        self.EXPORT_COMPRESSION_LEVEL = int(os.getenv('EXPORT_COMPRESSION_LEVEL', 6))
+
+        self.MODEL_WARMUP = os.getenv('MODEL_WARMUP', 'false').lower() == 'true'
+        self.WARMUP_MODELS = [name.strip() for name in os.getenv('WARMUP_MODELS', 'emotion,character,event').split(',') if name.strip()]
+        self.EMOTION_BACKEND = os.getenv('EMOTION_BACKEND', 'torch')
+        self.CHARACTER_BACKEND = os.getenv('CHARACTER_BACKEND', 'torch')
+        self.EVENT_BACKEND = os.getenv('EVENT_BACKEND', 'torch')
+        self.SPACY_MODEL = os.getenv('SPACY_MODEL', 'en_core_web_trf')
+        self.SPACY_EXCLUDE = [name.strip() for name in os.getenv('SPACY_EXCLUDE', '').split(',') if name.strip()]
+        self.SPACY_BATCH_SIZE = int(os.getenv('SPACY_BATCH_SIZE', 64))
+        self.EVENT_POOL_ENABLED = os.getenv('EVENT_POOL_ENABLED', 'false').lower() == 'true'
+        self.EVENT_POOL_SIZE = int(os.getenv('EVENT_POOL_SIZE', max((os.cpu_count() or 2) // 2, 1)))
+        self.EVENT_POOL_THREADS = int(os.getenv('EVENT_POOL_THREADS', 1))
+        self.EVENT_POOL_PRELOAD = os.getenv('EVENT_POOL_PRELOAD', 'true').lower() == 'true'
+        self.EVENT_POOL_SHUTDOWN_TIMEOUT = float(os.getenv('EVENT_POOL_SHUTDOWN_TIMEOUT', 30))
+        self.EXTRACTOR_MAX_LENGTH = int(os.getenv('EXTRACTOR_MAX_LENGTH', 128))
+        self.EXTRACTOR_PADDING = os.getenv('EXTRACTOR_PADDING', 'longest')
+        self.INFERENCE_BATCH_SIZE = int(os.getenv('INFERENCE_BATCH_SIZE', 32))
+        self.LENGTH_BUCKETING = os.getenv('LENGTH_BUCKETING', 'true').lower() == 'true'
+        self.CHUNK_OVERLAP = int(os.getenv('CHUNK_OVERLAP', 0))
+        self.CHUNK_CACHE_SIZE = int(os.getenv('CHUNK_CACHE_SIZE', 1024))
+
+        self.INFERENCE_CACHE = os.getenv('INFERENCE_CACHE', 'true').lower() == 'true'
+        self.INFERENCE_CACHE_SIZE = int(os.getenv('INFERENCE_CACHE_SIZE', 4096))
+        self.INFERENCE_CACHE_PATH = os.getenv('INFERENCE_CACHE_PATH', os.path.join('instance', 'inference_cache.sqlite3'))
+        self.INFERENCE_CACHE_TTL_DAYS = float(os.getenv('INFERENCE_CACHE_TTL_DAYS', 30))
+        self.TERM_CACHE_SIZE = int(os.getenv('TERM_CACHE_SIZE', 50000))
+
+        self.MICRO_BATCHING = os.getenv('MICRO_BATCHING', 'true').lower() == 'true'
+        self.MICRO_BATCH_SIZE = int(os.getenv('MICRO_BATCH_SIZE', 32))
+        self.MICRO_BATCH_LATENCY_MS = float(os.getenv('MICRO_BATCH_LATENCY_MS', 10))
+
+        self.ADVICE_MAX_NEW_TOKENS = int(os.getenv('ADVICE_MAX_NEW_TOKENS', 80))
+        self.ADVICE_SAMPLING = os.getenv('ADVICE_SAMPLING', 'true').lower() == 'true'
+        self.ADVICE_TEMPERATURE = float(os.getenv('ADVICE_TEMPERATURE', 0.7))
+        self.ADVICE_TOP_K = int(os.getenv('ADVICE_TOP_K', 50))
+        self.ADVICE_TOP_P = float(os.getenv('ADVICE_TOP_P', 0.95))
+        self.ADVICE_STREAM_TIMEOUT = float(os.getenv('ADVICE_STREAM_TIMEOUT', 60))
+        self.ADVICE_PRECOMPUTE = os.getenv('ADVICE_PRECOMPUTE', 'false').lower() == 'true'
+
 def get_config():
     return Config()
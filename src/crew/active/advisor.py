@@ -1,5 +1,10 @@
 import os
-from transformers import GPT2Tokenizer, GPT2LMHeadModel
+import threading
+import torch
+from typing import Iterator
+from transformers import GPT2Tokenizer, GPT2LMHeadModel, TextIteratorStreamer
+
+from src.config import get_config
 
 
 class Advisor():
@@ -11,15 +16,78 @@ class Advisor():
         return cls._instance
 
     def __init__(self):
-        model_path = self._get_model_path()
-        assert os.path.exists(model_path), f"Model path does not exist: {model_path}"
-        self.tokenizer = GPT2Tokenizer.from_pretrained(model_path)
-        self.model = GPT2LMHeadModel.from_pretrained(model_path)
-        self.initialized = True
-    
+        if not hasattr(self, 'initialized'):
+            config = get_config()
+            model_path = self._get_model_path()
+            assert os.path.exists(model_path), f"Model path does not exist: {model_path}"
+            self.tokenizer = GPT2Tokenizer.from_pretrained(model_path)
+            self.model = GPT2LMHeadModel.from_pretrained(model_path)
+            self.model.eval()
+
+            self.max_new_tokens = config.ADVICE_MAX_NEW_TOKENS
+            self.do_sample = config.ADVICE_SAMPLING
+            self.temperature = config.ADVICE_TEMPERATURE
+            self.top_k = config.ADVICE_TOP_K
+            self.top_p = config.ADVICE_TOP_P
+            self.stream_timeout = config.ADVICE_STREAM_TIMEOUT
+            self.initialized = True
+
     @staticmethod
     def _get_model_path():
-        return 'src\models\\advisor_model'
+        return os.path.join('src', 'models', 'advisor_model')
+
+    def warm_up(self) -> None:
+        with torch.no_grad():
+            self.model(**self.tokenizer("warm up", return_tensors="pt"))
+
+    def build_prompt(self, emotions: list[str], mbti_type: str, events: list[str], topic: str = "general") -> torch.Tensor:
+        prefix = self.tokenizer.encode(f"Emotion: {', '.join(emotions) or 'neutral'} | Context: ")
+        context = self.tokenizer.encode("; ".join(events))
+        suffix = self.tokenizer.encode(f" | Trait: {mbti_type} | Topic: {topic} | Advice: ")
+
+        budget = self.model.config.n_positions - self.max_new_tokens - len(prefix) - len(suffix)
+        input_ids = prefix + context[:max(budget, 0)] + suffix
+        return torch.tensor([input_ids])
+
+    def get_generation_kwargs(self, input_ids: torch.Tensor) -> dict:
+        kwargs = {
+            "input_ids": input_ids,
+            "attention_mask": torch.ones_like(input_ids),
+            "max_new_tokens": self.max_new_tokens,
+            "use_cache": True,
+            "no_repeat_ngram_size": 3,
+            "pad_token_id": self.tokenizer.eos_token_id,
+            "do_sample": self.do_sample,
+        }
+        if self.do_sample:
+            kwargs.update(temperature=self.temperature, top_k=self.top_k, top_p=self.top_p)
+        return kwargs
 
     def advise(self, emotions: list[str], mbti_type: str, events: list[str]) -> str:
-        pass
\ No newline at end of file
+        input_ids = self.build_prompt(emotions, mbti_type, events)
+        with torch.no_grad():
+            outputs = self.model.generate(**self.get_generation_kwargs(input_ids))
+        return self.tokenizer.decode(outputs[0][input_ids.shape[1]:], skip_special_tokens=True).strip()
+
+    def advise_stream(self, emotions: list[str], mbti_type: str, events: list[str]) -> Iterator[str]:
+        input_ids = self.build_prompt(emotions, mbti_type, events)
+        streamer = TextIteratorStreamer(self.tokenizer, skip_prompt=True, skip_special_tokens=True, timeout=self.stream_timeout)
+        errors = []
+
+        def generate():
+            try:
+                with torch.no_grad():
+                    self.model.generate(**self.get_generation_kwargs(input_ids), streamer=streamer)
+            except Exception as e:
+                errors.append(e)
+                streamer.end()
+
+        thread = threading.Thread(target=generate, name='advice-stream', daemon=True)
+        thread.start()
+        for token in streamer:
+            if token:
+                yield token
+        thread.join()
+
+        if errors:
+            raise errors[0]
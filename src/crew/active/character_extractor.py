@@ -1,7 +1,9 @@
 import os
-import torch
-from transformers import AutoTokenizer, AutoModelForSequenceClassification
+from transformers import AutoTokenizer
 from src.crew.base.base_extractor import BaseExtractor
+from src.crew.utils.backends import load_backend
+from src.crew.utils.inference_cache import get_model_version
+from src.config import get_config
 
 
 class CharacterExtractor(BaseExtractor):
@@ -16,36 +18,42 @@ class CharacterExtractor(BaseExtractor):
         if not hasattr(self, 'initialized'):
             model_path = self._get_model_path()
             assert os.path.exists(model_path), f"Model path does not exist: {model_path}"
+            config = get_config()
             self.tokenizer = AutoTokenizer.from_pretrained(model_path)
-            self.model = AutoModelForSequenceClassification.from_pretrained(model_path)
+            self.model = load_backend(model_path, config.CHARACTER_BACKEND)
+            self.configure(config, get_model_version(model_path, config.CHARACTER_BACKEND))
             self.initialized = True
 
     @staticmethod
     def _get_model_path():
-        return 'src\models\character_extractor'
+        return os.path.join('src', 'models', 'character_extractor')
 
-    def tokenize(self, text: str) -> dict:
+    def tokenize(self, text: str | list[str]) -> dict:
         return self.tokenizer(
             text,
-            padding="max_length",
+            padding=self.padding,
             truncation=True,
-            max_length=128,
-            return_tensors="pt"
+            max_length=self.max_length,
+            return_tensors=self.model.tensor_type
         )
 
-    def extract(self, text: str) -> tuple[dict[str, int], str]:
-        tokenized_text = self.tokenize(text)
+    def extract(self, text: str) -> dict[str, int]:
+        return self.extract_batch([text])[0]
 
-        with torch.no_grad():
-            outputs = self.model(**tokenized_text)
-            logits = outputs.logits
+    def extract_batch(self, texts: list[str]) -> list[dict[str, int]]:
+        if not texts:
+            return []
 
-        logits = logits.squeeze().tolist()
+        logits = self.forward_batches(texts)
 
         trait_names = ["agreeableness", "openness", "conscientiousness", "extraversion", "neuroticism"]
-        ocean5_scores = {trait_names[i]: min(max(int(logits[i]), 0), 100) for i in range(len(trait_names))}
 
-        return ocean5_scores
+        extracted_scores = []
+        for row in logits:
+            ocean5_scores = {trait_names[i]: min(max(int(row[i]), 0), 100) for i in range(len(trait_names))}
+            extracted_scores.append(ocean5_scores)
+
+        return extracted_scores
 
     def get_mbti_type(self, ocean5_scores: dict[str, float]) -> str:
         openness = ocean5_scores["openness"]
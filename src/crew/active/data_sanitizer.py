@@ -6,7 +6,13 @@ import re
 from better_profanity import profanity
 
 
+URL_PATTERN = re.compile(r'\b(?:https?://|www\.)\S+\b')
+EMAIL_PATTERN = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+
+
 class DataSanitizer(BaseDataSanitizer):
+    censor_words_loaded = False
+
     def __init__(self):
         self.spell_checker = SpellChecker()
 
@@ -21,15 +27,27 @@ class DataSanitizer(BaseDataSanitizer):
 
         return text
 
+    def sanitize_batch(self, texts: list[str]) -> list[str | DangerDetected]:
+        results = []
+        for text in texts:
+            try:
+                results.append(self.sanitize(text))
+            except DangerDetected as e:
+                results.append(e)
+        return results
+
     def deep_clean(self, text: str) -> str:
-        profanity.load_censor_words()
+        # The word list is global to better_profanity, so it only needs loading once per process
+        if not DataSanitizer.censor_words_loaded:
+            profanity.load_censor_words()
+            DataSanitizer.censor_words_loaded = True
         text = profanity.censor(text, '[CUSSWORD]')
         text = text.replace("[CUSSWORD][CUSSWORD][CUSSWORD][CUSSWORD]", "[CUSSWORD]")
         return text
     
     def secure(self, text: str) -> str:
-        text = re.sub(r'\b(?:https?://|www\.)\S+\b', '[MALICIOUS]', text)
-        text = re.sub(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', '[MALICIOUS]', text)
+        text = URL_PATTERN.sub('[MALICIOUS]', text)
+        text = EMAIL_PATTERN.sub('[MALICIOUS]', text)
         return text
 
     def detect_danger(self, text: str) -> bool:
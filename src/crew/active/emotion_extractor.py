@@ -1,7 +1,9 @@
 import os
-import torch
-from transformers import AutoTokenizer, AutoModelForSequenceClassification
+from transformers import AutoTokenizer
 from src.crew.base.base_extractor import BaseExtractor
+from src.crew.utils.backends import load_backend
+from src.crew.utils.inference_cache import get_model_version
+from src.config import get_config
 
 
 class EmotionExtractor(BaseExtractor):
@@ -16,33 +18,40 @@ class EmotionExtractor(BaseExtractor):
         if not hasattr(self, 'initialized'):
             model_path = self._get_model_path()
             assert os.path.exists(model_path), f"Model path does not exist: {model_path}"
+            config = get_config()
             self.tokenizer = AutoTokenizer.from_pretrained(model_path)
-            self.model = AutoModelForSequenceClassification.from_pretrained(model_path)
+            self.model = load_backend(model_path, config.EMOTION_BACKEND)
+            self.configure(config, get_model_version(model_path, config.EMOTION_BACKEND))
             self.initialized = True
 
     @staticmethod
     def _get_model_path():
-        return 'src\models\emotion_extractor'
+        return os.path.join('src', 'models', 'emotion_extractor')
 
-    def tokenize(self, text: str) -> dict:
+    def tokenize(self, text: str | list[str]) -> dict:
         return self.tokenizer(
             text,
-            padding="max_length",
+            padding=self.padding,
             truncation=True,
-            max_length=128,
-            return_tensors="pt"
+            max_length=self.max_length,
+            return_tensors=self.model.tensor_type
         )
 
     def extract(self, text: str) -> str:
-        tokenized_text = self.tokenize(text)
+        return self.extract_batch([text])[0]
 
-        with torch.no_grad():
-            outputs = self.model(**tokenized_text)
-            logits = outputs.logits
+    def extract_batch(self, texts: list[str]) -> list[str]:
+        if not texts:
+            return []
 
-        predicted_class_id = torch.argmax(logits, dim=1).tolist()
-        label = self.model.config.id2label[predicted_class_id[0]]
+        logits = self.forward_batches(texts)
+
+        predicted_class_ids = [row.index(max(row)) for row in logits]
         emotions = ["joy", "anger", "love", "sadness", "fear", "surprise"]
-        emotion = emotions[int(label.split("_")[1])]
 
-        return emotion
+        extracted_emotions = []
+        for predicted_class_id in predicted_class_ids:
+            label = self.model.config.id2label[predicted_class_id]
+            extracted_emotions.append(emotions[int(label.split("_")[1])])
+
+        return extracted_emotions
@@ -1,8 +1,15 @@
 import os
 import spacy
-import torch
-from transformers import AutoTokenizer, AutoModelForSequenceClassification
+from transformers import AutoTokenizer
 from src.crew.base.base_extractor import BaseExtractor
+from src.crew.utils.backends import get_backend_class, load_backend
+from src.crew.utils.inference_cache import get_model_version
+from src.crew.utils.event_pool import EventPool
+from src.config import get_config
+from src.logger import logger
+
+# The lemmatizer reads the POS tags set by tagger and attribute_ruler, and event terms are stored as lemmas
+LEMMA_PIPES = ('tagger', 'attribute_ruler', 'lemmatizer')
 
 
 class EventExtractor(BaseExtractor):
@@ -15,20 +22,41 @@ class EventExtractor(BaseExtractor):
 
     def __init__(self):
         if not hasattr(self, 'initialized'):
-            self.spacy_model = spacy.load("en_core_web_trf")
+            config = get_config()
             model_path = self._get_model_path()
             assert os.path.exists(model_path), f"Model path does not exist: {model_path}"
+            # The tokenizer stays in this process even with the pool on, for chunking and tokenize()
             self.tokenizer = AutoTokenizer.from_pretrained(model_path)
-            self.model = AutoModelForSequenceClassification.from_pretrained(model_path)
+            self.tensor_type = get_backend_class(config.EVENT_BACKEND).tensor_type
+            exclude = self.get_spacy_exclude(config.SPACY_EXCLUDE)
+            if config.EVENT_POOL_ENABLED:
+                self.pool = EventPool(config.EVENT_POOL_SIZE, config.SPACY_BATCH_SIZE, config.EVENT_POOL_THREADS, config.EVENT_POOL_PRELOAD, config.EVENT_POOL_SHUTDOWN_TIMEOUT)
+            else:
+                self.pool = None
+                self.spacy_model = spacy.load(config.SPACY_MODEL, exclude=exclude)
+                self.spacy_batch_size = config.SPACY_BATCH_SIZE
+                self.model = load_backend(model_path, config.EVENT_BACKEND)
+            self.configure(config, get_model_version(model_path, config.EVENT_BACKEND, config.SPACY_MODEL, *exclude))
             self.initialized = True
 
     @staticmethod
     def _get_model_path():
-        return 'src\models\event_extractor'
+        return os.path.join('src', 'models', 'event_extractor')
+
+    @staticmethod
+    def get_spacy_exclude(names: list[str]) -> list[str]:
+        kept = [name for name in names if name in LEMMA_PIPES]
+        if kept:
+            logger.warning(f"Ignoring SPACY_EXCLUDE entries needed for lemmas: {', '.join(kept)}")
+        return [name for name in names if name not in LEMMA_PIPES]
 
     def extract_core_events(self, text: str) -> dict:
-        doc = self.spacy_model(text)
+        return self.get_core_events(self.spacy_model(text))
 
+    def extract_core_events_batch(self, texts: list[str]) -> list[dict]:
+        return [self.get_core_events(doc) for doc in self.spacy_model.pipe(texts, batch_size=self.spacy_batch_size)]
+
+    def get_core_events(self, doc) -> dict:
         characters = []
         actions = []
         locations = []
@@ -47,24 +75,26 @@ class EventExtractor(BaseExtractor):
                 locations.append(ent.text)
             elif ent.label_ in {"DATE", "TIME"}:
                 times.append(ent.text)
+            elif ent.label_ == "ORG":
+                organizations.append(ent.text)
+            elif ent.label_ == "EVENT":
+                events.append(ent.text)
 
         for token in doc:
+            # Lemmas let "went" and "going" share one vocabulary term; names and entities keep their text
+            lemma = token.lemma_ or token.text
             if token.dep_ == "nsubj":
-                subjects.append(token.text)
+                subjects.append(lemma)
             elif token.pos_ == "VERB":
-                actions.append(token)
-            elif token.pos == "ADV":
-                adverbs.append(token.text)
+                actions.append(lemma)
+            elif token.pos_ == "ADV":
+                adverbs.append(lemma)
             elif token.dep_ == "dobj":
-                objects.append(token.text)
+                objects.append(lemma)
             elif token.pos_ == "ADJ":
-                adjectives.append(token.text)
+                adjectives.append(lemma)
             elif token.dep_ == "advmod":
-                adverbs.append(token.text)
-            elif ent.label_ == "ORG":
-                organizations.append(ent.text)
-            elif ent.label == "EVENT":
-                events.append(ent.text)
+                adverbs.append(lemma)
 
         return {
             "characters": characters,
@@ -79,26 +109,31 @@ class EventExtractor(BaseExtractor):
             "events": events
         }
 
-    def tokenize(self, text: str) -> dict:
+    def tokenize(self, text: str | list[str]) -> dict:
         return self.tokenizer(
             text,
-            padding="max_length",
+            padding=self.padding,
             truncation=True,
-            max_length=128,
-            return_tensors="pt"
+            max_length=self.max_length,
+            return_tensors=self.tensor_type
         )
 
     def extract(self, text: str) -> dict:
-        tokenized_text = self.tokenize(text)
-        events = self.extract_core_events(text)
+        return self.extract_batch([text])[0]
+
+    def extract_batch(self, texts: list[str]) -> list[dict]:
+        if not texts:
+            return []
+        if self.pool is not None:
+            return self.pool.extract_batch(texts)
 
-        with torch.no_grad():
-            outputs = self.model(**tokenized_text)
-            logits = outputs.logits
+        extracted_events = self.extract_core_events_batch(texts)
+        logits = self.forward_batches(texts)
 
-        predicted_class_id = torch.argmax(logits, dim=1).tolist()
-        extracted_topics = self.model.config.id2label[predicted_class_id[0]]
+        predicted_class_ids = [row.index(max(row)) for row in logits]
 
-        events["topics"] = [extracted_topics]
+        for events, predicted_class_id in zip(extracted_events, predicted_class_ids):
+            extracted_topics = self.model.config.id2label[predicted_class_id]
+            events["topics"] = [extracted_topics]
 
-        return events
+        return extracted_events
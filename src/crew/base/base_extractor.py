@@ -1,10 +1,81 @@
 from abc import ABC, abstractmethod
+from src.crew.utils.batching import bucket_by_length
+from src.crew.utils.chunker import Chunker
+from src.crew.utils.micro_batcher import MicroBatcher
+from src.crew.utils.inference_cache import InferenceCache
 
 class BaseExtractor(ABC): 
+    max_length = 128
+    padding = "longest"
+    batch_size = 32
+    bucketing = True
+    batcher = None
+    cache = None
+    model_version = ""
+
+    def configure(self, config, model_version: str = "") -> None:
+        self.model_version = model_version
+        self.max_length = config.EXTRACTOR_MAX_LENGTH
+        self.padding = config.EXTRACTOR_PADDING
+        self.batch_size = config.INFERENCE_BATCH_SIZE
+        self.bucketing = config.LENGTH_BUCKETING
+        self.chunker = Chunker(self.tokenizer, self.max_length, config.CHUNK_OVERLAP, config.CHUNK_CACHE_SIZE)
+        if config.MICRO_BATCHING:
+            self.batcher = MicroBatcher(self.extract_batch, config.MICRO_BATCH_SIZE, config.MICRO_BATCH_LATENCY_MS, type(self).__name__)
+        if config.INFERENCE_CACHE:
+            self.cache = InferenceCache(config)
+
+    def schedule(self, texts: list[str]) -> list:
+        if self.cache is None:
+            return self._run(texts)
+
+        model_id = type(self).__name__
+        keys = [self.cache.make_key(model_id, self.model_version, text) for text in texts]
+        results = self.cache.get_many(keys)
+
+        missing = [i for i, key in enumerate(keys) if key not in results]
+        if missing:
+            extracted = self._run([texts[i] for i in missing])
+            computed = {keys[i]: result for i, result in zip(missing, extracted)}
+            self.cache.set_many(model_id, computed)
+            results.update(computed)
+
+        return [results[key] for key in keys]
+
+    def _run(self, texts: list[str]) -> list:
+        if self.batcher is None:
+            return self.extract_batch(texts)
+        return self.batcher.extract_batch(texts)
+
+    def warm_up(self) -> None:
+        self.extract_batch(["warm up"])
+
+    def forward_batches(self, texts: list[str]) -> list[list[float]]:
+        encoded = self.tokenizer(texts, truncation=True, max_length=self.max_length)
+        lengths = [len(input_ids) for input_ids in encoded["input_ids"]]
+
+        logits = [None] * len(texts)
+        for bucket in bucket_by_length(lengths, self.batch_size, self.bucketing):
+            features = self.tokenizer.pad(
+                {key: [encoded[key][i] for i in bucket] for key in encoded},
+                padding=self.padding,
+                max_length=self.max_length,
+                return_tensors=self.model.tensor_type
+            )
+
+            for i, row in zip(bucket, self.model(features)):
+                logits[i] = row
+
+        return logits
+
     @abstractmethod
-    def tokenize(self, text: str) -> dict:
+    def tokenize(self, text: str | list[str]) -> dict:
         pass
 
     @abstractmethod
     def extract(self, text: str) -> str:
         pass
+
+    @abstractmethod
+    def extract_batch(self, texts: list[str]) -> list:
+        pass
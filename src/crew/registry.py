@@ -0,0 +1,64 @@
+import importlib
+import threading
+import time
+
+from src.logger import logger
+
+
+MODELS = {
+    'emotion': ('src.crew.active.emotion_extractor', 'EmotionExtractor'),
+    'character': ('src.crew.active.character_extractor', 'CharacterExtractor'),
+    'event': ('src.crew.active.event_extractor', 'EventExtractor'),
+    'advisor': ('src.crew.active.advisor', 'Advisor'),
+}
+
+
+class ModelRegistry:
+    def __init__(self):
+        self.instances = {}
+        self.locks = {name: threading.Lock() for name in MODELS}
+        self.status = {name: {'loaded': False, 'warmed': False, 'load_seconds': None, 'warm_up_seconds': None, 'error': None} for name in MODELS}
+
+    def get(self, name: str):
+        instance = self.instances.get(name)
+        if instance is not None:
+            return instance
+
+        with self.locks[name]:
+            if name not in self.instances:
+                module_name, class_name = MODELS[name]
+                started = time.perf_counter()
+                try:
+                    module = importlib.import_module(module_name)
+                    self.instances[name] = getattr(module, class_name)()
+                except Exception as e:
+                    self.status[name]['error'] = str(e)
+                    raise
+                self.status[name].update(loaded=True, error=None, load_seconds=time.perf_counter() - started)
+                logger.info(f'Loaded {name} model in {self.status[name]["load_seconds"]:.2f}s')
+
+        return self.instances[name]
+
+    def warm_up(self, names: list[str]) -> None:
+        for name in names:
+            try:
+                instance = self.get(name)
+                started = time.perf_counter()
+                instance.warm_up()
+                self.status[name].update(warmed=True, warm_up_seconds=time.perf_counter() - started)
+            except Exception as e:
+                self.status[name]['error'] = str(e)
+                logger.error(f'Failed to warm up {name} model: {str(e)}')
+
+    def start_warm_up(self, names: list[str]) -> threading.Thread:
+        thread = threading.Thread(target=self.warm_up, args=(names,), name='model-warm-up', daemon=True)
+        thread.start()
+        return thread
+
+    def get_readiness(self, names: list[str]) -> dict:
+        models = {name: dict(self.status[name]) for name in MODELS}
+        ready = all(models[name]['loaded'] and models[name]['warmed'] for name in names)
+        return {'ready': ready, 'models': models}
+
+
+model_registry = ModelRegistry()
@@ -0,0 +1,110 @@
+import os
+import torch
+from transformers import AutoConfig, AutoTokenizer, AutoModelForSequenceClassification
+
+
+BACKENDS = ("torch", "quantized", "onnx")
+
+
+def get_artifact_path(model_path: str, backend: str) -> str:
+    if backend == "quantized":
+        return os.path.join(model_path, "quantized", "model.pt")
+    if backend == "onnx":
+        return os.path.join(model_path, "onnx", "model.onnx")
+    return model_path
+
+
+def quantize(model):
+    return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+class TorchBackend:
+    tensor_type = "pt"
+
+    def __init__(self, model_path: str):
+        self.model = AutoModelForSequenceClassification.from_pretrained(model_path)
+        self.model.eval()
+        self.config = self.model.config
+
+    def __call__(self, features) -> list[list[float]]:
+        with torch.no_grad():
+            outputs = self.model(**features)
+        return outputs.logits.tolist()
+
+
+class QuantizedTorchBackend(TorchBackend):
+    def __init__(self, model_path: str):
+        artifact_path = get_artifact_path(model_path, "quantized")
+        self.config = AutoConfig.from_pretrained(model_path)
+
+        if os.path.exists(artifact_path):
+            self.model = quantize(AutoModelForSequenceClassification.from_config(self.config))
+            self.model.load_state_dict(torch.load(artifact_path, weights_only=False))
+        else:
+            self.model = quantize(AutoModelForSequenceClassification.from_pretrained(model_path))
+        self.model.eval()
+
+
+class OnnxBackend:
+    tensor_type = "np"
+
+    def __init__(self, model_path: str):
+        import onnxruntime
+
+        artifact_path = get_artifact_path(model_path, "onnx")
+        assert os.path.exists(artifact_path), f"ONNX model does not exist: {artifact_path}, run `flask models export --backend onnx` first"
+        self.config = AutoConfig.from_pretrained(model_path)
+
+        options = onnxruntime.SessionOptions()
+        options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = onnxruntime.InferenceSession(artifact_path, options, providers=["CPUExecutionProvider"])
+        self.input_names = {model_input.name for model_input in self.session.get_inputs()}
+
+    def __call__(self, features) -> list[list[float]]:
+        inputs = {name: value.astype("int64") for name, value in features.items() if name in self.input_names}
+        return self.session.run(["logits"], inputs)[0].tolist()
+
+
+def get_backend_class(backend: str) -> type:
+    if backend == "torch":
+        return TorchBackend
+    if backend == "quantized":
+        return QuantizedTorchBackend
+    if backend == "onnx":
+        return OnnxBackend
+    raise ValueError(f"Unknown inference backend: {backend}, expected one of {', '.join(BACKENDS)}")
+
+
+def load_backend(model_path: str, backend: str):
+    return get_backend_class(backend)(model_path)
+
+
+def export_backend(model_path: str, backend: str) -> str:
+    artifact_path = get_artifact_path(model_path, backend)
+    os.makedirs(os.path.dirname(artifact_path), exist_ok=True)
+
+    model = AutoModelForSequenceClassification.from_pretrained(model_path)
+    model.eval()
+
+    if backend == "quantized":
+        torch.save(quantize(model).state_dict(), artifact_path)
+    elif backend == "onnx":
+        tokenizer = AutoTokenizer.from_pretrained(model_path)
+        sample = tokenizer(["a short sample entry used for tracing"], return_tensors="pt")
+        input_names = [name for name in tokenizer.model_input_names if name in sample]
+        dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+        dynamic_axes["logits"] = {0: "batch"}
+        torch.onnx.export(
+            model,
+            (),
+            artifact_path,
+            kwargs={name: sample[name] for name in input_names},
+            input_names=input_names,
+            output_names=["logits"],
+            dynamic_axes=dynamic_axes,
+            opset_version=17
+        )
+    else:
+        raise ValueError(f"Nothing to export for inference backend: {backend}")
+
+    return artifact_path
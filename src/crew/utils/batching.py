@@ -0,0 +1,25 @@
+def bucket_by_length(lengths: list[int], batch_size: int, bucketing: bool = True) -> list[list[int]]:
+    order = list(range(len(lengths)))
+    if bucketing:
+        order.sort(key=lambda i: lengths[i])
+    return [order[i:i + batch_size] for i in range(0, len(order), batch_size)]
+
+
+def padding_stats(lengths: list[int], batch_size: int, padding: str, max_length: int, bucketing: bool = True) -> dict[str, int]:
+    buckets = bucket_by_length(lengths, batch_size, bucketing)
+
+    computed = 0
+    for bucket in buckets:
+        if padding == "max_length":
+            padded_length = max_length
+        else:
+            padded_length = max(lengths[i] for i in bucket)
+        computed += padded_length * len(bucket)
+
+    real = sum(lengths)
+    return {
+        "real_tokens": real,
+        "computed_tokens": computed,
+        "padding_tokens": computed - real,
+        "batches": len(buckets)
+    }
@@ -0,0 +1,92 @@
+import hashlib
+import re
+import threading
+from bisect import bisect_left
+from collections import OrderedDict
+
+
+SENTENCE_PATTERN = re.compile(r'[^.!?\n]*[.!?]+|[^.!?\n]+')
+WORD_PATTERN = re.compile(r'\S+')
+
+
+class Chunker:
+    def __init__(self, tokenizer, max_tokens: int, overlap: int = 0, cache_size: int = 1024):
+        self.tokenizer = tokenizer
+        self.max_tokens = max(max_tokens - tokenizer.num_special_tokens_to_add(), 1)
+        self.overlap = overlap
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+        self.lock = threading.Lock()
+
+    def chunk(self, text: str) -> list[str]:
+        return [text[start:end] for start, end in self.chunk_offsets(text)]
+
+    def chunk_offsets(self, text: str) -> list[tuple[int, int]]:
+        key = hashlib.sha1(text.encode("utf-8")).hexdigest()
+        with self.lock:
+            if key in self.cache:
+                self.cache.move_to_end(key)
+                return self.cache[key]
+
+        offsets = self._chunk_offsets(text)
+
+        with self.lock:
+            self.cache[key] = offsets
+            if len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+        return offsets
+
+    def _chunk_offsets(self, text: str) -> list[tuple[int, int]]:
+        token_starts = self._token_starts(text)
+
+        units = []
+        for start, end in self._split(text, SENTENCE_PATTERN, 0, len(text)):
+            count = self._count_tokens(text, token_starts, start, end)
+            if count <= self.max_tokens:
+                units.append((start, end, count))
+                continue
+            for word_start, word_end in self._split(text, WORD_PATTERN, start, end):
+                units.append((word_start, word_end, self._count_tokens(text, token_starts, word_start, word_end)))
+
+        return self._pack(units)
+
+    def _pack(self, units: list[tuple[int, int, int]]) -> list[tuple[int, int]]:
+        offsets = []
+        current = []
+        total = 0
+        for unit in units:
+            if current and total + unit[2] > self.max_tokens:
+                offsets.append((current[0][0], current[-1][1]))
+                current = current[-self.overlap:] if self.overlap else []
+                while current and sum(count for _, _, count in current) + unit[2] > self.max_tokens:
+                    current = current[1:]
+                total = sum(count for _, _, count in current)
+            current.append(unit)
+            total += unit[2]
+
+        if current:
+            offsets.append((current[0][0], current[-1][1]))
+        return offsets
+
+    def _token_starts(self, text: str) -> list[int] | None:
+        if not getattr(self.tokenizer, "is_fast", False):
+            return None
+        encoded = self.tokenizer(text, add_special_tokens=False, return_offsets_mapping=True)
+        return [start for start, end in encoded["offset_mapping"] if end > start]
+
+    def _count_tokens(self, text: str, token_starts: list[int] | None, start: int, end: int) -> int:
+        if token_starts is None:
+            return len(self.tokenizer.tokenize(text[start:end]))
+        return bisect_left(token_starts, end) - bisect_left(token_starts, start)
+
+    @staticmethod
+    def _split(text: str, pattern: re.Pattern, start: int, end: int) -> list[tuple[int, int]]:
+        spans = []
+        for match in pattern.finditer(text, start, end):
+            span = match.group()
+            stripped = span.strip()
+            if not stripped:
+                continue
+            span_start = match.start() + len(span) - len(span.lstrip())
+            spans.append((span_start, span_start + len(stripped)))
+        return spans
@@ -0,0 +1,77 @@
+import atexit
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, wait
+
+from src.logger import logger
+
+
+worker_extractor = None
+
+
+def init_worker(threads: int) -> None:
+    global worker_extractor
+    os.environ['EVENT_POOL_ENABLED'] = 'false'
+    os.environ['MICRO_BATCHING'] = 'false'
+    os.environ['OMP_NUM_THREADS'] = str(threads)
+
+    from src.crew.active.event_extractor import EventExtractor
+    worker_extractor = EventExtractor()
+
+
+def extract_in_worker(texts: list[str]) -> list[dict]:
+    return worker_extractor.extract_batch(texts)
+
+
+def get_worker_pid() -> int:
+    return os.getpid()
+
+
+class EventPool:
+    def __init__(self, size: int, batch_size: int, threads: int = 1, preload: bool = True, shutdown_timeout: float = 30.0):
+        self.size = size
+        self.batch_size = batch_size
+        self.shutdown_timeout = shutdown_timeout
+        self.executor = ProcessPoolExecutor(
+            max_workers=size,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=init_worker,
+            initargs=(threads,)
+        )
+        atexit.register(self.shutdown)
+
+        if preload:
+            self.preload()
+
+    def preload(self) -> None:
+        started = time.perf_counter()
+        pids = set()
+        for _ in range(10):
+            done, _ = wait([self.executor.submit(get_worker_pid) for _ in range(self.size)])
+            pids.update(future.result() for future in done)
+            if len(pids) == self.size:
+                break
+        logger.info(f'Started {len(pids)} event extraction workers in {time.perf_counter() - started:.2f}s')
+
+    def extract_batch(self, texts: list[str]) -> list[dict]:
+        batches = [texts[i:i + self.batch_size] for i in range(0, len(texts), self.batch_size)]
+        results = []
+        for batch_results in self.executor.map(extract_in_worker, batches):
+            results.extend(batch_results)
+        return results
+
+    def shutdown(self) -> None:
+        if self.executor is None:
+            return
+
+        executor, self.executor = self.executor, None
+        processes = list((executor._processes or {}).values())
+        executor.shutdown(wait=False, cancel_futures=True)
+
+        deadline = time.monotonic() + self.shutdown_timeout
+        for process in processes:
+            process.join(max(deadline - time.monotonic(), 0))
+            if process.is_alive():
+                logger.warning(f'Terminating event extraction worker {process.pid} after shutdown timeout')
+                process.terminate()
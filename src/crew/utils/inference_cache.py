@@ -0,0 +1,175 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+# Bumped whenever the key scheme changes, so results stored under an older scheme are never reused
+KEY_VERSION = 2
+COUNTERS = ("memory_hits", "disk_hits", "misses", "evictions")
+COUNTER_FLUSH_INTERVAL = 5.0
+EXPIRY_INTERVAL = 3600.0
+
+
+def get_model_version(model_path: str, *settings: str) -> str:
+    digest = hashlib.sha1()
+    config_path = os.path.join(model_path, "config.json")
+    if os.path.exists(config_path):
+        with open(config_path, "rb") as file:
+            digest.update(file.read())
+    for setting in settings:
+        digest.update(str(setting).encode("utf-8"))
+    return digest.hexdigest()[:12]
+
+
+class InferenceCache:
+    _instance = None
+
+    def __new__(cls, *args, **kwargs):
+        if cls._instance is None:
+            cls._instance = super(InferenceCache, cls).__new__(cls)
+        return cls._instance
+
+    def __init__(self, config):
+        if not hasattr(self, 'initialized'):
+            self.memory_size = config.INFERENCE_CACHE_SIZE
+            self.memory = OrderedDict()
+            self.lock = threading.Lock()
+            self.memory_hits = 0
+            self.disk_hits = 0
+            self.misses = 0
+            self.evictions = 0
+            self.flushed = dict.fromkeys(COUNTERS, 0)
+            self.flushed_at = time.time()
+            # Stored results are derived from diary text, so they are dropped after a fixed lifetime
+            self.ttl = config.INFERENCE_CACHE_TTL_DAYS * 86400
+            self.expired_at = 0.0
+
+            self.path = config.INFERENCE_CACHE_PATH
+            self.connection = None
+            if self.path:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                self.connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+                self.connection.execute("PRAGMA journal_mode=WAL")
+                self.connection.execute("CREATE TABLE IF NOT EXISTS inference_cache (key TEXT PRIMARY KEY, model_id TEXT NOT NULL, value TEXT NOT NULL, created_at REAL NOT NULL)")
+                self.connection.execute("CREATE TABLE IF NOT EXISTS inference_cache_counters (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+                self.connection.commit()
+            self.initialized = True
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        # Only whitespace is collapsed; the extractors are case-sensitive, so "May" and "may" must not share a result
+        return " ".join(text.split())
+
+    def make_key(self, model_id: str, model_version: str, text: str) -> str:
+        normalized = self.normalize(text)
+        return hashlib.sha256(f"{KEY_VERSION}\0{model_id}\0{model_version}\0{normalized}".encode("utf-8")).hexdigest()
+
+    def get_many(self, keys: list[str]) -> dict:
+        found = {}
+        with self.lock:
+            for key in keys:
+                if key in self.memory:
+                    self.memory.move_to_end(key)
+                    found[key] = self.memory[key]
+            self.memory_hits += len(found)
+
+            missing = [key for key in keys if key not in found]
+            if missing and self.connection is not None:
+                for i in range(0, len(missing), 500):
+                    batch = missing[i:i + 500]
+                    placeholders = ",".join("?" * len(batch))
+                    rows = self.connection.execute(f"SELECT key, value FROM inference_cache WHERE key IN ({placeholders}) AND created_at >= ?", batch + [time.time() - self.ttl]).fetchall()
+                    for key, value in rows:
+                        found[key] = value
+                        self._remember(key, value)
+                    self.disk_hits += len(rows)
+
+            self.misses += len([key for key in keys if key not in found])
+            self._flush_counters()
+
+        return {key: json.loads(value) for key, value in found.items()}
+
+    def set_many(self, model_id: str, values: dict) -> None:
+        serialized = {key: json.dumps(value) for key, value in values.items()}
+        with self.lock:
+            for key, value in serialized.items():
+                self._remember(key, value)
+            if self.connection is not None:
+                now = time.time()
+                self.connection.executemany(
+                    "INSERT OR REPLACE INTO inference_cache (key, model_id, value, created_at) VALUES (?, ?, ?, ?)",
+                    [(key, model_id, value, now) for key, value in serialized.items()]
+                )
+                self.connection.commit()
+            self._expire()
+            self._flush_counters()
+
+    def _remember(self, key: str, value: str) -> None:
+        self.memory[key] = value
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.memory_size:
+            self.memory.popitem(last=False)
+            self.evictions += 1
+
+    def _expire(self) -> None:
+        # Expired rows are already skipped on reads; deleting them is throttled so writes rarely pay for it
+        if self.connection is None or time.time() - self.expired_at < EXPIRY_INTERVAL:
+            return
+        self.connection.execute("DELETE FROM inference_cache WHERE created_at < ?", (time.time() - self.ttl,))
+        self.connection.commit()
+        self.expired_at = time.time()
+
+    def _flush_counters(self, force: bool = False) -> None:
+        # Totals are added up in the cache file, so `flask cache stats` can report them for every process sharing it
+        if self.connection is None or (not force and time.time() - self.flushed_at < COUNTER_FLUSH_INTERVAL):
+            return
+        deltas = [(name, getattr(self, name) - self.flushed[name]) for name in COUNTERS]
+        self.connection.executemany("INSERT INTO inference_cache_counters (name, value) VALUES (?, ?) ON CONFLICT(name) DO UPDATE SET value = value + excluded.value", deltas)
+        self.connection.commit()
+        self.flushed = {name: getattr(self, name) for name in COUNTERS}
+        self.flushed_at = time.time()
+
+    def get_stats(self) -> dict:
+        # Served on every metrics scrape, so only this process's counters are read and the cache file is left alone
+        with self.lock:
+            return {
+                "memory_entries": len(self.memory),
+                "memory_size": self.memory_size,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def get_disk_stats(self) -> dict:
+        stats = {"disk_entries": {}, "totals": {}}
+        with self.lock:
+            if self.connection is not None:
+                rows = self.connection.execute("SELECT model_id, COUNT(*) FROM inference_cache GROUP BY model_id").fetchall()
+                stats["disk_entries"] = dict(rows)
+                self._flush_counters(force=True)
+                rows = self.connection.execute("SELECT name, value FROM inference_cache_counters").fetchall()
+                stats["totals"] = {name: dict(rows).get(name, 0) for name in COUNTERS}
+        return stats
+
+    def purge(self, model_id: str | None = None, older_than: float | None = None) -> int:
+        conditions = []
+        parameters = []
+        if model_id:
+            conditions.append("model_id = ?")
+            parameters.append(model_id)
+        if older_than is not None:
+            conditions.append("created_at < ?")
+            parameters.append(time.time() - older_than)
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        with self.lock:
+            self.memory.clear()
+            if self.connection is None:
+                return 0
+            deleted = self.connection.execute(f"DELETE FROM inference_cache{where}", parameters).rowcount
+            self.connection.commit()
+        return deleted
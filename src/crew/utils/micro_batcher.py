@@ -0,0 +1,97 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+
+
+class MicroBatcher:
+    instances = {}
+
+    def __init__(self, fn, max_batch_size: int = 32, max_latency_ms: float = 10.0, name: str = "batcher"):
+        self.fn = fn
+        self.max_batch_size = max_batch_size
+        self.max_latency = max_latency_ms / 1000
+        self.name = name
+
+        self.queue = deque()
+        self.condition = threading.Condition()
+        self.metrics_lock = threading.Lock()
+        self.batches = 0
+        self.items = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+        self.thread = threading.Thread(target=self._loop, name=f"{name}-batcher", daemon=True)
+        self.thread.start()
+        MicroBatcher.instances[name] = self
+
+    def submit(self, text: str) -> Future:
+        return self.submit_many([text])[0]
+
+    def submit_many(self, texts: list[str]) -> list[Future]:
+        futures = [Future() for _ in texts]
+        now = time.perf_counter()
+        with self.condition:
+            self.queue.extend((text, future, now) for text, future in zip(texts, futures))
+            self.condition.notify()
+        return futures
+
+    def extract_batch(self, texts: list[str]) -> list:
+        return [future.result() for future in self.submit_many(texts)]
+
+    def _next_batch(self) -> list[tuple]:
+        with self.condition:
+            while not self.queue:
+                self.condition.wait()
+
+            deadline = self.queue[0][2] + self.max_latency
+            while len(self.queue) < self.max_batch_size:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                self.condition.wait(remaining)
+
+            size = min(len(self.queue), self.max_batch_size)
+            return [self.queue.popleft() for _ in range(size)]
+
+    def _loop(self) -> None:
+        while True:
+            batch = self._next_batch()
+            started = time.perf_counter()
+            self._record(batch, started)
+
+            try:
+                results = self.fn([text for text, _, _ in batch])
+            except Exception as e:
+                for _, future, _ in batch:
+                    future.set_exception(e)
+                continue
+
+            for (_, future, _), result in zip(batch, results):
+                future.set_result(result)
+
+    def _record(self, batch: list[tuple], started: float) -> None:
+        waits = [started - enqueued for _, _, enqueued in batch]
+        with self.metrics_lock:
+            self.batches += 1
+            self.items += len(batch)
+            self.total_wait += sum(waits)
+            self.max_wait = max(self.max_wait, max(waits))
+
+    def get_metrics(self) -> dict[str, float]:
+        with self.metrics_lock:
+            average_batch_size = self.items / self.batches if self.batches else 0.0
+            return {
+                "batches": self.batches,
+                "items": self.items,
+                "queue_depth": len(self.queue),
+                "max_batch_size": self.max_batch_size,
+                "average_batch_size": average_batch_size,
+                "fill_rate": average_batch_size / self.max_batch_size,
+                "average_wait_ms": 1000 * self.total_wait / self.items if self.items else 0.0,
+                "max_wait_ms": 1000 * self.max_wait,
+            }
+
+    @classmethod
+    def get_all_metrics(cls) -> dict[str, dict[str, float]]:
+        return {name: batcher.get_metrics() for name, batcher in cls.instances.items()}
@@ -1,3 +1,9 @@
 class DangerDetected(Exception):
     def __init__(self, message="Dangerous content detected"):
         super().__init__(message)
+
+class AnalysisPending(Exception):
+    def __init__(self, job_id, message="Analysis is still in progress", job_ids=None):
+        super().__init__(message)
+        self.job_id = job_id
+        self.job_ids = job_ids or [job_id]
@@ -3,11 +3,15 @@ from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
 from flask_cors import CORS
 from flasgger import Swagger
+from src.worker_pool import WorkerPool
+from src.api.v1.utils.term_vocabulary import TermVocabulary
 
 db = SQLAlchemy()
 migrate = Migrate()
 jwt = JWTManager()
 cors = CORS()
+worker_pool = WorkerPool()
+term_vocabulary = TermVocabulary()
 swagger = Swagger(template={
     "swagger": "2.0",
     "info": {
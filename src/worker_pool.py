@@ -0,0 +1,37 @@
+from concurrent.futures import ThreadPoolExecutor, Future
+from src.logger import logger
+
+
+class WorkerPool:
+    def __init__(self, app=None):
+        self.app = None
+        self.executor = None
+        self.low_priority_executor = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.app = app
+        if app.config['ASYNC_ANALYSIS']:
+            self.executor = ThreadPoolExecutor(max_workers=app.config['ANALYSIS_WORKERS'], thread_name_prefix='analysis')
+            # Optional work such as advice precomputation gets one thread of its own so it never delays analysis jobs
+            self.low_priority_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='low-priority')
+        app.extensions['worker_pool'] = self
+
+    @property
+    def enabled(self) -> bool:
+        return self.executor is not None
+
+    def submit(self, fn, *args, **kwargs) -> Future:
+        return self.executor.submit(self._run, fn, *args, **kwargs)
+
+    def submit_low_priority(self, fn, *args, **kwargs) -> Future:
+        return self.low_priority_executor.submit(self._run, fn, *args, **kwargs)
+
+    def _run(self, fn, *args, **kwargs):
+        with self.app.app_context():
+            try:
+                return fn(*args, **kwargs)
+            except Exception as e:
+                logger.exception(f'Background task {fn.__name__} failed: {str(e)}')
+                raise
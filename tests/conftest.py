@@ -0,0 +1,75 @@
+import os
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+# A disposable PostgreSQL database; every table in it is created and dropped by the test session
+TEST_DATABASE_URI = os.getenv('TEST_DATABASE_URI', '')
+
+TITLE = 'Entry'
+CONTEXT = 'Went to work, then met Sarah for dinner.'
+
+
+@pytest.fixture(scope='session')
+def app():
+    if not TEST_DATABASE_URI.startswith('postgresql'):
+        pytest.skip('Set TEST_DATABASE_URI to a disposable PostgreSQL database to run the database tests')
+
+    # The app reads its configuration when it is imported, so the environment is set first
+    os.environ['DATABASE_URI'] = TEST_DATABASE_URI
+    os.environ['ASYNC_ANALYSIS'] = 'false'
+    os.environ['MODEL_WARMUP'] = 'false'
+    from sqlalchemy.exc import OperationalError
+    from app import app as flask_app
+    from src.extensions import db
+
+    with flask_app.app_context():
+        try:
+            db.create_all()
+        except OperationalError as e:
+            pytest.skip(f'PostgreSQL is not reachable: {e}')
+        yield flask_app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture(scope='session')
+def seed_user(app):
+    """Creates a user whose entries are fully analysed and whose daily rollups are fresh."""
+    from sqlalchemy import insert
+    from src.extensions import db
+    from src.api.v1.models.UserModel import User
+    from src.api.v1.models.EntryModel import Entry
+    from src.api.v1.models.EmotionModel import Emotion
+    from src.api.v1.models.CharacterModel import CharacterTrait
+    from src.api.v1.models.EventModel import Event
+    from src.api.v1.services.data_service import DataService
+    from src.api.v1.services.term_service import TermService
+
+    def seed(username: str, n_entries: int, year: int = 2025) -> int:
+        user = User(firstname='Test', lastname='User', username=username, email=f'{username}@example.com', date_of_birth=datetime(1990, 1, 1), gender='other')
+        user.set_password(username)
+        db.session.add(user)
+        db.session.commit()
+
+        start = datetime(year, 1, 1)
+        # Coverage equal to the text length marks every entry as analysed, so no model is ever loaded
+        length = len(TITLE) + 1 + len(CONTEXT)
+        rows = [{'user_id': user.id, 'title': TITLE, 'context': CONTEXT, 'events_analyzed_length': length, 'created_at': start + timedelta(minutes=random.randrange(525600))} for _ in range(n_entries)]
+        entry_ids = list(db.session.scalars(insert(Entry).returning(Entry.id), rows))
+        term_service = TermService(db_session=db.session)
+        term_ids = term_service.get_term_ids({('characters', 'sarah'), ('topics', 'work')})
+        db.session.execute(insert(Emotion), [{'entry_id': entry_id, 'joy': True, 'bitmask': 2, 'analyzed_length': length} for entry_id in entry_ids])
+        db.session.execute(insert(CharacterTrait), [{'entry_id': entry_id, 'agreableness': 0.5, 'conscientiousness': 0.5, 'extraversion': 0.5, 'neuroticism': 0.5, 'openness': 0.5, 'mbti_type': 'INFJ', 'chunk_count': 1, 'analyzed_length': length} for entry_id in entry_ids])
+        db.session.execute(insert(Event), [{'entry_id': entry_id, 'chunk_start': 0, 'chunk_end': length, 'characters': [term_ids[('characters', 'sarah')]], 'topics': [term_ids[('topics', 'work')]]} for entry_id in entry_ids])
+        db.session.commit()
+
+        entries = Entry.query.filter(Entry.user_id == user.id).all()
+        for entry in entries:
+            term_service.index_events(entry, entry.events)
+        DataService(db_session=db.session).refresh_rollups(entries)
+        db.session.expire_all()
+        return user.id
+
+    return seed
@@ -0,0 +1,95 @@
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+
+START_DATE, END_DATE = datetime(2025, 3, 1), datetime(2025, 4, 1)
+
+# Each statement is built by the service method that issues it, so a changed query is planned as it really runs
+HOT_QUERIES = {
+    'UserService.get_user_by_id': lambda s: s.user_service.get_user_query(id=s.user_id),
+    'UserService.get_user_by_username': lambda s: s.user_service.get_user_query(username=s.username),
+    'UserService.get_user_by_email': lambda s: s.user_service.get_user_query(email=f'{s.username}@example.com'),
+    'EntryService.get_entry_by_id': lambda s: s.entry_service.get_entry_query(s.entry.id, s.user_id),
+    'EntryService.get_entries_query': lambda s: s.entry_service.get_entries_query(s.user_id, ['id', 'title'], s.entry_service.encode_cursor(START_DATE, s.entry.id)).limit(50),
+    'EntryService.get_entry_titles': lambda s: s.entry_service.get_titles_query(s.user_id),
+    'EntryService.invalidate_periods': lambda s: s.entry_service.get_period_advice_query(s.user_id, [START_DATE]),
+    'DataService.get_entries_by_date_range': lambda s: s.data_service.get_date_range_query(START_DATE, END_DATE, s.user_id),
+    'Entry.emotions': lambda s: s.lazy_load(s.entry, 'emotions'),
+    'Entry.character_traits': lambda s: s.lazy_load(s.entry, 'character_traits'),
+    'Entry.events': lambda s: s.lazy_load(s.entry, 'events'),
+    'JobService.get_active_jobs': lambda s: s.job_service.get_active_jobs_query([s.entry.id]),
+    'RollupService.get_rollups': lambda s: s.rollup_service.get_rollups_query(START_DATE, END_DATE, s.user_id),
+    'RollupService.get_emotion_masks': lambda s: s.rollup_service.get_emotion_masks_query(s.user_id, START_DATE, END_DATE),
+    'TermService.find_entries': lambda s: s.term_service.get_mentioned_entries_query(s.user_id, 'sarah', start_date=START_DATE, end_date=END_DATE),
+    'TermService.count_mentions': lambda s: s.term_service.get_mention_counts_query(s.user_id, 'work', 'topics'),
+    'ExportService.get_export_query': lambda s: s.export_service.get_export_query(s.user_id, START_DATE.date(), END_DATE.date()),
+}
+
+
+def find_seq_scans(plan: dict) -> list[str]:
+    scans = [plan.get('Relation Name', '?')] if plan['Node Type'] == 'Seq Scan' else []
+    for child in plan.get('Plans', []):
+        scans += find_seq_scans(child)
+    return scans
+
+
+@pytest.fixture(scope='module')
+def services(seed_user):
+    from sqlalchemy.orm import with_parent
+    from src.extensions import db
+    from src.api.v1.models.EntryModel import Entry
+    from src.api.v1.services.user_service import UserService
+    from src.api.v1.services.entry_service import EntryService
+    from src.api.v1.services.data_service import DataService
+    from src.api.v1.services.job_service import JobService
+    from src.api.v1.services.rollup_service import RollupService
+    from src.api.v1.services.term_service import TermService
+    from src.api.v1.services.export_service import ExportService
+
+    username = 'query-plans'
+    user_id = seed_user(username, 5000)
+    # Fresh statistics so the planner sees the seeded row counts
+    for table in db.metadata.tables:
+        db.session.execute(db.text(f'ANALYZE {table}'))
+    db.session.commit()
+
+    def lazy_load(entry, relationship):
+        # The criterion a lazy relationship load issues for one entry
+        attribute = getattr(Entry, relationship)
+        return db.session.query(attribute.property.mapper.class_).filter(with_parent(entry, attribute))
+
+    return SimpleNamespace(
+        user_id=user_id,
+        username=username,
+        entry=Entry.query.filter(Entry.user_id == user_id).order_by(Entry.id.desc()).first(),
+        lazy_load=lazy_load,
+        user_service=UserService(db_session=db.session),
+        entry_service=EntryService(db_session=db.session),
+        data_service=DataService(db_session=db.session),
+        job_service=JobService(db_session=db.session),
+        rollup_service=RollupService(db_session=db.session),
+        term_service=TermService(db_session=db.session),
+        export_service=ExportService(db_session=db.session),
+    )
+
+
+def explain(query) -> dict:
+    from src.extensions import db
+
+    compiled = query.statement.compile(dialect=db.engine.dialect, compile_kwargs={'render_postcompile': True})
+    return db.session.connection().exec_driver_sql(f'EXPLAIN (FORMAT JSON) {compiled}', compiled.params).scalar()[0]['Plan']
+
+
+@pytest.mark.parametrize('name', HOT_QUERIES)
+def test_hot_query_uses_indexes(services, name):
+    from src.extensions import db
+
+    try:
+        # Tiny tables are cheaper to scan than to index, so costs alone would hide a missing index
+        db.session.execute(db.text('SET LOCAL enable_seqscan = off'))
+        plan = explain(HOT_QUERIES[name](services))
+    finally:
+        db.session.rollback()
+
+    assert not find_seq_scans(plan), f'{name} plans a sequential scan:\n{plan}'
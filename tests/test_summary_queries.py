@@ -0,0 +1,48 @@
+from contextlib import contextmanager
+
+import pytest
+
+PERIODS = [
+    ('get_week_summary', {'week': 10, 'year': 2025}),
+    ('get_month_summary', {'month': 3, 'year': 2025}),
+    ('get_year_summary', {'year': 2025}),
+]
+
+
+@contextmanager
+def count_queries(engine):
+    from sqlalchemy import event
+
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, 'before_cursor_execute', record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, 'before_cursor_execute', record)
+
+
+@pytest.fixture(scope='module')
+def user_id(seed_user):
+    return seed_user('summary-queries', 300)
+
+
+@pytest.mark.parametrize('include_events', [False, True])
+@pytest.mark.parametrize('method, data', PERIODS)
+def test_period_summary_query_budget(app, user_id, method, data, include_events):
+    from src.extensions import db, term_vocabulary
+    from src.api.v1.services.data_service import DataService, SUMMARY_QUERY_BUDGET
+
+    data_service = DataService(db_session=db.session)
+    db.session.expire_all()
+    # A cold vocabulary, as in a fresh process, so the term lookup is counted
+    term_vocabulary.clear()
+    with count_queries(db.engine) as statements:
+        summary = getattr(data_service, method)(dict(data, include_events=include_events), user_id)
+
+    assert summary['emotions']
+    assert ('events' in summary) is include_events
+    assert len(statements) <= SUMMARY_QUERY_BUDGET[include_events], '\n\n'.join(statements)